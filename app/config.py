@@ -2,7 +2,7 @@
 설정 파일 - 앱의 모든 설정을 관리합니다
 """
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 
 class Settings(BaseSettings):
     # 앱 기본 설정
@@ -12,11 +12,92 @@ class Settings(BaseSettings):
     
     # 데이터베이스 설정
     DATABASE_URL: str = "sqlite:///./community.db"
+    DATABASE_ASYNC: bool = False  # True 면 라우터가 AsyncSession(aiosqlite)을 사용
+    ASYNC_DATABASE_URL: Optional[str] = None  # 비워 두면 DATABASE_URL 에서 만듦
+    
+    # 커넥션 풀 설정
+    DB_POOL_SIZE: int = 5  # 풀에 유지하는 커넥션 수
+    DB_MAX_OVERFLOW: int = 10  # 풀이 모자랄 때 추가로 열 수 있는 커넥션 수
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # 커넥션을 기다리는 최대 시간
+    
+    # SQLite 성능 프로필 (커넥션마다 PRAGMA 로 적용)
+    SQLITE_JOURNAL_MODE: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"] = "WAL"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"  # WAL 에서는 NORMAL 로도 안전
+    SQLITE_CACHE_SIZE: int = -64000  # 음수는 KiB 단위 (약 64MB)
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # 256MB
+    SQLITE_TEMP_STORE: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # 잠금이 풀릴 때까지 기다리는 시간 ("database is locked" 방지)
     
     # JWT 토큰 설정 (로그인 유지에 사용)
     SECRET_KEY: str # 하드코딩된 키 제거
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24시간
+    TOKEN_VERSION_CACHE_TTL_SECONDS: float = 30.0  # 토큰 버전(로그아웃/탈퇴 반영)을 DB에서 다시 읽는 주기
+    
+    # 비밀번호 해싱 설정
+    BCRYPT_ROUNDS: int = 12  # bcrypt cost (바꾸면 다음 로그인 때 자동으로 다시 해싱)
+    PASSWORD_HASH_WORKERS: int = 4  # 해싱 전용 스레드 수
+    PASSWORD_HASH_MAX_QUEUE: int = 32  # 대기 가능한 해싱 작업 수 (넘으면 503 응답)
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1  # 503 응답의 Retry-After
+    
+    # 조회수 버퍼 설정 (조회수를 모아 두었다가 한 번에 DB에 반영)
+    VIEW_COUNT_FLUSH_INTERVAL_SECONDS: float = 5.0  # 주기적으로 반영하는 간격
+    VIEW_COUNT_FLUSH_THRESHOLD: int = 500  # 쌓인 조회수가 이만큼 되면 바로 반영
+    
+    # 좋아요 캐시 설정 (사용자별 좋아요한 글/댓글 목록)
+    LIKE_CACHE_MAX_USERS: int = 10000  # 메모리에 보관할 최대 사용자 수
+    LIKE_CACHE_TTL_SECONDS: float = 60.0  # 다른 워커에서 바뀐 내용을 다시 읽어 오는 주기
+    
+    # 쓰기 작업자 설정 (게시글/댓글/좋아요 쓰기를 모아서 한 번에 commit)
+    WRITE_QUEUE_ENABLED: bool = False
+    WRITE_QUEUE_MAX_BATCH: int = 32  # 한 번에 commit 하는 최대 작업 수
+    WRITE_QUEUE_MAX_DELAY_MS: float = 2.0  # 첫 작업 뒤 다른 작업을 기다리는 시간
+    
+    # 페이지 캐시 설정 (비로그인 방문자용 홈/게시판 목록 HTML)
+    PAGE_CACHE_ENABLED: bool = True
+    PAGE_CACHE_MAX_ENTRIES: int = 512  # 보관할 최대 페이지 수
+    PAGE_CACHE_TTL_SECONDS: float = 30.0  # 조회수 등 무효화하지 않는 값이 늦게 반영되는 최대 시간
+    
+    # 템플릿 설정
+    TEMPLATE_BYTECODE_CACHE_DIR: Optional[str] = None  # 컴파일된 템플릿 저장 위치 (비우면 사용자별 임시 디렉터리, 현재 사용자만 쓸 수 있어야 함)
+    TEMPLATE_PRECOMPILE: bool = True  # 앱 시작 시 모든 템플릿을 미리 컴파일
+    TEMPLATE_STREAM_POST_DETAIL: bool = True  # 게시글 상세 페이지를 렌더링하면서 바로 전송
+    TEMPLATE_STREAM_CHUNK_SIZE: int = 4096  # 스트리밍할 때 한 번에 보내는 크기 (문자 수)
+    
+    # SQL 통계 설정 (요청마다 Server-Timing 헤더로 쿼리 수/DB 시간을 보냄)
+    SQL_SLOW_REQUEST_MS: float = 200.0  # DB 시간이 이보다 긴 요청은 로그로 남김
+    SQL_QUERY_COUNT_WARNING: int = 20  # 쿼리가 이만큼 이상인 요청은 로그로 남김 (N+1 의심)
+    SQL_STRICT_LAZY_LOAD: bool = False  # 템플릿 렌더링 중 지연 로딩 쿼리가 나가면 예외 발생 (개발/테스트용)
+    
+    # 느린 쿼리 기록 설정 (NDJSON 파일 + /api/admin/slow-queries)
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0  # 이보다 오래 걸린 쿼리를 기록
+    SLOW_QUERY_SAMPLE_RATE: float = 1.0  # 느린 쿼리 중 기록할 비율 (0~1)
+    SLOW_QUERY_LOG_PATH: str = "logs/slow_queries.ndjson"
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10 * 1024 * 1024  # 이 크기가 넘으면 파일 회전
+    SLOW_QUERY_LOG_BACKUPS: int = 5  # 보관할 이전 파일 수
+    
+    # 프로파일러 설정 (관리자가 ?__profile=1 또는 X-Profile: 1 헤더로 요청)
+    PROFILER_ENABLED: bool = True
+    
+    # 지표 설정
+    METRICS_ENABLED: bool = True  # /metrics (Prometheus 텍스트 형식) 제공
+    
+    # 정적 파일 설정 (python build_static.py 로 해시 이름 + 압축 파일을 만듦)
+    STATIC_MAX_AGE_SECONDS: int = 31536000  # 해시가 붙은 파일의 캐시 기간 (1년, immutable)
+    
+    # 댓글 페이지 설정
+    COMMENT_PAGE_SIZE: int = 20  # 한 번에 보여 줄 최상위 댓글 수
+    COMMENT_REPLY_PREVIEW: int = 3  # 댓글마다 미리 보여 줄 답글 수
+    COMMENT_REPLY_PAGE_SIZE: int = 20  # "답글 더 보기" 한 번에 가져올 답글 수
+    COMMENT_MAX_DEPTH: int = 8  # 한 페이지에 트리로 포함할 답글 깊이 (더 깊은 답글은 reply_count 로만 알려 줌)
+    
+    @property
+    def async_database_url(self) -> str:
+        """비동기 드라이버(aiosqlite)용 데이터베이스 URL"""
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        return self.DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
     
     class Config:
         env_file = ".env"
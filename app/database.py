@@ -2,34 +2,178 @@
 데이터베이스 연결 설정
 SQLAlchemy를 사용하여 SQLite 데이터베이스와 연결합니다
 """
-from sqlalchemy import create_engine
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, Optional, TypeVar, Union
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 from .config import settings
+from .profiler import profiled
+from .query_stats import install_query_stats
+from .slow_queries import install_slow_query_log
+from .sqlite_profile import engine_options, install_sqlite_profile
+
+T = TypeVar("T")
 
 # 데이터베이스 엔진 생성
 # check_same_thread=False는 SQLite에서 멀티스레드 사용을 위해 필요
+# 풀 크기와 SQLite PRAGMA 는 설정(Settings)의 성능 프로필을 따름
 engine = create_engine(
     settings.DATABASE_URL, 
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    **engine_options(settings.DATABASE_URL)
 )
+install_sqlite_profile(engine)
+install_query_stats(engine)
+install_slow_query_log(engine)
 
 # 세션 팩토리 생성
 # autocommit=False: 수동으로 commit 해야 함
 # autoflush=False: 수동으로 flush 해야 함
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 엔진 (DATABASE_ASYNC=True 일 때만 사용)
+# 라우터는 AsyncSession(aiosqlite)을 쓰고, init_db.py 같은 스크립트는 위의 동기 엔진을 그대로 사용
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        **engine_options(settings.async_database_url, is_async=True)
+    )
+    install_sqlite_profile(async_engine.sync_engine)
+    install_query_stats(async_engine.sync_engine)
+    install_slow_query_log(async_engine.sync_engine)
+    # expire_on_commit=False: commit 후 속성에 접근할 때 이벤트 루프 밖에서 다시 조회하지 않도록
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+# 라우터가 받는 세션 (동기 모드: Session, 비동기 모드: AsyncSession)
+DbSession = Union[Session, AsyncSession]
+
 # 모든 모델의 기본 클래스
 Base = declarative_base()
 
+class RequestSession:
+    """
+    요청 하나가 공유하는 세션 (Unit of Work)
+    미들웨어와 라우트 의존성이 같은 세션/identity map 을 쓰므로
+    요청마다 커넥션은 최대 한 번만 가져오고 같은 행은 한 번만 로드됩니다.
+    세션은 실제로 필요해질 때 처음 만들어집니다.
+    """
+
+    def __init__(self):
+        self._session: Optional[DbSession] = None
+
+    @property
+    def session(self) -> DbSession:
+        if self._session is None:
+            self._session = AsyncSessionLocal() if settings.DATABASE_ASYNC else SessionLocal()
+        return self._session
+
+    @property
+    def is_open(self) -> bool:
+        return self._session is not None
+
+    async def close(self) -> None:
+        if self._session is None:
+            return
+        if isinstance(self._session, AsyncSession):
+            await self._session.close()
+        else:
+            self._session.close()
+        self._session = None
+
+# 현재 요청의 세션 (요청마다 미들웨어가 설정)
+_request_session: ContextVar[Optional[RequestSession]] = ContextVar("request_session", default=None)
+
+@asynccontextmanager
+async def request_session_scope() -> AsyncIterator[RequestSession]:
+    """요청 범위의 세션을 열고, 요청이 끝나면 닫습니다. (미들웨어에서 사용)"""
+    scope = RequestSession()
+    token = _request_session.set(scope)
+    try:
+        yield scope
+    finally:
+        await scope.close()
+        _request_session.reset(token)
+
+def current_request_db() -> Optional[DbSession]:
+    """
+    요청 처리 중이면 그 요청의 세션(동기 모드: Session, 비동기 모드: AsyncSession)을,
+    아니면 None 을 반환합니다. 이벤트 루프에서 쓰려면 run_db 로 실행합니다.
+    """
+    scope = _request_session.get()
+    if scope is None:
+        return None
+    return scope.session
+
 # 데이터베이스 세션을 가져오는 의존성 함수
-def get_db():
+async def get_db():
     """
-    데이터베이스 세션을 생성하고 반환합니다.
-    요청이 끝나면 자동으로 세션을 닫습니다.
+    데이터베이스 세션을 반환합니다.
+    요청 범위 세션이 있으면 그것을 함께 쓰고(닫는 것은 미들웨어가 담당),
+    없으면 새 세션을 만들어 끝날 때 닫습니다.
     """
-    db = SessionLocal()
+    scope = _request_session.get()
+    if scope is not None:
+        yield scope.session
+        return
+
+    scope = RequestSession()
     try:
-        yield db
+        yield scope.session
     finally:
-        db.close()
\ No newline at end of file
+        await scope.close()
+
+async def run_db(db: DbSession, fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    세션을 첫 인자로 받는 동기 함수 fn 을 이벤트 루프를 막지 않고 실행합니다.
+    
+    - 비동기 모드: AsyncSession.run_sync 로 실행 (DB 입출력은 aiosqlite 에서 await)
+    - 동기 모드: 스레드 풀에서 실행
+    
+    fn 안에서는 기존처럼 db.query(...) 와 지연 로딩을 그대로 쓸 수 있습니다.
+    응답으로 돌려줄 ORM 객체는 fn 안에서 필요한 관계를 모두 로드하거나 스키마로 변환해야 합니다.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    # 프로파일링 중인 요청이면 스레드 풀의 작업도 추적
+    return await run_in_threadpool(profiled(fn), db, *args, **kwargs)
+
+def add_column_if_missing(table_name: str, column_name: str, column_ddl: str) -> bool:
+    """
+    기존 데이터베이스의 테이블에 컬럼이 없으면 추가합니다. (create_all 은 컬럼을 추가하지 않음)
+    컬럼을 새로 추가했으면 True 를 반환합니다.
+    """
+    columns = {column["name"] for column in inspect(engine).get_columns(table_name)}
+    if column_name in columns:
+        return False
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_ddl}"))
+    return True
+
+
+def create_missing_indexes() -> list:
+    """
+    모델에 정의된 인덱스 중 데이터베이스에 없는 것을 만듭니다.
+    (create_all 은 이미 있는 테이블에 인덱스를 추가하지 않음)
+    새로 만든 인덱스 이름 목록을 반환합니다.
+    """
+    created = []
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
+                created.append(index.name)
+    return created
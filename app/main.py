@@ -1,28 +1,50 @@
 """
 메인 애플리케이션 파일
 """
-from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from .config import settings
-from .database import SessionLocal
-from .models.user import User
-from .services.auth import AuthService
+from .database import async_engine, engine
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, render_metrics
+from .middleware import AuthMiddleware, ProfilerMiddleware
+from .query_stats import QueryStatsMiddleware
+from .sqlite_profile import pool_stats
+from .static_assets import STATIC_DIR, PrecompressedStaticFiles
+from .templating import precompile_templates, template_stats
+from .services.page_cache import page_cache
+from .services.password_hasher import password_hasher
+from .services.view_counter import view_counter
+from .services.writer import db_writer
 
 # 라우터 임포트
 from .routers.auth import auth_router, auth_api_router
 from .routers.posts import posts_router, posts_api_router
 from .routers.users import router as users_router
 from .routers.comments import router as comments_router
+from .routers.admin import router as admin_router
 
 # 앱 시작/종료 시 실행될 함수
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 서버 시작 중...")
+    # 첫 요청에서 템플릿을 컴파일하지 않도록 미리 읽어 둠
+    if settings.TEMPLATE_PRECOMPILE:
+        print(f"📄 템플릿 {precompile_templates()}개를 미리 컴파일했습니다.")
+    view_counter.start()
+    if settings.WRITE_QUEUE_ENABLED:
+        db_writer.start()
     yield
     print("👋 서버 종료 중...")
+    # 대기열에 남은 쓰기 작업을 먼저 마무리
+    await db_writer.stop()
+    # 아직 반영되지 않은 조회수를 DB에 저장
+    await view_counter.stop()
+    await password_hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 # FastAPI 앱 생성
 app = FastAPI(
@@ -43,33 +65,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 사용자 정보 로드 미들웨어
-@app.middleware("http")
-async def load_user_middleware(request: Request, call_next):
-    """
-    모든 요청에 대해 쿠키에서 토큰을 읽어 사용자 정보를 로드합니다.
-    로딩된 사용자는 request.state.user 에 저장되어 템플릿에서 접근할 수 있습니다.
-    """
-    request.state.user = None
-    token = request.cookies.get("access_token")
-    if token:
-        db = SessionLocal()
-        try:
-            payload = AuthService.decode_token(token)
-            if payload and payload.get("sub"):
-                username = payload.get("sub")
-                user = db.query(User).filter(User.username == username, User.is_active == True).first()
-                request.state.user = user
-        finally:
-            db.close()
-    
-    response = await call_next(request)
-    return response
+# 인증/요청 세션 미들웨어 (순수 ASGI - 정적 파일과 상태 확인은 건너뜀)
+# 쿠키 토큰의 사용자는 라우트가 get_request_user 의존성으로 필요할 때만 확인합니다.
+# 요청 범위 세션도 여기서 열어서 라우트 의존성(get_db)과 함께 쓰고, 응답을 모두 보낸 후 닫습니다.
+app.add_middleware(AuthMiddleware)
+
+# 관리자 요청 프로파일러 (?__profile=1 또는 X-Profile: 1 헤더, 요청하지 않으면 그대로 통과)
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
+# 요청별 SQL 통계 (Server-Timing 헤더, 느린 요청 로그) - 가장 바깥에서 요청 전체를 측정
+app.add_middleware(QueryStatsMiddleware)
+
+# 라우트별 요청 수/응답 시간 (/metrics)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 # --- 정적 파일 및 라우터 설정 ---
 
-# 정적 파일 설정
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+# 정적 파일 설정 (빌드된 파일은 미리 압축한 버전 + immutable 캐시)
+app.mount(
+    "/static",
+    PrecompressedStaticFiles(directory=STATIC_DIR, max_age=settings.STATIC_MAX_AGE_SECONDS),
+    name="static",
+)
 
 # 라우터 등록
 app.include_router(posts_router)      # / 및 /posts/* 페이지
@@ -78,9 +97,25 @@ app.include_router(auth_router)       # /login, /register, /logout 페이지
 app.include_router(auth_api_router)   # /api/auth/* API
 app.include_router(users_router)      # /api/users/* API
 app.include_router(comments_router)   # /api/comments/* API
+app.include_router(admin_router)      # /api/admin/* API (관리자 전용)
 
 # API 상태 확인
 @app.get("/api/health")
 async def health_check():
-    """서버 상태 확인"""
-    return {"status": "healthy", "app": settings.APP_NAME}
\ No newline at end of file
+    """서버 상태 확인 (커넥션 풀, 쓰기 작업자, 페이지 캐시, 템플릿 통계 포함)"""
+    return {
+        "status": "healthy",
+        "app": settings.APP_NAME,
+        "db_pool": pool_stats.snapshot(async_engine.sync_engine if async_engine is not None else engine),
+        "write_queue": db_writer.stats(),
+        "page_cache": page_cache.stats(),
+        "templates": template_stats.snapshot(),
+    }
+
+# Prometheus 지표 (대시보드/오토스케일링용)
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """요청/커넥션 풀/템플릿/bcrypt 대기열/캐시 지표 (Prometheus 텍스트 형식)"""
+        body = render_metrics(async_engine.sync_engine if async_engine is not None else engine)
+        return PlainTextResponse(body, media_type=METRICS_CONTENT_TYPE)
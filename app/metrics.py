@@ -0,0 +1,248 @@
+"""
+Prometheus 형식 지표 (/metrics)
+외부 라이브러리 없이 프로세스 안에서 모아 텍스트 형식(0.0.4)으로 내보냅니다.
+
+- 라우트별 요청 수와 응답 시간 히스토그램, 처리 중인 요청 수 (MetricsMiddleware)
+- 커넥션 풀, 템플릿 렌더링, bcrypt 대기열, 쓰기 대기열, 캐시 적중률 (각 서비스의 통계를 읽어 옴)
+
+지표는 워커 프로세스마다 따로 모이므로 여러 워커로 실행하면 Prometheus 에서 합산합니다.
+"""
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .services.likes import like_cache
+from .services.page_cache import page_cache
+from .services.password_hasher import password_hasher
+from .services.token_versions import token_versions
+from .services.writer import db_writer
+from .sqlite_profile import pool_stats
+from .templating import template_stats
+
+PREFIX = "community"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 응답 시간 버킷 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 라우트를 찾지 못한 요청(404)의 route 라벨 - 경로를 그대로 쓰면 라벨 종류가 끝없이 늘어남
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class MetricWriter:
+    """지표 텍스트를 만드는 도우미 (# HELP / # TYPE 을 한 번씩만 씀)"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str) -> str:
+        full_name = f"{PREFIX}_{name}"
+        self.lines.append(f"# HELP {full_name} {help_text}")
+        self.lines.append(f"# TYPE {full_name} {kind}")
+        return full_name
+
+    def sample(self, name: str, value: float, label_names: Sequence[str] = (), label_values: Sequence = ()) -> None:
+        self.lines.append(f"{name}{_labels(label_names, label_values)} {_number(value)}")
+
+    def metric(self, name: str, kind: str, help_text: str, value: float) -> None:
+        """라벨이 없는 지표 하나"""
+        self.sample(self.family(name, kind, help_text), value)
+
+    def labeled(self, name: str, kind: str, help_text: str, label_name: str, values: Dict[str, float]) -> None:
+        """라벨 하나로 구분되는 지표 (예: cache="page")"""
+        full_name = self.family(name, kind, help_text)
+        for label_value, value in values.items():
+            self.sample(full_name, value, (label_name,), (label_value,))
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+class Histogram:
+    """라벨별 누적 버킷 히스토그램"""
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 -> [버킷별 개수..., 전체 개수], 합계
+        self._counts: Dict[Tuple, List[int]] = {}
+        self._sums: Dict[Tuple, float] = {}
+
+    def observe(self, labels: Tuple, value: float) -> None:
+        # 호출하는 쪽에서 잠금을 잡고 있어야 함
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        counts[-1] += 1
+        self._sums[labels] += value
+
+    def write(self, writer: MetricWriter, full_name: str, label_names: Sequence[str]) -> None:
+        for labels, counts in sorted(self._counts.items()):
+            for bound, count in zip(self.buckets, counts):
+                writer.sample(f"{full_name}_bucket", count, (*label_names, "le"), (*labels, _number(bound)))
+            writer.sample(f"{full_name}_bucket", counts[-1], (*label_names, "le"), (*labels, "+Inf"))
+            writer.sample(f"{full_name}_sum", self._sums[labels], label_names, labels)
+            writer.sample(f"{full_name}_count", counts[-1], label_names, labels)
+
+
+class RequestMetrics:
+    """라우트별 요청 수/응답 시간과 처리 중인 요청 수"""
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self._requests: Dict[Tuple[str, str, str], int] = {}
+        self._latency = Histogram(buckets)
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, method: str, route: str, status_code: int, elapsed: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            key = (method, route, str(status_code))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self._latency.observe((method, route), elapsed)
+
+    def write(self, writer: MetricWriter) -> None:
+        with self._lock:
+            name = writer.family("http_requests_total", "counter", "처리한 HTTP 요청 수")
+            for labels, count in sorted(self._requests.items()):
+                writer.sample(name, count, ("method", "route", "status"), labels)
+            name = writer.family("http_request_duration_seconds", "histogram", "HTTP 요청 처리 시간 (응답 본문 전송까지)")
+            self._latency.write(writer, name, ("method", "route"))
+            writer.metric("http_requests_in_flight", "gauge", "처리 중인 HTTP 요청 수", self.in_flight)
+
+
+request_metrics = RequestMetrics()
+
+
+def route_label(scope: Scope) -> str:
+    """요청을 처리한 라우트의 경로 템플릿 (예: /posts/{post_id})"""
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    # 마운트된 앱 (정적 파일): Mount 가 root_path 에 마운트 경로를 붙여 둠
+    if "app_root_path" in scope and scope.get("root_path") != scope["app_root_path"]:
+        return scope["root_path"]
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """요청마다 라우트별 요청 수와 처리 시간을 기록합니다."""
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+        self.metrics.started()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.finished(scope["method"], route_label(scope), status_code, time.perf_counter() - start)
+
+
+def _write_pool(writer: MetricWriter, stats: Dict[str, float]) -> None:
+    writer.metric("db_pool_checkouts_total", "counter", "커넥션 풀에서 커넥션을 꺼낸 횟수", stats["checkouts"])
+    writer.metric("db_pool_waits_total", "counter", "커넥션을 바로 받지 못하고 기다린 횟수", stats["waits"])
+    writer.metric("db_pool_wait_seconds_total", "counter", "커넥션을 기다린 시간 합계", stats["wait_seconds_total"])
+    writer.metric("db_pool_wait_seconds_max", "gauge", "커넥션을 가장 오래 기다린 시간", stats["wait_seconds_max"])
+    writer.metric("db_pool_timeouts_total", "counter", "커넥션을 기다리다 타임아웃된 횟수", stats["timeouts"])
+    for key, help_text in (
+        ("size", "커넥션 풀 크기"),
+        ("checked_out", "사용 중인 커넥션 수"),
+        ("overflow", "풀 크기를 넘어 추가로 만든 커넥션 수"),
+    ):
+        if key in stats:
+            writer.metric(f"db_pool_{key}", "gauge", help_text, stats[key])
+
+
+def _write_templates(writer: MetricWriter, stats: Dict[str, Dict[str, float]]) -> None:
+    for name, key, kind, help_text in (
+        ("template_renders_total", "renders", "counter", "템플릿 렌더링 횟수"),
+        ("template_render_seconds_total", "render_seconds_total", "counter", "템플릿 렌더링 시간 합계"),
+        ("template_render_seconds_max", "render_seconds_max", "gauge", "템플릿 렌더링 최대 시간"),
+        ("template_compiles_total", "compiles", "counter", "템플릿 로드/컴파일 횟수"),
+        ("template_compile_seconds_total", "compile_seconds", "counter", "템플릿 로드/컴파일 시간 합계"),
+    ):
+        writer.labeled(name, kind, help_text, "template", {template: entry[key] for template, entry in stats.items()})
+
+
+def _write_caches(writer: MetricWriter, caches: Dict[str, Dict[str, float]]) -> None:
+    for name, key, kind, help_text in (
+        ("cache_hits_total", "hits", "counter", "캐시 적중 수"),
+        ("cache_misses_total", "misses", "counter", "캐시 실패 수"),
+        ("cache_hit_ratio", "hit_ratio", "gauge", "캐시 적중률 (시작 후 누적)"),
+        ("cache_entries", "entries", "gauge", "캐시 항목 수"),
+    ):
+        writer.labeled(name, kind, help_text, "cache", {cache: stats[key] for cache, stats in caches.items()})
+
+
+def render_metrics(engine=None) -> str:
+    """/metrics 응답 본문 (engine: 커넥션 풀 통계를 읽을 엔진)"""
+    writer = MetricWriter()
+    name = writer.family("info", "gauge", "앱 이름과 버전")
+    writer.sample(name, 1, ("app", "version"), (settings.APP_NAME, settings.APP_VERSION))
+
+    request_metrics.write(writer)
+    if engine is not None:
+        _write_pool(writer, pool_stats.snapshot(engine))
+    _write_templates(writer, template_stats.snapshot())
+
+    writer.metric("password_hash_queue_depth", "gauge", "대기 중인 bcrypt 작업 수", password_hasher.queue_depth)
+    writer.metric("password_hash_in_flight", "gauge", "실행 중이거나 대기 중인 bcrypt 작업 수", password_hasher.in_flight)
+    writer.metric("password_hash_rejected_total", "counter", "대기열이 가득 차 거절한 bcrypt 작업 수", password_hasher.rejected)
+
+    write_queue = db_writer.stats()
+    writer.metric("write_queue_depth", "gauge", "쓰기 대기열에 남은 작업 수", write_queue["queued"])
+    writer.metric("write_queue_groups_total", "counter", "한 번에 commit 한 쓰기 묶음 수", write_queue["groups"])
+    writer.metric("write_queue_operations_total", "counter", "쓰기 대기열로 처리한 작업 수", write_queue["operations"])
+
+    _write_caches(writer, {
+        "page": page_cache.stats(),
+        "like": like_cache.stats(),
+        "token_version": token_versions.stats(),
+    })
+    return writer.render()
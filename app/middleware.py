@@ -0,0 +1,146 @@
+"""
+미들웨어
+@app.middleware("http") (BaseHTTPMiddleware) 대신 순수 ASGI 미들웨어로 작성합니다.
+응답을 한 번 더 감싸지 않으므로 스트리밍 응답도 그대로 흘려보냅니다.
+
+- AuthMiddleware: 공개 경로 건너뛰기, 요청 범위 세션 (사용자 확인은 get_request_user 의존성이 필요할 때만)
+- ProfilerMiddleware: 관리자의 요청별 프로파일링 (?__profile=1)
+"""
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.requests import cookie_parser
+from starlette.responses import HTMLResponse, PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .database import request_session_scope
+from .profiler import profiling
+from .query_stats import current_query_stats
+from .services.auth import get_admin_user, get_current_user
+from .templating import environment
+
+# 인증이 필요 없는 경로 (사용자 확인도, 요청 세션도 만들지 않음)
+PUBLIC_PATHS = ("/api/health", "/metrics", "/favicon.ico", "/robots.txt")
+PUBLIC_PATH_PREFIXES = ("/static/",)
+
+# 프로파일링 요청 (관리자 전용)
+PROFILE_PARAM = "__profile"
+PROFILE_HEADER = b"x-profile"
+
+
+class AuthMiddleware:
+    """
+    요청 범위 세션을 열어 응답을 모두 보낸 뒤에 닫습니다.
+    쿠키 토큰의 사용자는 라우트가 get_request_user 의존성으로 필요할 때만 확인하고
+    (토큰 버전 확인에 DB 가 필요하면 이 세션을 run_db 로 씀), request.state.user 에 저장합니다.
+    공개 경로(정적 파일, 상태 확인)는 아무 일도 하지 않고 그대로 넘깁니다.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        public_paths: Iterable[str] = PUBLIC_PATHS,
+        public_prefixes: Iterable[str] = PUBLIC_PATH_PREFIXES,
+    ):
+        self.app = app
+        self.public_paths = frozenset(public_paths)
+        self.public_prefixes = tuple(public_prefixes)
+
+    def is_public(self, path: str) -> bool:
+        return path in self.public_paths or path.startswith(self.public_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.is_public(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        async with request_session_scope():
+            await self.app(scope, receive, send)
+
+
+def _profile_format(scope: Scope) -> Optional[str]:
+    """?__profile=<형식> 또는 X-Profile: <형식> 헤더로 요청한 보고서 형식 (요청하지 않았으면 None)"""
+    if PROFILE_PARAM.encode() in scope["query_string"]:
+        for name, value in parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True):
+            if name == PROFILE_PARAM:
+                return value or "1"
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return value.decode("latin-1") or "1"
+    return None
+
+
+def _without_profile_param(query_string: bytes) -> bytes:
+    params = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+    return urlencode([(name, value) for name, value in params if name != PROFILE_PARAM]).encode("latin-1")
+
+
+async def _is_admin(scope: Scope) -> bool:
+    """Authorization 헤더(Bearer) 또는 쿠키의 토큰이 관리자의 것인지 (get_admin_user 와 같은 확인)"""
+    headers = Headers(scope=scope)
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        token = cookie_parser(headers.get("cookie", "")).get("access_token")
+    try:
+        await get_admin_user(await get_current_user(token))
+    except HTTPException:
+        return False
+    return True
+
+
+class ProfilerMiddleware:
+    """
+    관리자가 ?__profile=1 (또는 X-Profile: 1 헤더) 을 붙인 요청을 프로파일링하고,
+    원래 응답 대신 보고서를 돌려줍니다. (?__profile=collapsed 면 collapsed stack 텍스트)
+    관리자가 아니면 요청 파라미터를 무시하고 평소처럼 처리합니다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        report_format = _profile_format(scope) if scope["type"] == "http" else None
+        if report_format in (None, "0", "false") or not await _is_admin(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # 라우트가 알 수 없는 파라미터로 보지 않도록 제거 (scope 는 바깥 미들웨어와 공유하므로 그 자리에서 수정)
+        scope["query_string"] = _without_profile_param(scope["query_string"])
+        status_code: Optional[int] = None
+        error: Optional[str] = None
+
+        async def discard_body(message: Message) -> None:
+            # 원래 응답은 보내지 않고 상태 코드만 기록
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        with profiling() as profile:
+            try:
+                await self.app(scope, receive, discard_body)
+            except Exception as exc:  # 실패한 요청도 어디서 시간을 썼는지 보여 줌
+                error = repr(exc)
+
+        if report_format == "collapsed":
+            response = PlainTextResponse(profile.collapsed())
+        else:
+            query_stats = current_query_stats()
+            path = scope["path"] + (f"?{scope['query_string'].decode('latin-1')}" if scope["query_string"] else "")
+            response = HTMLResponse(environment.get_template("profile_report.html").render({
+                "method": scope["method"],
+                "path": path,
+                "status_code": status_code,
+                "error": error,
+                "profile": profile,
+                "split": profile.split(),
+                "tree": profile.tree(),
+                "top_functions": profile.top_functions(),
+                "query_count": query_stats.count if query_stats else None,
+                "query_ms": query_stats.total_seconds * 1000 if query_stats else None,
+            }))
+        response.headers["Cache-Control"] = "no-store"
+        if status_code is not None:
+            response.headers["X-Profiled-Status"] = str(status_code)
+        await response(scope, receive, send)
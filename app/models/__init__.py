@@ -1,5 +1,6 @@
 from app.models.user import User
 from app.models.post import Post
 from app.models.comment import Comment
+from app.models.like import PostLike, CommentLike
 
-__all__ = ["User", "Post", "Comment"]
\ No newline at end of file
+__all__ = ["User", "Post", "Comment", "PostLike", "CommentLike"]
\ No newline at end of file
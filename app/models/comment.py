@@ -1,7 +1,7 @@
 """
 댓글 모델 - 게시글의 댓글을 저장합니다
 """
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
@@ -9,6 +9,16 @@ from ..database import Base
 class Comment(Base):
     __tablename__ = "comments"
     
+    __table_args__ = (
+        # 게시글의 댓글 목록 (최상위 댓글 -> 작성순)
+        Index("ix_comments_post_thread", "post_id", "parent_id", "created_at"),
+        # 삭제되지 않은 댓글만 담는 부분 인덱스 (댓글 수 계산용)
+        Index("ix_comments_post_live", "post_id", "created_at", sqlite_where=text("is_deleted = 0")),
+        # 답글 목록 (부모 댓글별 작성순, parent_id 가 있는 댓글만)
+        Index("ix_comments_replies", "parent_id", "created_at", sqlite_where=text("parent_id IS NOT NULL")),
+        Index("ix_comments_author", "author_id"),
+    )
+    
     # 기본 키
     id = Column(Integer, primary_key=True, index=True)
     
@@ -35,6 +45,7 @@ class Comment(Base):
     # 관계 설정
     author = relationship("User", back_populates="comments")
     post = relationship("Post", back_populates="comments")
+    likes = relationship("CommentLike", cascade="all, delete-orphan")
     
     # 대댓글 관계 (자기 참조)
     parent = relationship("Comment", remote_side=[id], backref="replies")
@@ -0,0 +1,48 @@
+"""
+좋아요 모델 - 누가 어떤 게시글/댓글에 좋아요를 눌렀는지 저장합니다
+"""
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime
+from ..database import Base
+
+class PostLike(Base):
+    __tablename__ = "post_likes"
+    
+    # 한 사용자는 같은 게시글에 한 번만 좋아요 가능
+    __table_args__ = (
+        UniqueConstraint("user_id", "post_id", name="uq_post_likes_user_post"),
+    )
+    
+    # 기본 키
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # 외래 키
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # 시간 정보
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<PostLike user={self.user_id} post={self.post_id}>"
+
+class CommentLike(Base):
+    __tablename__ = "comment_likes"
+    
+    # 한 사용자는 같은 댓글에 한 번만 좋아요 가능
+    __table_args__ = (
+        UniqueConstraint("user_id", "comment_id", name="uq_comment_likes_user_comment"),
+    )
+    
+    # 기본 키
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # 외래 키
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    comment_id = Column(Integer, ForeignKey("comments.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # 시간 정보
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<CommentLike user={self.user_id} comment={self.comment_id}>"
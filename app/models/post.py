@@ -1,20 +1,29 @@
 """
 게시글 모델 - 커뮤니티 게시글을 저장합니다
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 from ..database import Base
 
 class Post(Base):
     __tablename__ = "posts"
     
+    # 목록 조회용 인덱스 (공지 고정 -> 최신순 정렬과 커서 비교를 인덱스 순서대로 처리)
+    __table_args__ = (
+        Index("ix_posts_feed", "is_published", "is_pinned", "created_at", "id"),
+        Index("ix_posts_category_feed", "category", "is_published", "is_pinned", "created_at", "id"),
+        Index("ix_posts_author", "author_id", "created_at"),
+    )
+    
     # 기본 키
     id = Column(Integer, primary_key=True, index=True)
     
     # 게시글 내용
     title = Column(String(200), nullable=False)
-    content = Column(Text, nullable=False)
+    # 본문은 목록에서 읽지 않도록 지연 로딩 (목록 미리 보기는 excerpt 사용)
+    content = deferred(Column(Text, nullable=False))
+    excerpt = Column(String(200), nullable=True)  # 본문 앞부분 (작성/수정 시 저장)
     
     # 카테고리 (자유게시판, 질문게시판 등)
     category = Column(String(50), default="자유게시판")
@@ -23,6 +32,15 @@ class Post(Base):
     view_count = Column(Integer, default=0)
     like_count = Column(Integer, default=0)
     
+    # 댓글 수 (삭제되지 않은 댓글 기준, 댓글 작성/삭제 시 함께 갱신)
+    # 목록 페이지에서 게시글마다 COUNT 쿼리를 날리지 않기 위한 비정규화 컬럼
+    comment_count = Column(Integer, default=0, nullable=False, server_default="0")
+    
+    # 댓글 스레드 버전과 마지막 변경 시각 (댓글 작성/수정/삭제/좋아요, 댓글 작성자 닉네임 변경 시 갱신)
+    # 댓글 API 의 ETag/Last-Modified 를 스레드 전체를 집계하지 않고 만들기 위한 값
+    comments_version = Column(Integer, default=0, nullable=False, server_default="0")
+    comments_updated_at = Column(DateTime, nullable=True)
+    
     # 상태
     is_published = Column(Boolean, default=True)
     is_pinned = Column(Boolean, default=False)  # 공지사항 고정
@@ -37,6 +55,7 @@ class Post(Base):
     # 관계 설정
     author = relationship("User", back_populates="posts")
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
+    likes = relationship("PostLike", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Post {self.title}>"
\ No newline at end of file
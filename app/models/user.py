@@ -26,6 +26,9 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     is_admin = Column(Boolean, default=False)
     
+    # 토큰 버전 (올리면 이전에 발급된 토큰이 모두 무효화됨)
+    token_version = Column(Integer, default=0, nullable=False, server_default="0")
+    
     # 시간 정보
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,275 @@
+"""
+요청 프로파일러 (관리자 전용, ?__profile=1 또는 X-Profile 헤더)
+cProfile 과 같은 방식(sys.setprofile)으로 함수 호출/반환을 따라가며 호출 트리를 만들고,
+트리의 각 노드(루트부터의 호출 경로)에서 쓴 시간을 잽니다.
+
+- 추적 대상: 요청을 받은 이벤트 루프 스레드 + 이 요청의 run_db/템플릿 스트리밍을 실행한 스레드
+  (같은 시간에 그 스레드들에서 돌고 있는 다른 요청의 코드도 함께 잡힐 수 있음)
+- 스레드가 일감을 기다리는 시간(selectors/threading/queue 에서 대기)은 제외
+- 호출 경로에 있는 코드로 DB / 템플릿 / Python 시간을 나눔
+- 결과는 collapsed stack (flamegraph.pl, speedscope 에서 읽는 형식, 값은 마이크로초) 과 트리로 만듦
+
+프로세스 안에서 스택을 샘플링하는 방식은 샘플링 스레드가 GIL 을 넘겨받는 지점(소켓 쓰기 등)에
+샘플이 몰려 쓰지 않습니다. 추적하는 동안에는 함수 호출마다 비용이 붙으므로 절대 시간은 실제보다 길게 나옵니다.
+프로파일링을 요청하지 않은 요청은 ContextVar 를 한 번 읽는 것 외에는 아무 일도 하지 않습니다.
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+CATEGORY_DB = "db"
+CATEGORY_TEMPLATE = "template"
+CATEGORY_PYTHON = "python"
+# 일감을 기다린 시간 (보고서에서 제외)
+CATEGORY_IDLE = "idle"
+
+# 호출 경로에 이 경로의 코드가 있으면 DB 작업으로 봄
+_DB_PATH_MARKERS = ("/sqlalchemy/", "/sqlite3/", "/aiosqlite/")
+# 컴파일된 템플릿 코드의 파일 이름은 템플릿 파일 (.html)
+_TEMPLATE_PATH_MARKERS = ("/jinja2/", "/templating.py", ".html")
+# 이벤트 루프, 스레드 풀 작업자가 할 일 없이 기다리는 곳
+_IDLE_PATH_MARKERS = ("/selectors.py", "/threading.py", "/queue.py")
+# 스레드 풀 작업자가 이벤트 루프를 깨우는 함수 (GIL 을 다시 받을 때까지 기다린 시간이 섞임)
+_IDLE_FUNCTIONS = ("_write_to_self",)
+
+# 부모와 자식의 구분이 다르면 우선하는 쪽 (DB 작업 안에서 부른 코드는 DB 시간)
+_PRIORITY = {CATEGORY_PYTHON: 0, CATEGORY_TEMPLATE: 1, CATEGORY_DB: 2, CATEGORY_IDLE: 3}
+
+
+def _short_path(filename: str) -> str:
+    """site-packages 나 프로젝트 경로를 떼어 낸 짧은 파일 이름"""
+    normalized = filename.replace("\\", "/")
+    for marker in ("/site-packages/", "/dist-packages/"):
+        index = normalized.rfind(marker)
+        if index != -1:
+            return normalized[index + len(marker):]
+    index = normalized.rfind("/app/")
+    if index != -1:
+        return normalized[index + 1:]
+    return normalized.rsplit("/", 1)[-1]
+
+
+def _code_category(code) -> Optional[str]:
+    if code.co_name in _IDLE_FUNCTIONS:
+        return CATEGORY_IDLE
+    normalized = code.co_filename.replace("\\", "/")
+    for category, markers in (
+        (CATEGORY_IDLE, _IDLE_PATH_MARKERS),
+        (CATEGORY_DB, _DB_PATH_MARKERS),
+        (CATEGORY_TEMPLATE, _TEMPLATE_PATH_MARKERS),
+    ):
+        if any(marker in normalized for marker in markers):
+            return category
+    return None
+
+
+class _Node:
+    """호출 트리의 노드"""
+    __slots__ = ("label", "parent", "children", "self_time", "category")
+
+    def __init__(self, label: str, parent: Optional["_Node"], category: str):
+        self.label = label
+        self.parent = parent
+        self.children: Dict[str, "_Node"] = {}
+        self.self_time = 0.0  # 이 노드 자신(자식 호출 제외)에서 쓴 시간 (초)
+        self.category = category
+
+    def child(self, label: str, category: Optional[str]) -> "_Node":
+        node = self.children.get(label)
+        if node is None:
+            if category is None or _PRIORITY[self.category] >= _PRIORITY[category]:
+                category = self.category
+            node = self.children[label] = _Node(label, self, category)
+        return node
+
+    def walk(self) -> Iterator["_Node"]:
+        yield self
+        for child in self.children.values():
+            yield from child.walk()
+
+    def path(self) -> List[str]:
+        labels = []
+        node = self
+        while node.parent is not None:
+            labels.append(node.label)
+            node = node.parent
+        labels.reverse()
+        return labels
+
+
+class RequestProfile:
+    """요청 하나의 호출 트리 프로파일"""
+
+    def __init__(self):
+        self.root = _Node("전체", None, CATEGORY_PYTHON)
+        # 스레드별 현재 노드와 마지막 이벤트 시각 (각 스레드는 자기 항목만 바꿈)
+        self._current: Dict[int, _Node] = {}
+        self._last: Dict[int, float] = {}
+        self._labels: Dict[Any, Tuple[str, Optional[str]]] = {}
+        self.active = False
+        self.started_at = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self.active = True
+        self.add_current_thread()
+
+    def stop(self) -> None:
+        self.active = False
+        # 다른 스레드는 다음 이벤트에서 스스로 추적을 끔
+        sys.setprofile(None)
+        self.elapsed = time.perf_counter() - self.started_at
+
+    def add_current_thread(self) -> None:
+        """현재 스레드도 추적합니다. (스레드 풀에서 이 요청의 작업을 실행할 때)"""
+        ident = threading.get_ident()
+        if not self.active or ident in self._current:
+            return
+        self._current[ident] = self.root.child(f"스레드 {threading.current_thread().name}", None)
+        self._last[ident] = time.perf_counter()
+        sys.setprofile(self._trace)
+
+    def _code_label(self, code) -> Tuple[str, Optional[str]]:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = (
+                f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})",
+                _code_category(code),
+            )
+        return label
+
+    def _trace(self, frame, event: str, arg) -> None:
+        now = time.perf_counter()
+        ident = threading.get_ident()
+        node = self._current.get(ident)
+        if not self.active or node is None:
+            sys.setprofile(None)
+            return
+        node.self_time += now - self._last[ident]
+
+        if event == "call":
+            node = node.child(*self._code_label(frame.f_code))
+        elif event == "c_call":
+            node = node.child(f"{getattr(arg, '__qualname__', arg)} (C)", None)
+        elif node.parent.parent is not None:
+            # return / c_return / c_exception - 추적을 시작한 함수보다 바깥으로 나가면 스레드 노드에 둠
+            node = node.parent
+
+        self._current[ident] = node
+        # 이 함수 자체에 걸린 시간은 빼고 잼
+        self._last[ident] = time.perf_counter()
+
+    def _busy_nodes(self) -> Iterator[_Node]:
+        for node in self.root.walk():
+            if node.self_time > 0 and node.category != CATEGORY_IDLE:
+                yield node
+
+    @property
+    def busy_seconds(self) -> float:
+        """기다린 시간을 뺀, 추적한 스레드들이 일한 시간 합계"""
+        return sum(node.self_time for node in self._busy_nodes())
+
+    def collapsed(self) -> str:
+        """collapsed stack 형식 (한 줄에 '루트;...;리프 마이크로초')"""
+        lines = Counter()
+        for node in self._busy_nodes():
+            lines[";".join(node.path())] += round(node.self_time * 1_000_000)
+        return "".join(f"{stack} {value}\n" for stack, value in lines.most_common() if value)
+
+    def split(self) -> List[Dict[str, Any]]:
+        """DB / 템플릿 / Python 별 시간(ms)과 비율"""
+        totals = Counter()
+        for node in self._busy_nodes():
+            totals[node.category] += node.self_time
+        busy = sum(totals.values())
+        return [
+            {
+                "category": category,
+                "ms": round(totals[category] * 1000, 1),
+                "percent": round(totals[category] * 100 / busy, 1) if busy else 0.0,
+            }
+            for category in (CATEGORY_DB, CATEGORY_TEMPLATE, CATEGORY_PYTHON)
+        ]
+
+    def top_functions(self, limit: int = 30) -> List[Tuple[str, float]]:
+        """자기 자신(호출한 함수 제외)에서 쓴 시간(ms)이 긴 함수"""
+        totals = Counter()
+        for node in self._busy_nodes():
+            totals[node.label] += node.self_time
+        return [(label, round(seconds * 1000, 2)) for label, seconds in totals.most_common(limit)]
+
+    def tree(self, min_fraction: float = 0.005) -> Dict[str, Any]:
+        """
+        flame 요약용 트리 {names, ms, children}. 기다린 시간과 전체의 min_fraction 보다 작은 가지는 생략하고,
+        갈라지지 않고 이어지는 호출(프레임워크의 긴 호출 사슬 등)은 한 노드(names)로 합칩니다.
+        """
+        totals: Dict[int, float] = {}
+
+        def total(node: _Node) -> float:
+            value = 0.0 if node.category == CATEGORY_IDLE else node.self_time
+            value += sum(total(child) for child in node.children.values())
+            totals[id(node)] = value
+            return value
+
+        threshold = total(self.root) * min_fraction
+
+        def visible_children(node: _Node) -> List[_Node]:
+            return sorted(
+                (child for child in node.children.values() if totals[id(child)] > threshold),
+                key=lambda child: totals[id(child)], reverse=True,
+            )
+
+        def prune(node: _Node) -> Dict[str, Any]:
+            names = [node.label]
+            children = visible_children(node)
+            while len(children) == 1 and node.self_time <= threshold:
+                node = children[0]
+                names.append(node.label)
+                children = visible_children(node)
+            return {"names": names, "ms": totals[id(node)] * 1000, "children": [prune(child) for child in children]}
+
+        return prune(self.root)
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+@contextmanager
+def profiling() -> Iterator[RequestProfile]:
+    """이 블록(요청 처리)을 프로파일링합니다."""
+    profile = RequestProfile()
+    token = _current_profile.set(profile)
+    profile.start()
+    try:
+        yield profile
+    finally:
+        profile.stop()
+        _current_profile.reset(token)
+
+
+def trace_current_thread() -> None:
+    """프로파일링 중인 요청이면 현재 스레드도 추적합니다."""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.add_current_thread()
+
+
+def profiled(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """프로파일링 중인 요청이면 fn 을 실행하는 스레드도 추적하도록 감쌉니다. (스레드 풀로 넘기는 함수용)"""
+    profile = _current_profile.get()
+    if profile is None:
+        return fn
+
+    def wrapper(*args, **kwargs):
+        profile.add_current_thread()
+        return fn(*args, **kwargs)
+    return wrapper
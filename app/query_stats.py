@@ -0,0 +1,158 @@
+"""
+요청별 SQL 통계
+엔진의 커서 실행 이벤트로 요청마다 쿼리 수, DB 시간 합계, 가장 느린 쿼리를 기록하고
+응답의 Server-Timing 헤더로 내보냅니다. (브라우저 개발자 도구의 Timing 탭에서 확인)
+느리거나 쿼리가 많은 요청은 로그로 남깁니다.
+
+지연 로딩(lazy load) 감지:
+템플릿 렌더링 중에 관계/지연 컬럼을 읽어서 쿼리가 나가면 N+1 의 신호입니다.
+요청 통계에 개수를 세고, SQL_STRICT_LAZY_LOAD 이면 예외를 발생시킵니다.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LazyLoadError(RuntimeError):
+    """템플릿 렌더링 중에 지연 로딩 쿼리가 실행됨 (SQL_STRICT_LAZY_LOAD)"""
+
+
+class RequestQueryStats:
+    """요청 하나의 SQL 통계"""
+    __slots__ = ("scope", "count", "total_seconds", "slowest_seconds", "slowest_statement", "lazy_loads")
+
+    def __init__(self, scope: Optional[Scope] = None):
+        # 요청의 ASGI scope (라우트를 찾은 뒤에는 scope["route"] 로 라우트를 알 수 있음)
+        self.scope = scope
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.lazy_loads: List[str] = []
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        if elapsed > self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (dur 단위는 밀리초)"""
+        timing = f'db;dur={self.total_seconds * 1000:.2f};desc="{self.count} queries"'
+        if self.count:
+            timing += f", db-slowest;dur={self.slowest_seconds * 1000:.2f}"
+        if self.lazy_loads:
+            timing += f', lazy-loads;desc="{len(self.lazy_loads)}"'
+        return timing
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+# 템플릿 렌더링 중인지 (지연 로딩 감지용)
+_rendering: ContextVar[bool] = ContextVar("template_rendering", default=False)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def template_rendering() -> Iterator[None]:
+    """이 블록 안에서 실행되는 지연 로딩을 템플릿에서 일어난 것으로 봅니다."""
+    token = _rendering.set(True)
+    try:
+        yield
+    finally:
+        _rendering.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_stats_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    start = getattr(context, "_query_stats_start", None)
+    if stats is not None and start is not None:
+        stats.record(statement, time.perf_counter() - start)
+
+
+def _detect_lazy_load(state: ORMExecuteState) -> None:
+    # 관계 지연 로딩과 지연(deferred)/만료된 컬럼 로딩만 (직접 실행한 쿼리와 eager 로딩은 제외)
+    if not state.is_select or not _rendering.get():
+        return
+    if state.lazy_loaded_from is None and not state.is_column_load:
+        return
+    mapper = state.bind_mapper
+    description = f"{mapper.class_.__name__ if mapper is not None else '?'} "\
+                  f"({'관계' if state.lazy_loaded_from is not None else '컬럼'})"
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.lazy_loads.append(description)
+    if settings.SQL_STRICT_LAZY_LOAD:
+        raise LazyLoadError(f"템플릿 렌더링 중에 {description} 지연 로딩 쿼리가 실행되었습니다: {state.statement}")
+    logger.warning("템플릿 렌더링 중 지연 로딩: %s", description)
+
+
+def install_query_stats(engine: Engine) -> None:
+    """엔진에 요청별 SQL 통계 이벤트를 등록합니다."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# 동기/비동기 세션 모두 내부적으로 Session 을 쓰므로 클래스에 한 번만 등록
+event.listen(Session, "do_orm_execute", _detect_lazy_load)
+
+
+class QueryStatsMiddleware:
+    """요청마다 SQL 통계를 모아 Server-Timing 헤더로 보내고, 느린 요청은 로그로 남깁니다."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(scope)
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # 스트리밍 응답이면 헤더를 보내는 시점까지의 통계
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            self._log(scope, stats, time.perf_counter() - start)
+
+    @staticmethod
+    def _log(scope: Scope, stats: RequestQueryStats, elapsed: float) -> None:
+        slow = stats.total_seconds * 1000 >= settings.SQL_SLOW_REQUEST_MS
+        chatty = stats.count >= settings.SQL_QUERY_COUNT_WARNING
+        if not (slow or chatty or stats.lazy_loads):
+            return
+        logger.warning(
+            "%s %s: 쿼리 %d개, DB %.1fms / 전체 %.1fms, 지연 로딩 %d개, 가장 느린 쿼리 %.1fms: %s",
+            scope["method"], scope["path"], stats.count, stats.total_seconds * 1000, elapsed * 1000,
+            len(stats.lazy_loads), stats.slowest_seconds * 1000, stats.slowest_statement,
+        )
@@ -3,6 +3,7 @@ from .auth import auth_router, auth_api_router
 from .posts import posts_router, posts_api_router
 from .users import router as users_router
 from .comments import router as comments_router
+from .admin import router as admin_router
 
 __all__ = [
     "auth_router", 
@@ -10,5 +11,6 @@ __all__ = [
     "posts_router", 
     "posts_api_router", 
     "users_router", 
-    "comments_router"
+    "comments_router",
+    "admin_router"
 ]
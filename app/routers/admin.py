@@ -0,0 +1,32 @@
+"""
+관리자 라우터 - 운영 진단용 API
+"""
+from fastapi import APIRouter, Depends, Query, status
+from typing import List, Literal
+
+from ..schemas.admin import SlowQuerySummary
+from ..schemas.user import TokenData
+from ..services.auth import get_admin_user
+from ..slow_queries import slow_query_stats
+
+router = APIRouter(prefix="/api/admin", tags=["관리자"])
+
+@router.get("/slow-queries", response_model=List[SlowQuerySummary])
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    sort: Literal["total_ms", "count", "max_ms", "avg_ms"] = "total_ms",
+    current_user: TokenData = Depends(get_admin_user)  # 관리자만
+):
+    """
+    느린 쿼리 상위 목록 (관리자 전용)
+    값만 다른 쿼리는 정규화한 문장 하나로 묶어 횟수/시간 합계/최대 시간/라우트별 횟수를 보여 줍니다.
+    (이 워커 프로세스가 시작된 뒤의 집계)
+    """
+    return slow_query_stats.top(limit=limit, sort=sort)
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(
+    current_user: TokenData = Depends(get_admin_user)  # 관리자만
+):
+    """느린 쿼리 집계 초기화 (관리자 전용, 파일 기록은 그대로 둠)"""
+    slow_query_stats.clear()
@@ -4,22 +4,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Form
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from datetime import timedelta
+from typing import Optional
 
-from ..database import get_db
+from ..database import DbSession, get_db, run_db
+from ..templating import templates
 from ..models.user import User
-from ..schemas.user import UserCreate, UserResponse
-from ..services.auth import AuthService, get_current_user
+from ..schemas.user import TokenData, UserCreate, UserResponse
+from ..services.auth import AuthService, get_current_user_record, get_request_user
+from ..services.password_hasher import password_hasher
+from ..services.token_versions import revoke_user_tokens
 from ..config import settings
 
-# --- 라우터 및 템플릿 설정 ---
-templates = Jinja2Templates(directory="app/templates")
+# --- 라우터 설정 (템플릿은 app/templating.py 의 공용 환경 사용) ---
 page_router = APIRouter(tags=["인증 페이지"])
 api_router = APIRouter(prefix="/api/auth", tags=["인증 API"])
 
-
 # --- 페이지 렌더링 라우트 ---
 
 @page_router.get("/register")
@@ -33,8 +34,15 @@ async def render_login_page(request: Request):
     return templates.TemplateResponse("login.html", {"request": request})
 
 @page_router.get("/logout")
-async def logout_and_redirect(response: Response):
-    """로그아웃 (쿠키 삭제 후 홈으로 리디렉션)"""
+async def logout_and_redirect(
+    response: Response,
+    db: DbSession = Depends(get_db),
+    current_user: Optional[TokenData] = Depends(get_request_user)
+):
+    """로그아웃 (토큰 폐기, 쿠키 삭제 후 홈으로 리디렉션)"""
+    # 토큰 버전을 올려서 이미 발급된 토큰도 더 이상 쓸 수 없게 함
+    if current_user:
+        await run_db(db, revoke_user_tokens, current_user.id)
     response = RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
     response.delete_cookie(key="access_token")
     return response
@@ -46,29 +54,36 @@ async def logout_and_redirect(response: Response):
 async def register(
     response: Response,
     user_data: UserCreate = Depends(UserCreate.as_form), # Use UserCreate.as_form for validation
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """회원가입 처리 (폼 제출)"""
     # user_data is already validated by Depends(UserCreate.as_form)
     
-    # 중복 확인
-    if db.query(User).filter(User.username == user_data.username).first():
-        raise HTTPException(status_code=400, detail="이미 사용 중인 아이디입니다")
-    if db.query(User).filter(User.email == user_data.email).first():
-        raise HTTPException(status_code=400, detail="이미 사용 중인 이메일입니다")
+    def check_duplicates(db: Session) -> None:
+        # 중복 확인
+        if db.query(User).filter(User.username == user_data.username).first():
+            raise HTTPException(status_code=400, detail="이미 사용 중인 아이디입니다")
+        if db.query(User).filter(User.email == user_data.email).first():
+            raise HTTPException(status_code=400, detail="이미 사용 중인 이메일입니다")
+
+    def save(db: Session, new_user: User) -> None:
+        db.add(new_user)
+        db.commit()
+        db.refresh(new_user)
 
-    # 사용자 생성
+    await run_db(db, check_duplicates)
+
+    # 사용자 생성 (bcrypt 해싱은 전용 스레드 풀에서 실행)
     new_user = User(
         username=user_data.username,
         email=user_data.email,
-        hashed_password=AuthService.get_password_hash(user_data.password),
+        hashed_password=await password_hasher.hash(user_data.password),
         nickname=user_data.nickname or user_data.username
     )
-    db.add(new_user)
-    db.commit()
+    await run_db(db, save, new_user)
 
     # 회원가입 후 바로 로그인 처리
-    access_token = AuthService.create_access_token(data={"sub": new_user.username})
+    access_token = AuthService.create_user_token(new_user)
     
     # 쿠키에 토큰 저장 후 리디렉션
     redirect_response = RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
@@ -85,11 +100,19 @@ async def register(
 async def login_for_access_token(
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """로그인 처리 (폼 제출) 및 토큰 발급"""
-    user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not AuthService.verify_password(form_data.password, user.hashed_password):
+    def load(db: Session) -> Optional[User]:
+        return db.query(User).filter(User.username == form_data.username).first()
+
+    def save(db: Session) -> None:
+        db.commit()
+        db.refresh(user)
+
+    user = await run_db(db, load)
+    # bcrypt 검증은 전용 스레드 풀에서 실행 (이벤트 루프를 막지 않음)
+    if not user or not await password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="아이디 또는 비밀번호가 올바르지 않습니다",
@@ -97,7 +120,12 @@ async def login_for_access_token(
     if not user.is_active:
         raise HTTPException(status_code=403, detail="비활성화된 계정입니다")
 
-    access_token = AuthService.create_access_token(data={"sub": user.username})
+    # bcrypt cost 설정이 바뀌었으면 로그인한 김에 새 cost 로 다시 해싱
+    if AuthService.needs_rehash(user.hashed_password):
+        user.hashed_password = await password_hasher.hash(form_data.password)
+        await run_db(db, save)
+
+    access_token = AuthService.create_user_token(user)
     
     # 쿠키에 토큰 저장 후 리디렉션
     redirect_response = RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
@@ -111,7 +139,7 @@ async def login_for_access_token(
     return redirect_response
 
 @api_router.get("/me", response_model=UserResponse)
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user_record)):
     """현재 로그인한 사용자 정보 조회 (API용)"""
     return current_user
 
@@ -1,159 +1,237 @@
 """
 댓글 라우터 - 댓글 CRUD
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session
+from typing import Optional
 
-from ..database import get_db
-from ..models.user import User
+from ..config import settings
+from ..database import DbSession, get_db, run_db
+from ..schemas.user import TokenData
 from ..models.post import Post
 from ..models.comment import Comment
-from ..schemas.comment import CommentCreate, CommentUpdate, CommentResponse
+from ..schemas.comment import CommentCreate, CommentUpdate, CommentResponse, CommentPage
 from ..services.auth import get_current_user
+from ..services.comment_tree import load_comment_page, load_reply_page
+from ..services.conditional import is_not_modified, make_etag, not_modified_response, validator_headers
+from ..services.counters import increment_comment_count, touch_comments
+from ..services.likes import set_like
+from ..services.page_cache import page_cache, post_tag
+from ..services.writer import on_commit, run_write
 
 router = APIRouter(prefix="/api/posts/{post_id}/comments", tags=["댓글"])
 
+def _get_comment_or_404(db: Session, post_id: int, comment_id: int) -> Comment:
+    comment = db.query(Comment).filter(
+        Comment.id == comment_id,
+        Comment.post_id == post_id
+    ).first()
+    
+    if not comment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="댓글을 찾을 수 없습니다"
+        )
+    return comment
+
 @router.post("/", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
 async def create_comment(
     post_id: int,
     comment_data: CommentCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
 ):
     """
     댓글 작성
     """
-    # 게시글 존재 확인
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="게시글을 찾을 수 없습니다"
-        )
-    
-    # 대댓글인 경우 부모 댓글 확인
-    if comment_data.parent_id:
-        parent_comment = db.query(Comment).filter(
-            Comment.id == comment_data.parent_id,
-            Comment.post_id == post_id
-        ).first()
-        if not parent_comment:
+    def save(db: Session) -> CommentResponse:
+        # 게시글 존재 확인
+        post = db.query(Post).filter(Post.id == post_id).first()
+        if not post:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="부모 댓글을 찾을 수 없습니다"
+                detail="게시글을 찾을 수 없습니다"
             )
+        
+        # 대댓글인 경우 부모 댓글 확인
+        if comment_data.parent_id:
+            parent_comment = db.query(Comment).filter(
+                Comment.id == comment_data.parent_id,
+                Comment.post_id == post_id
+            ).first()
+            if not parent_comment:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="부모 댓글을 찾을 수 없습니다"
+                )
+        
+        new_comment = Comment(
+            content=comment_data.content,
+            author_id=current_user.id,
+            post_id=post_id,
+            parent_id=comment_data.parent_id
+        )
+        
+        db.add(new_comment)
+        # 댓글 수도 같은 트랜잭션에서 갱신
+        increment_comment_count(db, post_id)
+        # 목록 페이지에 보이는 댓글 수가 바뀌므로 이 글이 보이는 페이지 캐시 삭제
+        on_commit(db, lambda: page_cache.invalidate(post_tag(post_id)))
+        db.flush()
+        db.refresh(new_comment)
+        
+        # author 정보 로드
+        db.refresh(new_comment, ["author"])
+        
+        return CommentResponse.model_validate(new_comment)
     
-    new_comment = Comment(
-        content=comment_data.content,
-        author_id=current_user.id,
-        post_id=post_id,
-        parent_id=comment_data.parent_id
-    )
-    
-    db.add(new_comment)
-    db.commit()
-    db.refresh(new_comment)
-    
-    # author 정보 로드
-    db.refresh(new_comment, ["author"])
-    
-    return new_comment
+    return await run_write(db, save)
 
-@router.get("/", response_model=List[CommentResponse])
-async def get_comments(
-    post_id: int,
-    db: Session = Depends(get_db)
-):
+def _thread_validators(db: Session, request: Request, post_id: int, *key):
     """
-    게시글의 댓글 목록 조회
+    게시글 댓글 스레드의 검증자(ETag/Last-Modified)를 계산합니다.
+    댓글이 바뀔 때마다 올라가는 게시글의 comments_version 한 행만 읽으므로 스레드 크기와 상관없습니다.
+    게시글이 없으면 404, 있으면 (304 로 응답해도 되는지, 응답 헤더) 를 반환합니다.
     """
-    # 게시글 존재 확인
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
+    thread = db.query(Post.comments_version, Post.comments_updated_at).filter(Post.id == post_id).first()
+    if not thread:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="게시글을 찾을 수 없습니다"
         )
+    etag = make_etag("comments", post_id, *key, thread.comments_version)
+    last_modified = thread.comments_updated_at
+    return is_not_modified(request, etag, last_modified), validator_headers(etag, last_modified)
+
+@router.get("/", response_model=CommentPage)
+async def get_comments(
+    post_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(settings.COMMENT_PAGE_SIZE, ge=1, le=100, description="가져올 최상위 댓글 수"),
+    replies: int = Query(settings.COMMENT_REPLY_PREVIEW, ge=0, le=20, description="댓글마다 미리 포함할 답글 수"),
+    max_depth: int = Query(settings.COMMENT_MAX_DEPTH, ge=0, le=100, description="포함할 답글의 최대 깊이"),
+    db: DbSession = Depends(get_db)
+):
+    """
+    게시글의 댓글 목록 조회 (최상위 댓글을 작성순으로 한 페이지씩)
     
-    # 최상위 댓글만 가져오기 (대댓글은 replies로 포함됨)
-    comments = db.query(Comment).options(
-        joinedload(Comment.author),
-        joinedload(Comment.replies).joinedload(Comment.author)
-    ).filter(
-        Comment.post_id == post_id,
-        Comment.parent_id == None
-    ).order_by(Comment.created_at).all()
+    댓글마다 답글 수(reply_count)와 처음 몇 개의 답글이 max_depth 깊이까지 트리로 포함되고,
+    나머지 답글은 replies_cursor 로 /{comment_id}/replies 에서 이어서 조회합니다.
+    답글 트리는 한 번의 쿼리로 읽어 메모리에서 조립합니다.
+    조건부 요청이 일치하면 댓글을 읽지 않고 304 를 돌려줍니다.
+    """
+    def load(db: Session):
+        # 게시글이 없으면 404
+        not_modified, headers = _thread_validators(db, request, post_id, cursor, limit, replies, max_depth)
+        if not_modified:
+            return None, headers
+        
+        comments, next_cursor = load_comment_page(
+            db, post_id, limit, cursor, reply_limit=replies, max_depth=max_depth
+        )
+        return CommentPage(comments=comments, next_cursor=next_cursor), headers
+    
+    result, headers = await run_db(db, load)
+    if result is None:
+        return not_modified_response(headers)
+    response.headers.update(headers)
+    return result
+
+@router.get("/{comment_id}/replies", response_model=CommentPage)
+async def get_replies(
+    post_id: int,
+    comment_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="replies_cursor 또는 이전 응답의 next_cursor"),
+    limit: int = Query(settings.COMMENT_REPLY_PAGE_SIZE, ge=1, le=100, description="가져올 답글 수"),
+    replies: int = Query(0, ge=0, le=20, description="답글마다 미리 포함할 답글 수"),
+    max_depth: int = Query(settings.COMMENT_MAX_DEPTH, ge=0, le=100, description="이 답글들로부터 포함할 답글의 최대 깊이"),
+    db: DbSession = Depends(get_db)
+):
+    """
+    댓글의 답글 목록 조회 (작성순으로 한 페이지씩, 답글마다 답글 수 포함)
+    """
+    def load(db: Session):
+        _get_comment_or_404(db, post_id, comment_id)
+        
+        not_modified, headers = _thread_validators(
+            db, request, post_id, comment_id, cursor, limit, replies, max_depth
+        )
+        if not_modified:
+            return None, headers
+        
+        comments, next_cursor = load_reply_page(
+            db, comment_id, limit, cursor, reply_limit=replies, max_depth=max_depth
+        )
+        return CommentPage(comments=comments, next_cursor=next_cursor), headers
     
-    return comments
+    result, headers = await run_db(db, load)
+    if result is None:
+        return not_modified_response(headers)
+    response.headers.update(headers)
+    return result
 
 @router.put("/{comment_id}", response_model=CommentResponse)
 async def update_comment(
     post_id: int,
     comment_id: int,
     comment_update: CommentUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
 ):
     """
     댓글 수정
     """
-    comment = db.query(Comment).filter(
-        Comment.id == comment_id,
-        Comment.post_id == post_id
-    ).first()
-    
-    if not comment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="댓글을 찾을 수 없습니다"
-        )
-    
-    # 작성자 본인만 수정 가능
-    if comment.author_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="수정 권한이 없습니다"
-        )
-    
-    comment.content = comment_update.content
-    db.commit()
-    db.refresh(comment)
+    def save(db: Session) -> CommentResponse:
+        comment = _get_comment_or_404(db, post_id, comment_id)
+        
+        # 작성자 본인만 수정 가능
+        if comment.author_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="수정 권한이 없습니다"
+            )
+        
+        comment.content = comment_update.content
+        touch_comments(db, post_id)
+        db.flush()
+        db.refresh(comment)
+        
+        return CommentResponse.model_validate(comment)
     
-    return comment
+    return await run_write(db, save)
 
 @router.delete("/{comment_id}")
 async def delete_comment(
     post_id: int,
     comment_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
 ):
     """
     댓글 삭제 (soft delete)
     """
-    comment = db.query(Comment).filter(
-        Comment.id == comment_id,
-        Comment.post_id == post_id
-    ).first()
-    
-    if not comment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="댓글을 찾을 수 없습니다"
-        )
-    
-    # 작성자 본인 또는 관리자만 삭제 가능
-    if comment.author_id != current_user.id and not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="삭제 권한이 없습니다"
-        )
+    def save(db: Session) -> None:
+        comment = _get_comment_or_404(db, post_id, comment_id)
+        
+        # 작성자 본인 또는 관리자만 삭제 가능
+        if comment.author_id != current_user.id and not current_user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="삭제 권한이 없습니다"
+            )
+        
+        # Soft delete (이미 삭제된 댓글이면 댓글 수를 다시 줄이지 않음)
+        if not comment.is_deleted:
+            increment_comment_count(db, post_id, -1)
+            on_commit(db, lambda: page_cache.invalidate(post_tag(post_id)))
+        comment.is_deleted = True
+        comment.content = "삭제된 댓글입니다."
     
-    # Soft delete
-    comment.is_deleted = True
-    comment.content = "삭제된 댓글입니다."
-    db.commit()
+    await run_write(db, save)
     
     return {"message": "댓글이 삭제되었습니다"}
 
@@ -161,24 +239,40 @@ async def delete_comment(
 async def like_comment(
     post_id: int,
     comment_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
 ):
     """
-    댓글 좋아요
+    댓글 좋아요 (이미 좋아요한 경우 변화 없음)
     """
-    comment = db.query(Comment).filter(
-        Comment.id == comment_id,
-        Comment.post_id == post_id
-    ).first()
+    def save(db: Session) -> int:
+        _get_comment_or_404(db, post_id, comment_id)
+        changed, like_count = set_like(db, "comment", current_user.id, comment_id, liked=True)
+        if changed:
+            touch_comments(db, post_id)
+        return like_count
     
-    if not comment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="댓글을 찾을 수 없습니다"
-        )
+    like_count = await run_write(db, save)
+    
+    return {"message": "좋아요!", "like_count": like_count, "liked": True}
+
+@router.delete("/{comment_id}/like")
+async def unlike_comment(
+    post_id: int,
+    comment_id: int,
+    db: DbSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
+):
+    """
+    댓글 좋아요 취소
+    """
+    def save(db: Session) -> int:
+        _get_comment_or_404(db, post_id, comment_id)
+        changed, like_count = set_like(db, "comment", current_user.id, comment_id, liked=False)
+        if changed:
+            touch_comments(db, post_id)
+        return like_count
     
-    comment.like_count += 1
-    db.commit()
+    like_count = await run_write(db, save)
     
-    return {"message": "좋아요!", "like_count": comment.like_count}
\ No newline at end of file
+    return {"message": "좋아요를 취소했습니다", "like_count": like_count, "liked": False}
\ No newline at end of file
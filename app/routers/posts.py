@@ -1,87 +1,151 @@
 """
 게시판 페이지 및 데이터 라우터
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Form
-from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, func
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, Form
+from fastapi.responses import HTMLResponse, RedirectResponse
+from sqlalchemy.orm import Session, joinedload, undefer
 from typing import List, Optional
 
-from ..database import get_db
-from ..models.user import User
+from ..config import settings
+from ..database import DbSession, get_db, run_db
+from ..templating import stream_template, templates
+from ..schemas.user import TokenData
 from ..models.post import Post
-from ..models.comment import Comment
-from ..schemas.post import PostCreate, PostUpdate
-from ..services.auth import get_current_user, get_current_user_optional
+from ..models.user import User
+from ..schemas.post import PostCreate, PostUpdate, PostResponse, PostList, PostPage
+from ..services.auth import get_current_user, get_current_user_optional, get_request_user
+from ..services.comment_tree import load_comment_page
+from ..services.conditional import is_not_modified, make_etag, not_modified_response, validator_headers
+from ..services.pagination import paginate_posts, paginate_ranked
+from ..services.post_list import make_excerpt, post_list_query, to_records
+from ..services.search import apply_search, highlight_snippet, index_post, remove_post
+from ..services.likes import like_cache, mark_liked_posts, set_like
+from ..services.page_cache import (
+    SEARCH_TAG, feed_tag, page_cache, page_key, post_page_tags, post_tag,
+)
+from ..services.view_counter import view_counter
+from ..services.writer import on_commit, run_write
 
-# --- HTML 페이지 렌더링을 위한 설정 ---
-templates = Jinja2Templates(directory="app/templates")
 # 페이지를 서빙하는 라우터
 page_router = APIRouter(tags=["게시판 페이지"])
 # 기존 API 기능을 위한 라우터
 api_router = APIRouter(prefix="/api/posts", tags=["게시글 API"])
 
+def _load_post_list(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    category: Optional[str] = None,
+    search: Optional[str] = None,
+):
+    """
+    게시판 목록 한 페이지 (목록에 필요한 컬럼만 읽은 PostRecord 목록, 다음/이전 커서)
+    본문은 검색어 강조 발췌를 만들 때만 읽습니다.
+    """
+    query = post_list_query(db, with_content=bool(search)).filter(Post.is_published == True)
+    
+    # 카테고리 필터
+    if category:
+        query = query.filter(Post.category == category)
+    
+    # 댓글 수는 posts.comment_count 컬럼에 저장되어 있으므로 추가 쿼리가 필요 없음
+    if search:
+        # 검색: 전문 검색 색인에서 관련도(BM25) 순
+        rows, next_cursor, prev_cursor = paginate_ranked(
+            apply_search(query, search), limit, cursor=cursor, skip=skip
+        )
+    else:
+        # 공지사항 먼저, 그 다음 최신순
+        rows, next_cursor, prev_cursor = paginate_posts(query, limit, cursor=cursor, skip=skip)
+    
+    posts = to_records(rows)
+    if search:
+        for post in posts:
+            post.snippet = highlight_snippet(post.content, search)
+            post.content = None
+    return posts, next_cursor, prev_cursor
+
 # --- 페이지 렌더링 라우트 ---
+# DB 작업은 세션을 받는 동기 함수로 묶어 run_db 로 실행합니다.
+# (비동기 모드에서는 AsyncSession.run_sync, 동기 모드에서는 스레드 풀에서 실행되어 이벤트 루프를 막지 않음)
+# 홈과 게시판 목록은 비로그인 방문자에게 같은 HTML 을 보여 주므로 렌더링 결과를 page_cache 에 저장합니다.
 
 @page_router.get("/")
-async def render_home_page(request: Request, db: Session = Depends(get_db)):
+async def render_home_page(
+    request: Request,
+    db: DbSession = Depends(get_db),
+    current_user: Optional[TokenData] = Depends(get_request_user)
+):
     """
     메인 홈페이지 렌더링 (최신글 포함)
     """
-    recent_posts = db.query(Post).filter(Post.is_published == True)\
-                                 .order_by(desc(Post.is_pinned), desc(Post.created_at))\
-                                 .options(joinedload(Post.author))\
-                                 .limit(5).all()
-    
-    for post in recent_posts:
-        post.comment_count = db.query(func.count(Comment.id)).filter(
-            Comment.post_id == post.id, Comment.is_deleted == False
-        ).scalar() or 0
+    if current_user is None:
+        cached = page_cache.get(page_key(request))
+        if cached is not None:
+            return HTMLResponse(cached)
+    cache_version = page_cache.version
+
+    def load(db: Session):
+        posts, _, _ = _load_post_list(db, limit=5)
+        return posts
 
-    return templates.TemplateResponse("index.html", {
+    recent_posts = await run_db(db, load)
+
+    response = templates.TemplateResponse("index.html", {
         "request": request,
         "posts": recent_posts,
-        "current_user": getattr(request.state, "user", None)
+        "current_user": current_user
     })
+    if current_user is None:
+        page_cache.set(page_key(request), response.body,
+                       post_page_tags(recent_posts, feed_tag()), version=cache_version)
+    return response
     
 @page_router.get("/posts")
 async def render_posts_page(
     request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db),
+    current_user: Optional[TokenData] = Depends(get_request_user)
 ):
     """
     게시글 목록 페이지 렌더링
     """
-    query = db.query(Post).filter(Post.is_published == True)
-    if category:
-        query = query.filter(Post.category == category)
-    if search:
-        query = query.filter(
-            (Post.title.contains(search)) | (Post.content.contains(search))
-        )
-    
-    posts = query.order_by(desc(Post.is_pinned), desc(Post.created_at))\
-                 .options(joinedload(Post.author))\
-                 .offset(skip).limit(limit).all()
+    if current_user is None:
+        cached = page_cache.get(page_key(request))
+        if cached is not None:
+            return HTMLResponse(cached)
+    cache_version = page_cache.version
+
+    def load(db: Session):
+        posts, next_cursor, prev_cursor = _load_post_list(db, limit, cursor, skip, category, search)
+        if current_user:
+            mark_liked_posts(db, current_user.id, posts)
+        return posts, next_cursor, prev_cursor
 
-    for post in posts:
-        post.comment_count = db.query(func.count(Comment.id)).filter(
-            Comment.post_id == post.id, Comment.is_deleted == False
-        ).scalar() or 0
+    posts, next_cursor, prev_cursor = await run_db(db, load)
 
-    return templates.TemplateResponse("post.html", {
+    response = templates.TemplateResponse("post.html", {
         "request": request,
         "posts": posts,
-        "current_user": request.state.user  # 미들웨어에서 설정된 사용자 정보
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "current_user": current_user
     })
+    if current_user is None:
+        # 검색 결과는 어떤 글이 바뀌어도 달라질 수 있으므로 search 태그, 목록은 카테고리 태그
+        list_tag = SEARCH_TAG if search else feed_tag(category)
+        page_cache.set(page_key(request), response.body,
+                       post_page_tags(posts, list_tag), version=cache_version)
+    return response
 
 @page_router.get("/posts/new")
-async def render_create_post_form(request: Request, current_user: User = Depends(get_current_user)):
+async def render_create_post_form(request: Request, current_user: TokenData = Depends(get_current_user)):
     """
     게시글 작성 폼 페이지
     """
@@ -91,78 +155,333 @@ async def render_create_post_form(request: Request, current_user: User = Depends
 async def render_post_detail_page(
     request: Request,
     post_id: int,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db),
+    current_user: Optional[TokenData] = Depends(get_request_user)
 ):
     """
     게시글 상세 페이지 렌더링
     """
-    post = db.query(Post).options(joinedload(Post.author)).filter(Post.id == post_id).first()
-    if not post:
-        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
 
-    # 비공개 글 처리
-    if not post.is_published and (not request.state.user or post.author_id != request.state.user.id):
-        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
+    def load(db: Session):
+        post = db.query(Post).options(joinedload(Post.author), undefer(Post.content)).filter(Post.id == post_id).first()
+        if not post:
+            raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
+
+        # 비공개 글 처리
+        if not post.is_published and (not current_user or post.author_id != current_user.id):
+            raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
 
-    # 조회수 증가
-    post.view_count += 1
-    db.commit()
+        # 조회수 증가 (버퍼에 모아 두었다가 주기적으로 DB에 반영)
+        view_counter.record_view(post)
 
-    # 댓글 로드
-    comments = db.query(Comment).options(joinedload(Comment.author))\
-                                .filter(Comment.post_id == post_id, Comment.is_deleted == False)\
-                                .order_by(Comment.created_at.asc()).all()
+        # 댓글은 첫 페이지만 (답글은 처음 몇 개만 트리로, 나머지는 화면에서 "더 보기"로 불러옴)
+        comments, next_cursor = load_comment_page(
+            db, post_id, settings.COMMENT_PAGE_SIZE,
+            reply_limit=settings.COMMENT_REPLY_PREVIEW, max_depth=settings.COMMENT_MAX_DEPTH,
+        )
+        return post, comments, next_cursor
 
-    return templates.TemplateResponse("post_detail.html", {
+    post, comments, next_cursor = await run_db(db, load)
+
+    context = {
         "request": request,
         "post": post,
         "comments": comments,
-        "current_user": request.state.user
-    })
+        "comments_next_cursor": next_cursor,
+        "current_user": current_user
+    }
+    if settings.TEMPLATE_STREAM_POST_DETAIL:
+        # 헤더와 본문을 먼저 보내고 댓글은 렌더링되는 대로 이어서 전송
+        return stream_template(request, "post_detail.html", context)
+    return templates.TemplateResponse("post_detail.html", context)
 
 # --- 데이터 처리 API 라우트 ---
 
+def _get_post_or_404(db: Session, post_id: int) -> Post:
+    post = db.query(Post).filter(Post.id == post_id).first()
+    if not post:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="게시글을 찾을 수 없습니다"
+        )
+    return post
+
 @api_router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_post(
     title: str = Form(...),
     content: str = Form(...),
     category: str = Form("자유게시판"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
 ):
     """
     게시글 작성 (폼 제출)
     """
-    new_post = Post(
-        title=title,
-        content=content,
-        category=category,
-        author_id=current_user.id
-    )
-    db.add(new_post)
-    db.commit()
-    db.refresh(new_post)
+    def save(db: Session) -> int:
+        new_post = Post(
+            title=title,
+            content=content,
+            excerpt=make_excerpt(content),
+            category=category,
+            author_id=current_user.id
+        )
+        db.add(new_post)
+        db.flush()
+        # 검색 색인도 같은 트랜잭션에서 추가
+        index_post(db, new_post)
+        # 새 글이 보일 목록 페이지 캐시 삭제
+        on_commit(db, lambda: page_cache.invalidate(feed_tag(), feed_tag(category), SEARCH_TAG))
+        return new_post.id
+
+    post_id = await run_write(db, save)
     # 생성 후 상세 페이지로 리다이렉트
-    return RedirectResponse(url=f"/posts/{new_post.id}", status_code=status.HTTP_303_SEE_OTHER)
+    return RedirectResponse(url=f"/posts/{post_id}", status_code=status.HTTP_303_SEE_OTHER)
 
-@api_router.put("/{post_id}")
+@api_router.get("/", response_model=PostPage)
+async def get_posts(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0, description="건너뛸 개수 (cursor 가 없을 때만 사용)"),
+    limit: int = Query(20, ge=1, le=100, description="가져올 개수"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor / prev_cursor"),
+    category: Optional[str] = Query(None, description="카테고리 필터"),
+    search: Optional[str] = Query(None, description="검색어 (제목, 내용)"),
+    db: DbSession = Depends(get_db),
+    current_user: Optional[TokenData] = Depends(get_current_user_optional)
+):
+    """
+    게시글 목록 조회
+    
+    - cursor: 커서 기반 페이지네이션 (응답의 next_cursor / prev_cursor 사용)
+    - skip: 페이지네이션 (건너뛸 개수, 이전 방식 호환용)
+    - limit: 한 페이지에 가져올 개수
+    - category: 카테고리 필터
+    - search: 제목/내용 검색
+    
+    목록에 필요한 컬럼만 읽으므로(본문 제외) 한 번의 쿼리로 ETag 와 응답을 함께 만듭니다.
+    ETag 는 페이지에 들어갈 게시글들의 수정 시각과 카운터로 만들고,
+    If-None-Match 가 같으면 응답을 만들지 않고 304 를 돌려줍니다.
+    """
+    def load(db: Session):
+        posts, next_cursor, prev_cursor = _load_post_list(db, limit, cursor, skip, category, search)
+        liked_ids = like_cache.get(db, "post", current_user.id) if current_user else set()
+        etag = make_etag(
+            "posts", current_user.id if current_user else None, next_cursor, prev_cursor,
+            [(p.id, p.updated_at, p.like_count, p.comment_count, p.author.updated_at, p.id in liked_ids)
+             for p in posts],
+        )
+        headers = validator_headers(etag, private=current_user is not None)
+        if is_not_modified(request, etag):
+            return None, headers
+        
+        # 로그인한 경우 좋아요 여부 표시 (캐시된 집합을 사용하므로 추가 쿼리 없음)
+        for post in posts:
+            post.liked = post.id in liked_ids
+        
+        return PostPage(
+            posts=[PostList.model_validate(post) for post in posts],
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        ), headers
+    
+    result, headers = await run_db(db, load)
+    if result is None:
+        return not_modified_response(headers)
+    response.headers.update(headers)
+    return result
+
+@api_router.get("/categories/list")
+async def get_categories():
+    """
+    카테고리 목록
+    """
+    return {
+        "categories": [
+            "자유게시판",
+            "질문게시판",
+            "정보공유",
+            "후기/리뷰",
+            "공지사항"
+        ]
+    }
+
+@api_router.get("/{post_id}", response_model=PostResponse)
+async def get_post(
+    post_id: int,
+    request: Request,
+    response: Response,
+    db: DbSession = Depends(get_db),
+    current_user: Optional[TokenData] = Depends(get_current_user_optional)
+):
+    """
+    게시글 상세 조회
+    
+    수정 시각, 좋아요/댓글 수, 작성자 수정 시각으로 ETag/Last-Modified 를 만들고
+    조건부 요청이 일치하면 304 를 돌려줍니다. (조회수는 304 여도 올라감)
+    """
+    def load(db: Session):
+        # 1) 검증자만 먼저 조회 (본문 없이 한 행)
+        row = db.query(
+            Post.updated_at, Post.like_count, Post.comment_count, Post.is_published, Post.author_id,
+            User.updated_at.label("author_updated_at"),
+        ).join(Post.author).filter(Post.id == post_id).first()
+        
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="게시글을 찾을 수 없습니다"
+            )
+        
+        if not row.is_published and (not current_user or row.author_id != current_user.id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="게시글을 찾을 수 없습니다"
+            )
+        
+        liked = current_user is not None and post_id in like_cache.get(db, "post", current_user.id)
+        etag = make_etag(
+            "post", post_id, row.updated_at, row.like_count, row.comment_count, row.author_updated_at,
+            current_user.id if current_user else None, liked,
+        )
+        last_modified = max(row.updated_at, row.author_updated_at)
+        headers = validator_headers(etag, last_modified, private=current_user is not None)
+        if is_not_modified(request, etag, last_modified):
+            # 본문을 보내지 않아도 조회로 셈
+            view_counter.increment(post_id)
+            return None, headers
+        
+        # 2) 전체 내용 조회
+        post = db.query(Post).options(joinedload(Post.author), undefer(Post.content)).filter(Post.id == post_id).first()
+        
+        # 조회수 증가 (버퍼에 모아 두었다가 주기적으로 DB에 반영)
+        view_counter.record_view(post)
+        post.liked = liked
+        
+        return PostResponse.model_validate(post), headers
+    
+    result, headers = await run_db(db, load)
+    if result is None:
+        return not_modified_response(headers)
+    response.headers.update(headers)
+    return result
+
+@api_router.put("/{post_id}", response_model=PostResponse)
 async def update_post(
     post_id: int,
     post_update: PostUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
 ):
-    # (이하 로직은 기존과 유사하게 유지)
-    ...
+    """
+    게시글 수정
+    """
+    def save(db: Session) -> PostResponse:
+        post = _get_post_or_404(db, post_id)
+        
+        # 작성자 본인 또는 관리자만 수정 가능
+        if post.author_id != current_user.id and not current_user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="수정 권한이 없습니다"
+            )
+        
+        # 목록 페이지 캐시에서 지울 태그 (이 글이 보이는 페이지)
+        stale_tags = [post_tag(post.id)]
+        if post_update.category is not None and post_update.category != post.category:
+            stale_tags += [feed_tag(post.category), feed_tag(post_update.category)]
+        
+        # 업데이트
+        if post_update.title is not None:
+            post.title = post_update.title
+        if post_update.content is not None:
+            post.content = post_update.content
+            post.excerpt = make_excerpt(post_update.content)
+        if post_update.category is not None:
+            post.category = post_update.category
+        
+        if post_update.title is not None or post_update.content is not None:
+            index_post(db, post)
+            stale_tags.append(SEARCH_TAG)
+        on_commit(db, lambda: page_cache.invalidate(*stale_tags))
+        
+        db.flush()
+        db.refresh(post)
+        
+        return PostResponse.model_validate(post)
+    
+    return await run_write(db, save)
 
 @api_router.delete("/{post_id}")
 async def delete_post(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
+):
+    """
+    게시글 삭제
+    """
+    def save(db: Session) -> None:
+        post = _get_post_or_404(db, post_id)
+        
+        # 작성자 본인 또는 관리자만 삭제 가능
+        if post.author_id != current_user.id and not current_user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="삭제 권한이 없습니다"
+            )
+        
+        remove_post(db, post.id)
+        db.delete(post)
+        stale_tags = [post_tag(post_id), feed_tag(), feed_tag(post.category), SEARCH_TAG]
+        on_commit(db, lambda: page_cache.invalidate(*stale_tags))
+    
+    await run_write(db, save)
+    
+    return {"message": "게시글이 삭제되었습니다"}
+
+@api_router.post("/{post_id}/like")
+async def like_post(
+    post_id: int,
+    db: DbSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
 ):
-    # (이하 로직은 기존과 유사하게 유지)
-    ...
+    """
+    게시글 좋아요 (이미 좋아요한 경우 변화 없음)
+    """
+    def save(db: Session) -> int:
+        if not db.query(Post.id).filter(Post.id == post_id).first():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="게시글을 찾을 수 없습니다"
+            )
+        _, like_count = set_like(db, "post", current_user.id, post_id, liked=True)
+        return like_count
+    
+    like_count = await run_write(db, save)
+    
+    return {"message": "좋아요!", "like_count": like_count, "liked": True}
+
+@api_router.delete("/{post_id}/like")
+async def unlike_post(
+    post_id: int,
+    db: DbSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
+):
+    """
+    게시글 좋아요 취소
+    """
+    def save(db: Session) -> int:
+        if not db.query(Post.id).filter(Post.id == post_id).first():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="게시글을 찾을 수 없습니다"
+            )
+        _, like_count = set_like(db, "post", current_user.id, post_id, liked=False)
+        return like_count
+    
+    like_count = await run_write(db, save)
+    
+    return {"message": "좋아요를 취소했습니다", "like_count": like_count, "liked": False}
     
 # 라우터를 main.py에서 가져올 수 있도록 변수명 통일
 # 여기서는 라우터 두 개를 모두 main.py에 등록해야 함
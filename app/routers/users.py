@@ -1,75 +1,128 @@
 """
 사용자 라우터 - 사용자 정보 조회/수정
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
+from datetime import timedelta
 
-from ..database import get_db
+from ..database import DbSession, get_db, run_db
 from ..models.user import User
-from ..schemas.user import UserResponse, UserUpdate
-from ..services.auth import get_current_user, get_admin_user
+from ..schemas.user import UserResponse, UserUpdate, TokenData
+from ..services.auth import AuthService, get_current_user_record, get_admin_user
+from ..services.counters import touch_comments_by_author
+from ..services.page_cache import page_cache, user_tag
+from ..services.token_versions import revoke_user_tokens
+from ..config import settings
 
 router = APIRouter(prefix="/api/users", tags=["사용자"])
 
+def _get_user_or_404(db: Session, user_id: int) -> User:
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="사용자를 찾을 수 없습니다"
+        )
+    return user
+
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user)  # 관리자만
+    db: DbSession = Depends(get_db),
+    current_user: TokenData = Depends(get_admin_user)  # 관리자만
 ):
     """
     사용자 목록 조회 (관리자 전용)
     """
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    def load(db: Session) -> List[UserResponse]:
+        users = db.query(User).offset(skip).limit(limit).all()
+        return [UserResponse.model_validate(user) for user in users]
+    
+    return await run_db(db, load)
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: int, db: Session = Depends(get_db)):
+async def get_user(user_id: int, db: DbSession = Depends(get_db)):
     """
     특정 사용자 정보 조회
     """
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="사용자를 찾을 수 없습니다"
-        )
-    return user
+    user = await run_db(db, _get_user_or_404, user_id)
+    return UserResponse.model_validate(user)
 
 @router.put("/me", response_model=UserResponse)
 async def update_me(
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    request: Request,
+    db: DbSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_record)
 ):
     """
     내 정보 수정
     """
-    # 업데이트할 필드만 변경
+    def save(db: Session) -> None:
+        # 업데이트할 필드만 변경
+        if user_update.nickname is not None:
+            current_user.nickname = user_update.nickname
+            # 댓글 목록에도 작성자 닉네임이 보이므로 댓글을 단 게시글의 댓글 스레드 버전도 올림
+            touch_comments_by_author(db, current_user.id)
+        if user_update.bio is not None:
+            current_user.bio = user_update.bio
+        if user_update.profile_image is not None:
+            current_user.profile_image = user_update.profile_image
+        
+        db.commit()
+        db.refresh(current_user)
+    
+    await run_db(db, save)
+    
+    # 목록 페이지에 작성자 닉네임이 보이므로 이 사용자의 글이 보이는 페이지 캐시 삭제
     if user_update.nickname is not None:
-        current_user.nickname = user_update.nickname
-    if user_update.bio is not None:
-        current_user.bio = user_update.bio
-    if user_update.profile_image is not None:
-        current_user.profile_image = user_update.profile_image
+        page_cache.invalidate(user_tag(current_user.id))
     
-    db.commit()
-    db.refresh(current_user)
+    # 토큰에 닉네임이 들어 있으므로 로그인 쿠키를 새 토큰으로 교체
+    if request.cookies.get("access_token"):
+        response.set_cookie(
+            key="access_token",
+            value=AuthService.create_user_token(current_user),
+            httponly=True,
+            max_age=int(timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES).total_seconds()),
+            samesite="lax"
+        )
     
     return current_user
 
 @router.delete("/me")
 async def delete_me(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_record)
 ):
     """
     회원 탈퇴
     """
     # 실제로는 soft delete (is_active = False)를 권장
     current_user.is_active = False
-    db.commit()
+    # 발급된 토큰도 함께 폐기 (commit 포함)
+    await run_db(db, revoke_user_tokens, current_user.id)
+    
+    return {"message": "회원 탈퇴가 완료되었습니다"}
+
+@router.post("/{user_id}/deactivate", response_model=UserResponse)
+async def deactivate_user(
+    user_id: int,
+    db: DbSession = Depends(get_db),
+    current_user: TokenData = Depends(get_admin_user)  # 관리자만
+):
+    """
+    사용자 계정 비활성화 (관리자 전용)
+    """
+    def save(db: Session) -> UserResponse:
+        user = _get_user_or_404(db, user_id)
+        user.is_active = False
+        # 발급된 토큰도 함께 폐기 (commit 포함)
+        revoke_user_tokens(db, user.id)
+        db.refresh(user)
+        return UserResponse.model_validate(user)
     
-    return {"message": "회원 탈퇴가 완료되었습니다"}
\ No newline at end of file
+    return await run_db(db, save)
\ No newline at end of file
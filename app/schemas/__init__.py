@@ -1,9 +1,11 @@
 from ..schemas.user import UserCreate, UserLogin, UserResponse, UserUpdate, Token
-from ..schemas.post import PostCreate, PostUpdate, PostResponse, PostList
-from ..schemas.comment import CommentCreate, CommentUpdate, CommentResponse
+from ..schemas.post import PostCreate, PostUpdate, PostResponse, PostList, PostPage
+from ..schemas.comment import CommentCreate, CommentUpdate, CommentResponse, CommentPage
+from ..schemas.admin import SlowQuerySummary
 
 __all__ = [
     "UserCreate", "UserLogin", "UserResponse", "UserUpdate", "Token",
-    "PostCreate", "PostUpdate", "PostResponse", "PostList",
-    "CommentCreate", "CommentUpdate", "CommentResponse"
+    "PostCreate", "PostUpdate", "PostResponse", "PostList", "PostPage",
+    "CommentCreate", "CommentUpdate", "CommentResponse", "CommentPage",
+    "SlowQuerySummary"
 ]
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+관리자 스키마
+"""
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+# 느린 쿼리의 마지막 예시
+class SlowQueryExample(BaseModel):
+    sql: str
+    parameters: Any = None
+    plan: Optional[List[str]] = None
+
+# 정규화한 문장별 느린 쿼리 집계
+class SlowQuerySummary(BaseModel):
+    statement: str
+    count: int
+    total_ms: float
+    avg_ms: float
+    max_ms: float
+    # "GET /posts" -> 횟수
+    routes: Dict[str, int]
+    last_seen: str
+    example: SlowQueryExample
@@ -35,10 +35,22 @@ class CommentResponse(BaseModel):
     author: CommentAuthor
     created_at: datetime
     updated_at: datetime
+    # 처음 몇 개의 답글 (나머지는 /comments/{id}/replies 로 이어서 조회)
     replies: List["CommentResponse"] = []
+    # 직접 달린 답글 수 (replies 에 포함되지 않은 답글도 포함)
+    reply_count: int = 0
+    # replies 다음부터 이어서 조회할 커서 (남은 답글이 있을 때만)
+    replies_cursor: Optional[str] = None
+    # 트리에서의 깊이 (최상위 댓글 = 0)
+    depth: int = 0
     
     class Config:
         from_attributes = True
 
 # 순환 참조 해결
-CommentResponse.model_rebuild()
\ No newline at end of file
+CommentResponse.model_rebuild()
+
+# 댓글 목록 한 페이지
+class CommentPage(BaseModel):
+    comments: List[CommentResponse]
+    next_cursor: Optional[str] = None
\ No newline at end of file
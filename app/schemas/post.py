@@ -41,6 +41,7 @@ class PostResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     comment_count: Optional[int] = 0
+    liked: bool = False  # 현재 사용자가 좋아요했는지
     
     class Config:
         from_attributes = True
@@ -55,6 +56,15 @@ class PostList(BaseModel):
     author: AuthorInfo
     created_at: datetime
     comment_count: int = 0
+    excerpt: Optional[str] = None  # 본문 앞부분 미리 보기
+    snippet: Optional[str] = None  # 검색 시 본문 발췌 (<mark> 로 강조)
+    liked: bool = False  # 현재 사용자가 좋아요했는지
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# 게시글 목록 페이지 (커서 기반 페이지네이션)
+class PostPage(BaseModel):
+    posts: List[PostList]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
\ No newline at end of file
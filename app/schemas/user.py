@@ -55,5 +55,11 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 # 토큰 데이터 (내부 사용)
+# 토큰에 담긴 사용자 정보만으로 인증하므로 요청마다 DB를 조회하지 않아도 됨
 class TokenData(BaseModel):
-    username: Optional[str] = None
\ No newline at end of file
+    id: int
+    username: str
+    nickname: Optional[str] = None
+    is_admin: bool = False
+    token_version: int = 0
+    is_active: bool = True  # 비활성화된 계정의 토큰은 토큰 버전 검사에서 거절됨
\ No newline at end of file
@@ -1,18 +1,24 @@
 """
 Authentication utilities: password hashing, token creation, and user lookup.
+
+Tokens carry the user claims (id, nickname, admin flag, token version), so
+authenticated requests are served without a DB lookup. Revocation is checked
+against the token version registry, which only touches the DB (off the event
+loop) when its cached entry has expired.
 """
 from datetime import datetime, timedelta
 from typing import Optional
 
 import bcrypt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
 
 from ..config import settings
-from ..database import get_db
+from ..database import DbSession, get_db, run_db
 from ..models.user import User
+from ..schemas.user import TokenData
+from ..services.token_versions import token_versions
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 MAX_PASSWORD_BYTES = 72  # bcrypt only accepts up to 72 bytes
@@ -39,7 +45,16 @@ class AuthService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="비밀번호는 72바이트 이하만 지원됩니다.",
             )
-        return bcrypt.hashpw(password_bytes, bcrypt.gensalt()).decode("utf-8")
+        return bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode("utf-8")
+
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """True if the hash was made with a bcrypt cost other than BCRYPT_ROUNDS."""
+        try:
+            # "$2b$12$<salt+hash>"
+            return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+        except (IndexError, ValueError, AttributeError):
+            return True
 
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -50,6 +65,20 @@ class AuthService:
         to_encode.update({"exp": expire})
         return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
+    @staticmethod
+    def create_user_token(user: User, expires_delta: Optional[timedelta] = None) -> str:
+        """Issue a token that carries the claims needed to serve requests without a DB lookup."""
+        return AuthService.create_access_token(
+            data={
+                "sub": user.username,
+                "uid": user.id,
+                "nick": user.nickname,
+                "adm": bool(user.is_admin),
+                "ver": user.token_version or 0,
+            },
+            expires_delta=expires_delta,
+        )
+
     @staticmethod
     def decode_token(token: str) -> Optional[dict]:
         try:
@@ -57,28 +86,73 @@ class AuthService:
         except JWTError:
             return None
 
+    @staticmethod
+    async def user_from_token(token: Optional[str]) -> Optional[TokenData]:
+        """Return the user claims of a valid, unrevoked token, or None."""
+        if not token:
+            return None
+        payload = AuthService.decode_token(token)
+        if payload is None or payload.get("uid") is None or payload.get("sub") is None:
+            return None
+        user = TokenData(
+            id=payload["uid"],
+            username=payload["sub"],
+            nickname=payload.get("nick"),
+            is_admin=bool(payload.get("adm")),
+            token_version=payload.get("ver", 0),
+        )
+        if not await token_versions.is_current(user.id, user.token_version):
+            return None
+        return user
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
+) -> TokenData:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="인증 정보가 올바르지 않습니다.",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    payload = AuthService.decode_token(token)
-    if payload is None:
+    user = await AuthService.user_from_token(token)
+    if user is None:
         raise credentials_exception
 
-    username: str = payload.get("sub")
-    if username is None:
-        raise credentials_exception
+    return user
+
 
-    user = db.query(User).filter(User.username == username).first()
+async def get_current_user_optional(
+    token: str = Depends(OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)),
+) -> Optional[TokenData]:
+    return await AuthService.user_from_token(token)
+
+
+async def get_request_user(request: Request) -> Optional[TokenData]:
+    """
+    The user of the access_token cookie (page routes), or None.
+
+    Resolved only by routes that depend on it, and kept on request.state.user
+    for the rest of the request.
+    """
+    if not hasattr(request.state, "user"):
+        request.state.user = await AuthService.user_from_token(request.cookies.get("access_token"))
+    return request.state.user
+
+
+async def get_current_user_record(
+    current_user: TokenData = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+) -> User:
+    """Load the full user row for routes that read or modify profile fields."""
+    # 요청 세션의 identity map 에 이미 있으면 추가 조회 없음
+    user = await run_db(db, lambda session: session.get(User, current_user.id))
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="인증 정보가 올바르지 않습니다.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     if not user.is_active:
         raise HTTPException(
@@ -89,30 +163,9 @@ async def get_current_user(
     return user
 
 
-async def get_current_user_optional(
-    token: str = Depends(OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)),
-    db: Session = Depends(get_db),
-) -> Optional[User]:
-    if token is None:
-        return None
-
-    try:
-        payload = AuthService.decode_token(token)
-        if payload is None:
-            return None
-
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-
-        return db.query(User).filter(User.username == username).first()
-    except Exception:
-        return None
-
-
 async def get_admin_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: TokenData = Depends(get_current_user),
+) -> TokenData:
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
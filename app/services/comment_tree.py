@@ -0,0 +1,179 @@
+"""
+댓글 스레드 - 최상위 댓글을 페이지 단위로 읽고, 그 아래 답글 트리는 한 번의 쿼리로 읽어 메모리에서 조립합니다
+
+댓글이 수만 개인 글도 한 페이지는 항상 같은 비용으로 읽습니다.
+- 최상위 댓글 한 페이지 (작성순 커서)
+- 그 댓글들 아래의 답글 트리 (재귀 CTE 한 번, 댓글마다 처음 N 개씩, max_depth 깊이까지)
+- 댓글마다 직접 달린 답글 수 (GROUP BY 한 번)
+읽은 댓글은 parent_id 로 O(n) 에 트리로 연결하고, 나머지 답글은 부모 댓글별로 load_reply_page 로 이어서 읽습니다.
+replies 관계를 따라가지 않으므로 댓글마다 지연 로딩 쿼리가 나가지 않습니다.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, literal, select, tuple_
+from sqlalchemy.orm import Query, Session, aliased, joinedload
+
+from ..models.comment import Comment
+from ..schemas.comment import CommentAuthor, CommentResponse
+from .pagination import decode_comment_cursor, encode_comment_cursor
+
+
+def _to_response(comment: Comment) -> CommentResponse:
+    # model_validate(comment) 는 comment.replies 를 읽어 지연 로딩이 일어나므로 컬럼만 옮김
+    return CommentResponse(
+        id=comment.id,
+        content=comment.content,
+        like_count=comment.like_count or 0,
+        is_deleted=bool(comment.is_deleted),
+        author_id=comment.author_id,
+        post_id=comment.post_id,
+        parent_id=comment.parent_id,
+        author=CommentAuthor.model_validate(comment.author),
+        created_at=comment.created_at,
+        updated_at=comment.updated_at,
+    )
+
+
+def build_comment_tree(
+    comments: List[Comment],
+    max_depth: int,
+    reply_counts: Optional[Dict[int, int]] = None,
+    base_depth: int = 0,
+) -> List[CommentResponse]:
+    """
+    작성순으로 정렬된 댓글 목록을 트리로 조립합니다.
+    max_depth 보다 깊은 답글은 빼고, 잘린 댓글은 reply_count 로 답글이 있다는 것만 알려 줍니다.
+    부모가 목록에 없는 댓글은 최상위 댓글(깊이 base_depth)로 취급합니다.
+    reply_counts 를 주면 목록에 없는 답글까지 센 실제 답글 수를 쓰고, 남은 답글이 있는 댓글에 replies_cursor 를 채웁니다.
+    """
+    nodes: Dict[int, CommentResponse] = {comment.id: _to_response(comment) for comment in comments}
+    children: Dict[int, List[CommentResponse]] = {}
+    roots: List[CommentResponse] = []
+    for node in nodes.values():
+        if node.parent_id is not None and node.parent_id in nodes:
+            children.setdefault(node.parent_id, []).append(node)
+        else:
+            roots.append(node)
+
+    # 최상위부터 깊이를 매기며 연결 (재귀 대신 스택을 사용해 깊은 스레드에서도 안전)
+    stack = [(root, 0) for root in roots]
+    while stack:
+        node, depth = stack.pop()
+        node.depth = base_depth + depth
+        replies = children.get(node.id, [])
+        node.reply_count = len(replies) if reply_counts is None else reply_counts.get(node.id, 0)
+        if depth < max_depth:
+            node.replies = replies
+            stack.extend((reply, depth + 1) for reply in replies)
+        if node.replies and node.reply_count > len(node.replies):
+            node.replies_cursor = encode_comment_cursor(node.replies[-1])
+    return roots
+
+
+def _reply_counts(db: Session, comment_ids: List[int]) -> Dict[int, int]:
+    """댓글별 직접 달린 답글 수"""
+    if not comment_ids:
+        return {}
+    rows = db.query(Comment.parent_id, func.count(Comment.id))\
+             .filter(Comment.parent_id.in_(comment_ids))\
+             .group_by(Comment.parent_id).all()
+    return dict(rows)
+
+
+def _page(query: Query, limit: int, cursor: Optional[str]) -> Tuple[List[Comment], Optional[str]]:
+    """작성순 (created_at, id) 커서로 한 페이지를 읽습니다."""
+    if cursor:
+        created_at, comment_id = decode_comment_cursor(cursor)
+        query = query.filter(tuple_(Comment.created_at, Comment.id) > tuple_(created_at, comment_id))
+    rows = query.options(joinedload(Comment.author))\
+                .order_by(Comment.created_at, Comment.id)\
+                .limit(limit + 1).all()
+    comments = rows[:limit]
+    next_cursor = encode_comment_cursor(comments[-1]) if len(rows) > limit else None
+    return comments, next_cursor
+
+
+def _load_subtrees(db: Session, roots: List[Comment], reply_limit: int, max_depth: int) -> List[Comment]:
+    """
+    roots 아래의 답글을 재귀 CTE 한 번으로 읽습니다. (작성자 JOIN 포함, 작성순)
+    각 댓글의 처음 reply_limit 개 답글만 따라 내려가므로 답글이 많아도 읽는 행 수가 제한됩니다.
+    """
+    if not roots or reply_limit <= 0 or max_depth <= 0:
+        return []
+    reply = aliased(Comment)
+    thread = select(Comment.id, literal(0).label("depth"))\
+        .where(Comment.id.in_([root.id for root in roots]))\
+        .cte("thread", recursive=True)
+    first_replies = select(reply.id)\
+        .where(reply.parent_id == thread.c.id)\
+        .order_by(reply.created_at, reply.id)\
+        .limit(reply_limit)
+    child = aliased(Comment)
+    thread = thread.union_all(
+        select(child.id, thread.c.depth + 1)
+        .join_from(thread, child, child.id.in_(first_replies))
+        .where(thread.c.depth < max_depth)
+    )
+    return db.query(Comment).options(joinedload(Comment.author))\
+             .join(thread, thread.c.id == Comment.id)\
+             .filter(thread.c.depth > 0)\
+             .order_by(Comment.created_at, Comment.id).all()
+
+
+def _comment_depth(db: Session, comment_id: int) -> int:
+    """댓글의 깊이 (최상위 댓글 = 0, 부모를 따라 올라가는 재귀 CTE 한 번)"""
+    ancestors = select(Comment.parent_id).where(Comment.id == comment_id).cte("ancestors", recursive=True)
+    ancestors = ancestors.union_all(
+        select(Comment.parent_id).join(ancestors, Comment.id == ancestors.c.parent_id)
+    )
+    return db.execute(
+        select(func.count()).select_from(ancestors).where(ancestors.c.parent_id.is_not(None))
+    ).scalar_one()
+
+
+def _thread_page(
+    db: Session,
+    roots: List[Comment],
+    reply_limit: int,
+    max_depth: int,
+    base_depth: int = 0,
+) -> List[CommentResponse]:
+    """한 페이지의 댓글과 그 아래 답글 트리를 조립합니다."""
+    comments = roots + _load_subtrees(db, roots, reply_limit, max_depth)
+    counts = _reply_counts(db, [comment.id for comment in comments])
+    return build_comment_tree(comments, max_depth, reply_counts=counts, base_depth=base_depth)
+
+
+def load_comment_page(
+    db: Session,
+    post_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    reply_limit: int = 0,
+    max_depth: int = 0,
+) -> Tuple[List[CommentResponse], Optional[str]]:
+    """
+    게시글의 최상위 댓글 한 페이지와 다음 페이지 커서.
+    댓글마다 처음 reply_limit 개의 답글을 max_depth 깊이까지 트리로 붙입니다.
+    """
+    query = db.query(Comment).filter(Comment.post_id == post_id, Comment.parent_id == None)
+    comments, next_cursor = _page(query, limit, cursor)
+    return _thread_page(db, comments, reply_limit, max_depth), next_cursor
+
+
+def load_reply_page(
+    db: Session,
+    parent_id: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    reply_limit: int = 0,
+    max_depth: int = 0,
+) -> Tuple[List[CommentResponse], Optional[str]]:
+    """
+    한 댓글의 답글 한 페이지와 다음 페이지 커서.
+    답글마다 처음 reply_limit 개의 답글을 (이 답글들로부터) max_depth 깊이까지 붙입니다.
+    """
+    query = db.query(Comment).filter(Comment.parent_id == parent_id)
+    comments, next_cursor = _page(query, limit, cursor)
+    base_depth = _comment_depth(db, parent_id) + 1 if comments else 0
+    return _thread_page(db, comments, reply_limit, max_depth, base_depth), next_cursor
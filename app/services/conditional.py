@@ -0,0 +1,65 @@
+"""
+조건부 요청(Conditional GET) 처리 - ETag / Last-Modified 검증자
+
+응답 전체를 만들기 전에 가벼운 쿼리로 검증자(수정 시각, 카운터 등)를 먼저 계산하고,
+클라이언트가 보낸 If-None-Match / If-Modified-Since 와 같으면 본문 없이 304 를 돌려줍니다.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response, status
+
+# 같은 내용을 폴링하는 클라이언트가 매번 다시 확인하도록 (캐시는 하되 쓰기 전에 재검증)
+CACHE_CONTROL_PUBLIC = "public, no-cache"
+# 로그인 사용자별 내용(좋아요 여부 등)이 섞인 응답
+CACHE_CONTROL_PRIVATE = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """검증자 값들로 약한(weak) ETag 를 만듭니다. (조회수처럼 자주 바뀌는 값은 넣지 않음)"""
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _http_date(value: datetime) -> str:
+    # DB 의 시각은 UTC (datetime.utcnow) 기준
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """요청의 조건부 헤더와 검증자가 일치하면 True (If-None-Match 가 있으면 그것을 우선)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # 약한 비교: W/ 접두어는 무시
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None, private: bool = False) -> Dict[str, str]:
+    """200/304 응답에 함께 보낼 캐시 관련 헤더"""
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL_PRIVATE if private else CACHE_CONTROL_PUBLIC,
+        # 로그인 여부에 따라 내용이 달라짐
+        "Vary": "Authorization, Cookie",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+    return headers
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -0,0 +1,86 @@
+"""
+카운터 서비스 - 게시글의 비정규화된 카운터(댓글 수, 댓글 스레드 버전)를 관리합니다
+"""
+from datetime import datetime
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from ..database import add_column_if_missing
+from ..models.comment import Comment
+from ..models.post import Post
+
+
+def _comments_changed() -> dict:
+    # updated_at 은 게시글 내용 수정 시각이므로 댓글 변경으로는 바꾸지 않음
+    return {
+        "comments_version": Post.comments_version + 1,
+        "comments_updated_at": datetime.utcnow(),
+        "updated_at": Post.updated_at,
+    }
+
+
+def increment_comment_count(db: Session, post_id: int, amount: int = 1) -> None:
+    """
+    게시글의 댓글 수를 원자적으로 증감하고 댓글 스레드 버전을 올립니다.
+    commit 하지 않으므로 호출한 쪽의 트랜잭션에 함께 포함됩니다.
+    """
+    db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(comment_count=Post.comment_count + amount, **_comments_changed())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def touch_comments(db: Session, post_id: int) -> None:
+    """
+    댓글 수는 그대로인 변경(댓글 수정, 댓글 좋아요)이 있을 때 댓글 스레드 버전을 올립니다.
+    commit 하지 않으므로 호출한 쪽의 트랜잭션에 함께 포함됩니다.
+    """
+    db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(**_comments_changed())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def touch_comments_by_author(db: Session, user_id: int) -> None:
+    """사용자가 댓글을 단 게시글들의 댓글 스레드 버전을 올립니다. (댓글에 보이는 닉네임이 바뀔 때)"""
+    commented = select(Comment.post_id).where(Comment.author_id == user_id).distinct()
+    db.execute(
+        update(Post)
+        .where(Post.id.in_(commented))
+        .values(**_comments_changed())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def reconcile_comment_counts(db: Session) -> int:
+    """
+    실제 댓글 수와 어긋난 게시글의 comment_count 를 한 번의 UPDATE 로 다시 계산합니다.
+    수정된 게시글 수를 반환합니다.
+    """
+    actual = (
+        select(func.count(Comment.id))
+        .where(Comment.post_id == Post.id, Comment.is_deleted == False)
+        .correlate(Post)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(Post)
+        .where(Post.comment_count.is_distinct_from(actual))
+        .values(comment_count=actual, updated_at=Post.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def ensure_comment_count_column() -> bool:
+    """
+    기존 데이터베이스에 comment_count 컬럼이 없으면 추가합니다.
+    컬럼을 새로 추가했으면 True 를 반환합니다.
+    """
+    return add_column_if_missing("posts", "comment_count", "INTEGER NOT NULL DEFAULT 0")
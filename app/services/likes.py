@@ -0,0 +1,145 @@
+"""
+좋아요 서비스 - 좋아요 기록(post_likes/comment_likes)과 카운터를 함께 관리합니다
+
+좋아요 기록은 (사용자, 대상) 유니크 키로 한 번만 저장되고(INSERT ... ON CONFLICT DO NOTHING),
+기록이 실제로 추가/삭제된 경우에만 같은 트랜잭션에서 like_count 를
+UPDATE ... SET like_count = like_count ± 1 로 원자적으로 바꿉니다.
+사용자별로 좋아요한 id 집합을 메모리에 캐시해서 목록 화면의 "좋아요 여부" 표시에
+게시글마다 쿼리를 보내지 않도록 합니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Set, Tuple, Type
+
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.comment import Comment
+from ..models.like import CommentLike, PostLike
+from ..models.post import Post
+from .writer import on_commit
+
+# 대상 종류별 (좋아요 기록 모델, 대상 모델, 대상 id 컬럼 이름)
+_TARGETS: Dict[str, Tuple[Type, Type, str]] = {
+    "post": (PostLike, Post, "post_id"),
+    "comment": (CommentLike, Comment, "comment_id"),
+}
+
+
+class LikeMembershipCache:
+    """사용자별 좋아요한 게시글/댓글 id 집합을 담아 두는 LRU + TTL 캐시"""
+
+    def __init__(self, max_users: int, ttl: float):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, Set[int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db: Session, kind: str, user_id: int) -> Set[int]:
+        """사용자가 좋아요한 대상 id 집합. 캐시에 없거나 만료되었으면 DB에서 한 번에 읽어 옵니다."""
+        key = (kind, user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        like_model, _, target_column = _TARGETS[kind]
+        ids = {
+            target_id
+            for (target_id,) in db.query(getattr(like_model, target_column))
+                                  .filter(like_model.user_id == user_id)
+        }
+        with self._lock:
+            self._entries[key] = (now, ids)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return ids
+
+    def update(self, kind: str, user_id: int, target_id: int, liked: bool) -> None:
+        """캐시에 올라와 있는 사용자의 집합에 좋아요/취소를 반영합니다."""
+        with self._lock:
+            entry = self._entries.get((kind, user_id))
+            if entry is None:
+                return
+            if liked:
+                entry[1].add(target_id)
+            else:
+                entry[1].discard(target_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+like_cache = LikeMembershipCache(
+    max_users=settings.LIKE_CACHE_MAX_USERS,
+    ttl=settings.LIKE_CACHE_TTL_SECONDS,
+)
+
+
+def set_like(db: Session, kind: str, user_id: int, target_id: int, liked: bool) -> Tuple[bool, int]:
+    """
+    좋아요를 누르거나(liked=True) 취소합니다. 이미 같은 상태면 아무것도 바꾸지 않습니다.
+    commit 하지 않으므로 run_write 로 실행해야 합니다.
+    (상태가 바뀌었는지, 현재 like_count) 를 반환합니다.
+    """
+    like_model, target_model, target_column = _TARGETS[kind]
+
+    if liked:
+        # 이미 좋아요한 상태면 (유니크 키 충돌) 아무 행도 추가되지 않음
+        # SAVEPOINT 로 감싸지 않으므로 기록과 카운터가 항상 같은 트랜잭션에서 commit 됨
+        result = db.execute(
+            sqlite_insert(like_model)
+            .values(user_id=user_id, **{target_column: target_id})
+            .on_conflict_do_nothing()
+        )
+    else:
+        result = db.execute(
+            delete(like_model).where(
+                like_model.user_id == user_id,
+                getattr(like_model, target_column) == target_id,
+            )
+        )
+    changed = result.rowcount == 1
+
+    if changed:
+        db.execute(
+            update(target_model)
+            .where(target_model.id == target_id)
+            # updated_at 은 내용 수정 시각이므로 카운터 변경으로는 바꾸지 않음
+            .values(like_count=target_model.like_count + (1 if liked else -1),
+                    updated_at=target_model.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+    # commit 은 호출한 쪽(run_write)이 하고, 캐시는 commit 된 뒤에 갱신
+    on_commit(db, lambda: like_cache.update(kind, user_id, target_id, liked))
+
+    like_count = db.query(target_model.like_count).filter(target_model.id == target_id).scalar()
+    return changed, like_count or 0
+
+
+def mark_liked_posts(db: Session, user_id: int, posts: Iterable[Post]) -> None:
+    """게시글마다 liked 속성(현재 사용자가 좋아요했는지)을 설정합니다."""
+    liked_ids = like_cache.get(db, "post", user_id)
+    for post in posts:
+        post.liked = post.id in liked_ids
@@ -0,0 +1,143 @@
+"""
+렌더링된 페이지 캐시 - 로그인하지 않은 방문자에게 보여 주는 HTML 을 그대로 저장해 둡니다
+
+비로그인 방문자는 모두 같은 HTML 을 받으므로, 한 번 렌더링한 결과를 (경로, 카테고리, 쿼리)
+키로 저장해 두고 다음 요청부터는 쿼리와 템플릿 렌더링 없이 바로 돌려줍니다.
+
+항목마다 태그(feed:<카테고리>, post:<id>, user:<id>, search)를 붙여 두고,
+게시글/댓글이 바뀌면 관련된 태그의 항목만 지웁니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from fastapi import Request
+
+from ..config import settings
+
+ALL_CATEGORIES = "*"
+SEARCH_TAG = "search"
+
+
+def feed_tag(category: Optional[str] = None) -> str:
+    """카테고리 목록(없으면 전체 목록) 태그"""
+    return f"feed:{category or ALL_CATEGORIES}"
+
+
+def post_tag(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def page_key(request: Request) -> Tuple:
+    """경로, 호스트, 카테고리, 나머지 쿼리 파라미터(정렬)로 만든 캐시 키"""
+    params = sorted((k, v) for k, v in request.query_params.multi_items() if k != "category")
+    return (request.url.path, request.url.netloc, request.query_params.get("category") or "", tuple(params))
+
+
+class RenderedPageCache:
+    """태그로 무효화할 수 있는 LRU + TTL 캐시 (값은 렌더링된 문자열/바이트)"""
+
+    def __init__(self, max_entries: int, ttl: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, Tuple[float, object, Set[str]]]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # 무효화할 때마다 올라가는 번호 (렌더링 중에 데이터가 바뀌었는지 확인용)
+        self.version = 0
+
+    def get(self, key: Hashable):
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry[0] >= self.ttl:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value, tags: Iterable[str], version: Optional[int] = None) -> None:
+        """
+        값을 저장합니다. version 에 렌더링을 시작할 때의 self.version 을 넘기면,
+        그 사이에 무효화가 있었을 때는 (오래된 내용일 수 있으므로) 저장하지 않습니다.
+        """
+        if not self.enabled:
+            return
+        tags = set(tags)
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic(), value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, *tags: str) -> int:
+        """태그가 붙은 항목을 모두 지우고, 지운 항목 수를 반환합니다."""
+        removed = 0
+        with self._lock:
+            self.version += 1
+            for tag in tags:
+                for key in self._tags.pop(tag, set()):
+                    if key in self._entries:
+                        self._remove(key)
+                        removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        # 호출하는 쪽에서 잠금을 잡고 있어야 함
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+page_cache = RenderedPageCache(
+    max_entries=settings.PAGE_CACHE_MAX_ENTRIES,
+    ttl=settings.PAGE_CACHE_TTL_SECONDS,
+    enabled=settings.PAGE_CACHE_ENABLED,
+)
+
+
+def post_page_tags(posts, *extra: str) -> Set[str]:
+    """페이지에 보이는 게시글과 작성자의 태그"""
+    tags = set(extra)
+    for post in posts:
+        tags.add(post_tag(post.id))
+        tags.add(user_tag(post.author_id))
+    return tags
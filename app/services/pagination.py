@@ -0,0 +1,147 @@
+"""
+페이지네이션 유틸리티 - 게시글/댓글 목록의 커서(keyset) 기반 페이지네이션
+
+정렬 순서(공지 먼저, 최신순, id 역순)의 마지막 위치를 커서로 넘겨주면
+OFFSET 없이 인덱스를 따라 바로 다음 페이지를 찾을 수 있어
+몇 번째 페이지든 첫 페이지와 같은 비용으로 조회됩니다.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import asc, desc, tuple_
+from sqlalchemy.orm import Query
+
+from ..models.post import Post
+
+NEXT = "n"
+PREV = "p"
+OFFSET = "o"
+COMMENT = "c"
+
+
+def _encode(payload: list) -> str:
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(payload, list) or not payload:
+            raise ValueError(cursor)
+        return payload
+    except (ValueError, TypeError, UnicodeError):
+        raise _invalid_cursor()
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="잘못된 페이지 커서입니다",
+    )
+
+
+def encode_cursor(post: Post, direction: str) -> str:
+    """게시글의 정렬 키(is_pinned, created_at, id)와 방향을 불투명한 문자열로 인코딩합니다."""
+    return _encode([direction, int(bool(post.is_pinned)), post.created_at.isoformat(), post.id])
+
+
+def decode_cursor(cursor: str) -> Tuple[str, bool, datetime, int]:
+    """encode_cursor 로 만든 커서를 (방향, is_pinned, created_at, id) 로 되돌립니다."""
+    try:
+        direction, is_pinned, created_at, post_id = _decode(cursor)
+        if direction not in (NEXT, PREV):
+            raise ValueError(direction)
+        return direction, bool(is_pinned), datetime.fromisoformat(created_at), int(post_id)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+
+def paginate_posts(
+    query: Query,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+) -> Tuple[List[Post], Optional[str], Optional[str]]:
+    """
+    게시글 쿼리를 한 페이지만큼 조회합니다.
+    (게시글 목록, 다음 페이지 커서, 이전 페이지 커서)를 반환합니다.
+
+    cursor 가 없고 skip 이 주어지면 기존 OFFSET 방식으로 동작합니다 (하위 호환).
+    """
+    sort_key = tuple_(Post.is_pinned, Post.created_at, Post.id)
+
+    if cursor:
+        direction, is_pinned, created_at, post_id = decode_cursor(cursor)
+        position = tuple_(is_pinned, created_at, post_id)
+        if direction == NEXT:
+            rows = query.filter(sort_key < position)\
+                        .order_by(desc(Post.is_pinned), desc(Post.created_at), desc(Post.id))\
+                        .limit(limit + 1).all()
+            has_next, has_prev = len(rows) > limit, True
+            posts = rows[:limit]
+        else:
+            # 이전 페이지는 반대 방향으로 읽은 뒤 뒤집어서 정렬 순서를 맞춤
+            rows = query.filter(sort_key > position)\
+                        .order_by(asc(Post.is_pinned), asc(Post.created_at), asc(Post.id))\
+                        .limit(limit + 1).all()
+            has_next, has_prev = True, len(rows) > limit
+            posts = list(reversed(rows[:limit]))
+    else:
+        rows = query.order_by(desc(Post.is_pinned), desc(Post.created_at), desc(Post.id))\
+                    .offset(skip).limit(limit + 1).all()
+        has_next, has_prev = len(rows) > limit, skip > 0
+        posts = rows[:limit]
+
+    if not posts:
+        return posts, None, None
+
+    next_cursor = encode_cursor(posts[-1], NEXT) if has_next else None
+    prev_cursor = encode_cursor(posts[0], PREV) if has_prev else None
+    return posts, next_cursor, prev_cursor
+
+
+def paginate_ranked(
+    query: Query,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+) -> Tuple[List[Post], Optional[str], Optional[str]]:
+    """
+    검색 결과처럼 관련도 순으로 이미 정렬된 쿼리를 한 페이지만큼 조회합니다.
+    정렬 키가 게시글 컬럼이 아니므로 커서에는 OFFSET 위치를 담습니다.
+    """
+    if cursor:
+        try:
+            kind, skip = _decode(cursor)
+            if kind != OFFSET or int(skip) < 0:
+                raise ValueError(kind)
+            skip = int(skip)
+        except (ValueError, TypeError):
+            raise _invalid_cursor()
+
+    rows = query.offset(skip).limit(limit + 1).all()
+    posts = rows[:limit]
+    next_cursor = _encode([OFFSET, skip + limit]) if len(rows) > limit else None
+    prev_cursor = _encode([OFFSET, max(0, skip - limit)]) if skip > 0 else None
+    return posts, next_cursor, prev_cursor
+
+
+def encode_comment_cursor(comment) -> str:
+    """댓글의 정렬 키(created_at, id)를 커서로 인코딩합니다. (댓글은 작성순으로만 넘김)"""
+    return _encode([COMMENT, comment.created_at.isoformat(), comment.id])
+
+
+def decode_comment_cursor(cursor: str) -> Tuple[datetime, int]:
+    """encode_comment_cursor 로 만든 커서를 (created_at, id) 로 되돌립니다."""
+    try:
+        kind, created_at, comment_id = _decode(cursor)
+        if kind != COMMENT:
+            raise ValueError(kind)
+        return datetime.fromisoformat(created_at), int(comment_id)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
@@ -0,0 +1,95 @@
+"""
+비밀번호 해싱 작업 풀 - bcrypt 계산을 이벤트 루프 밖의 전용 스레드에서 실행합니다
+
+bcrypt 는 계산하는 동안 GIL 을 놓기 때문에 스레드 풀로도 병렬 처리가 됩니다.
+대기 중인 작업 수를 제한해서, 로그인이 몰리면 무한정 쌓아 두지 않고 바로 503 으로 거절합니다.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+from ..services.auth import AuthService
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """크기가 제한된 대기열을 가진 bcrypt 전용 스레드 풀"""
+
+    def __init__(self, workers: int, max_queue: int, retry_after: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor = self._new_executor()
+        self._in_flight = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        # 스레드는 작업이 들어올 때 만들어지므로 미리 만들어 두어도 비용이 없음
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+
+    @property
+    def queue_depth(self) -> int:
+        """실행 중이 아닌, 대기 중인 해싱 작업 수"""
+        with self._lock:
+            return max(0, self._in_flight - self.workers)
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._in_flight
+
+    @property
+    def rejected(self) -> int:
+        with self._lock:
+            return self._rejected
+
+    async def _submit(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="요청이 많아 잠시 후 다시 시도해 주세요.",
+                    headers={"Retry-After": str(self.retry_after)},
+                )
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # 기다리던 요청이 취소되어도 이미 실행 중인 해싱은 끝까지 돌므로, 작업이 실제로 끝났을 때 뺌
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future: Optional[Future] = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(AuthService.get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(AuthService.verify_password, plain_password, hashed_password)
+
+    async def shutdown(self) -> None:
+        """
+        남은 작업을 마치고 스레드를 정리합니다. 앱이 다시 시작되면 새 스레드 풀을 씀
+        남은 작업이 끝나기를 이벤트 루프 밖에서 기다리므로 그동안 다른 요청의 처리를 막지 않습니다.
+        """
+        executor, self._executor = self._executor, self._new_executor()
+        await run_in_threadpool(executor.shutdown, wait=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
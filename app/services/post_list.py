@@ -0,0 +1,117 @@
+"""
+게시글 목록 읽기 - 목록에 필요한 컬럼만 골라 읽고 가벼운 레코드로 돌려줍니다
+
+목록 화면은 본문(content)이 필요 없으므로 Post 엔티티 전체를 만들지 않고
+필요한 컬럼과 작성자 이름만 SELECT 해서 __slots__ 레코드로 바꿉니다.
+ORM 엔티티가 아니므로 identity map 에 올라가지 않고, 본문도 메모리에 올리지 않습니다.
+미리 보기는 저장해 둔 excerpt 컬럼을 씁니다.
+"""
+import re
+from typing import Iterable, List, Optional
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Query, Session
+
+from ..database import add_column_if_missing
+from ..models.post import Post
+from ..models.user import User
+
+EXCERPT_LENGTH = 150
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 목록에 필요한 컬럼 (작성자 이름과 ETag 용 수정 시각 포함)
+_LIST_COLUMNS = (
+    Post.id,
+    Post.title,
+    Post.excerpt,
+    Post.category,
+    Post.view_count,
+    Post.like_count,
+    Post.comment_count,
+    Post.is_pinned,
+    Post.created_at,
+    Post.updated_at,
+    Post.author_id,
+    User.username.label("author_username"),
+    User.nickname.label("author_nickname"),
+    User.updated_at.label("author_updated_at"),
+)
+
+
+def make_excerpt(content: Optional[str], length: int = EXCERPT_LENGTH) -> str:
+    """본문 앞부분을 공백을 정리해서 잘라 낸 미리 보기 문자열"""
+    text = _WHITESPACE_RE.sub(" ", content or "").strip()
+    return text if len(text) <= length else text[:length].rstrip() + "…"
+
+
+class AuthorRecord:
+    """목록에 보이는 작성자 정보 (AuthorInfo 스키마와 같은 속성)"""
+    __slots__ = ("id", "username", "nickname", "updated_at")
+
+    def __init__(self, id: int, username: str, nickname: Optional[str], updated_at=None):
+        self.id = id
+        self.username = username
+        self.nickname = nickname
+        self.updated_at = updated_at
+
+
+class PostRecord:
+    """목록의 게시글 한 줄 (PostList 스키마와 템플릿이 쓰는 속성)"""
+    __slots__ = (
+        "id", "title", "excerpt", "category", "view_count", "like_count", "comment_count",
+        "is_pinned", "created_at", "updated_at", "author_id", "author", "content", "snippet", "liked",
+    )
+
+    def __init__(self, row):
+        self.id = row.id
+        self.title = row.title
+        self.excerpt = row.excerpt
+        self.category = row.category
+        self.view_count = row.view_count or 0
+        self.like_count = row.like_count or 0
+        self.comment_count = row.comment_count or 0
+        self.is_pinned = row.is_pinned
+        self.created_at = row.created_at
+        self.updated_at = row.updated_at
+        self.author_id = row.author_id
+        self.author = AuthorRecord(row.author_id, row.author_username, row.author_nickname, row.author_updated_at)
+        # 검색 결과의 강조 발췌를 만들 때만 본문을 함께 읽음
+        self.content = getattr(row, "content", None)
+        self.snippet = None
+        self.liked = False
+
+
+def post_list_query(db: Session, with_content: bool = False) -> Query:
+    """목록용 컬럼만 읽는 게시글 쿼리 (작성자 JOIN 포함). 필터/정렬/페이지네이션은 호출한 쪽에서 추가"""
+    columns = _LIST_COLUMNS + ((Post.content,) if with_content else ())
+    return db.query(*columns).join(Post.author)
+
+
+def to_records(rows: Iterable) -> List[PostRecord]:
+    return [PostRecord(row) for row in rows]
+
+
+def ensure_excerpt_column() -> bool:
+    """기존 데이터베이스에 excerpt 컬럼이 없으면 추가합니다. 새로 추가했으면 True"""
+    return add_column_if_missing("posts", "excerpt", "VARCHAR(200)")
+
+
+def backfill_excerpts(db: Session, batch_size: int = 500) -> int:
+    """excerpt 가 비어 있는 게시글의 미리 보기를 채웁니다. 채운 게시글 수를 반환합니다."""
+    posts = Post.__table__
+    statement = (
+        update(posts)
+        .where(posts.c.id == bindparam("b_post_id"))
+        # 미리 보기를 채우는 것은 내용 수정이 아니므로 updated_at 은 그대로 둠
+        .values(excerpt=bindparam("b_excerpt"), updated_at=posts.c.updated_at)
+    )
+    count = 0
+    while True:
+        rows = db.query(Post.id, Post.content).filter(Post.excerpt == None).limit(batch_size).all()
+        if not rows:
+            break
+        db.execute(statement, [{"b_post_id": row.id, "b_excerpt": make_excerpt(row.content)} for row in rows])
+        db.commit()
+        count += len(rows)
+    return count
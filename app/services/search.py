@@ -0,0 +1,178 @@
+"""
+검색 서비스 - SQLite FTS5 기반 게시글 전문 검색
+
+posts_fts 는 게시글의 제목/내용을 색인하는 FTS5 가상 테이블이며 rowid 가 게시글 id 입니다.
+한글은 띄어쓰기와 상관없이 찾을 수 있도록 글자 두 개씩 겹쳐 자른 바이그램으로
+색인하고, 검색어도 같은 방식으로 잘라서 모든 조각이 포함된 글을 찾습니다.
+한 칸 띄어 쓴 한글 단어들은 이어 붙여서 자르므로 "한국어 본문" 은 "국어본" 으로도 찾을 수 있습니다.
+"""
+import html
+import re
+from typing import List, Optional
+
+from markupsafe import Markup
+from sqlalchemy import Float, Integer, false, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query, Session
+
+from ..models.post import Post
+
+FTS_TABLE = "posts_fts"
+
+# 한글 음절/자모 구간과 그 외 단어 문자 구간을 나눠서 자름
+_HANGUL = "가-힣ㄱ-ㆎ"
+_TOKEN_RE = re.compile(rf"[{_HANGUL}]+|[^\W{_HANGUL}]+")
+# 색인/검색어용: 한 칸씩 띄어 쓴 한글 단어들은 한 구간으로 묶음
+_NGRAM_RE = re.compile(rf"[{_HANGUL}]+(?: [{_HANGUL}]+)*|[^\W{_HANGUL}]+")
+
+# 제목이 내용보다 10배 중요하도록 가중치 부여 (bm25 는 값이 작을수록 관련도가 높음)
+_BM25 = f"bm25({FTS_TABLE}, 10.0, 1.0)"
+
+
+def _is_hangul(token: str) -> bool:
+    return "가" <= token[0] <= "힣" or "ㄱ" <= token[0] <= "ㆎ"
+
+
+def ngram_tokens(value: str) -> List[str]:
+    """
+    문자열을 색인용 토큰으로 자릅니다.
+    한글 구간은 (한 칸 띄어쓰기를 건너서) 겹치는 바이그램으로, 그 외 단어는 소문자 그대로 사용합니다.
+    """
+    tokens = []
+    for word in _NGRAM_RE.findall(value.lower()):
+        if _is_hangul(word):
+            word = word.replace(" ", "")
+        if _is_hangul(word) and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def build_match_query(search: str) -> Optional[str]:
+    """
+    검색어를 FTS5 MATCH 구문으로 변환합니다.
+    모든 토큰이 포함되어야 하며, 한 글자 한글이나 영문/숫자는 접두어로 검색합니다.
+    """
+    terms = []
+    for token in ngram_tokens(search):
+        quoted = '"' + token.replace('"', '""') + '"'
+        if not _is_hangul(token) or len(token) == 1:
+            quoted += "*"
+        terms.append(quoted)
+    return " ".join(terms) or None
+
+
+def is_search_available(db: Session) -> bool:
+    """FTS5 색인을 쓸 수 있는 데이터베이스(SQLite)인지 확인합니다."""
+    return db.get_bind().dialect.name == "sqlite"
+
+
+def create_search_index(engine: Engine) -> bool:
+    """
+    posts_fts 가상 테이블이 없으면 만들고 기존 게시글을 모두 색인합니다.
+    새로 만들었으면 True 를 반환합니다.
+    """
+    if engine.dialect.name != "sqlite" or inspect(engine).has_table(FTS_TABLE):
+        return False
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "title, content, tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+    with Session(bind=engine) as db:
+        rebuild_search_index(db)
+    return True
+
+
+def rebuild_search_index(db: Session) -> int:
+    """검색 색인을 비우고 모든 게시글을 다시 색인합니다. 색인한 게시글 수를 반환합니다."""
+    db.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    count = 0
+    for post_id, title, content in db.query(Post.id, Post.title, Post.content).yield_per(500):
+        _insert(db, post_id, title, content)
+        count += 1
+    db.commit()
+    return count
+
+
+def index_post(db: Session, post: Post) -> None:
+    """
+    게시글을 검색 색인에 추가하거나 갱신합니다.
+    commit 하지 않으므로 게시글 저장과 같은 트랜잭션에 포함됩니다. (post.id 가 있어야 하므로 flush 이후 호출)
+    """
+    if not is_search_available(db):
+        return
+    remove_post(db, post.id)
+    _insert(db, post.id, post.title, post.content)
+
+
+def remove_post(db: Session, post_id: int) -> None:
+    """게시글을 검색 색인에서 제거합니다."""
+    if not is_search_available(db):
+        return
+    db.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :post_id"), {"post_id": post_id})
+
+
+def _insert(db: Session, post_id: int, title: str, content: str) -> None:
+    db.execute(
+        text(f"INSERT INTO {FTS_TABLE} (rowid, title, content) VALUES (:post_id, :title, :content)"),
+        {
+            "post_id": post_id,
+            "title": " ".join(ngram_tokens(title or "")),
+            "content": " ".join(ngram_tokens(content or "")),
+        },
+    )
+
+
+def apply_search(query: Query, search: str) -> Query:
+    """
+    게시글 쿼리에 검색 조건을 적용하고 BM25 관련도 순으로 정렬합니다.
+    FTS5 를 쓸 수 없으면 기존 LIKE 검색으로 대신합니다.
+    """
+    if not is_search_available(query.session):
+        return query.filter(
+            (Post.title.contains(search)) | (Post.content.contains(search))
+        )
+
+    match = build_match_query(search)
+    if match is None:
+        return query.filter(false())
+
+    ranked = text(
+        f"SELECT rowid AS post_id, {_BM25} AS rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+    ).bindparams(match=match).columns(post_id=Integer, rank=Float).subquery("search_rank")
+    return query.join(ranked, ranked.c.post_id == Post.id).order_by(ranked.c.rank, Post.id.desc())
+
+
+def highlight_snippet(content: str, search: str, width: int = 120) -> Markup:
+    """
+    본문에서 검색어가 처음 나오는 부분 주변을 잘라 <mark> 로 강조한 HTML 조각을 만듭니다.
+    색인에는 바이그램이 저장되어 있으므로 FTS5 의 snippet() 대신 원문에서 직접 찾습니다.
+    """
+    words = [word for word in _TOKEN_RE.findall(search.lower()) if word]
+    if not content or not words:
+        return Markup("")
+
+    # 한글 검색어는 띄어쓰기가 달라도 강조되도록 글자 사이에 공백 한 칸을 허용
+    alternatives = [
+        " ?".join(map(re.escape, word)) if _is_hangul(word) else re.escape(word)
+        for word in sorted(words, key=len, reverse=True)
+    ]
+    pattern = re.compile("|".join(alternatives), re.IGNORECASE)
+    first = pattern.search(content)
+    start = max(0, (first.start() if first else 0) - width // 3)
+    end = min(len(content), start + width)
+    excerpt = content[start:end]
+
+    parts = []
+    position = 0
+    for found in pattern.finditer(excerpt):
+        parts.append(html.escape(excerpt[position:found.start()]))
+        parts.append(f"<mark>{html.escape(found.group())}</mark>")
+        position = found.end()
+    parts.append(html.escape(excerpt[position:]))
+
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(content) else ""
+    return Markup(prefix + "".join(parts) + suffix)
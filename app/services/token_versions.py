@@ -0,0 +1,131 @@
+"""
+토큰 버전 관리 - 토큰 폐기(로그아웃, 탈퇴, 관리자 비활성화)를 처리합니다
+
+토큰에는 발급 당시의 token_version 이 담기고, 사용자의 token_version 을 올리면
+이전 토큰은 모두 무효가 됩니다. 사용자별 현재 버전은 메모리에 두고 짧은 TTL 마다
+DB에서 다시 읽으므로, 인증된 요청 대부분은 DB 조회 없이 처리됩니다.
+캐시에 없을 때의 DB 조회는 run_db(요청 세션) 또는 스레드 풀에서 실행해서 이벤트 루프를 막지 않습니다.
+조회하는 동안 토큰이 폐기되면(invalidate) 그 조회 결과는 오래된 값일 수 있으므로 캐시에 넣지 않습니다.
+"""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+from ..database import SessionLocal, current_request_db, run_db
+from ..models.user import User
+
+UserState = Optional[Tuple[int, bool]]
+
+
+def _load_with_session(db: Session, user_id: int) -> UserState:
+    # 요청 세션의 identity map 에 사용자를 올려 두어
+    # 같은 요청에서 get_current_user_record 가 다시 조회하지 않도록 함
+    user = db.get(User, user_id)
+    # identity map 은 약한 참조이므로 요청이 끝날 때까지 세션에 붙잡아 둠
+    db.info["current_user"] = user
+    return (user.token_version or 0, bool(user.is_active)) if user else None
+
+
+def _load_detached(user_id: int) -> UserState:
+    # 요청 밖(스크립트 등)에서는 잠깐 쓰는 세션으로 조회
+    with SessionLocal() as db:
+        row = db.query(User.token_version, User.is_active).filter(User.id == user_id).first()
+    return (row.token_version or 0, bool(row.is_active)) if row else None
+
+
+class TokenVersionRegistry:
+    """사용자 id -> (token_version, is_active) 를 TTL 동안 기억하는 맵"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[int, Tuple[float, UserState]] = {}
+        # 사용자별 세대 (invalidate 마다 증가, clear 는 전체 세대 _epoch 를 올림)
+        self._generations: Dict[int, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, user_id: int) -> Tuple[bool, UserState]:
+        """
+        캐시만 확인합니다. (DB 를 읽지 않으므로 어디서든 호출 가능)
+        (캐시에 있는지, (현재 토큰 버전, 활성 여부) 또는 사용자가 없으면 None) 을 반환합니다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and now - entry[0] < self.ttl:
+                self.hits += 1
+                return True, entry[1]
+            self.misses += 1
+        return False, None
+
+    async def lookup(self, user_id: int) -> UserState:
+        """사용자의 (현재 토큰 버전, 활성 여부). 사용자가 없으면 None"""
+        found, state = self.cached(user_id)
+        if found:
+            return state
+
+        now = time.monotonic()
+        with self._lock:
+            generation = (self._epoch, self._generations.get(user_id, 0))
+        db = current_request_db()
+        if db is not None:
+            state = await run_db(db, _load_with_session, user_id)
+        else:
+            state = await run_in_threadpool(_load_detached, user_id)
+        with self._lock:
+            # 읽는 도중 폐기되었으면 읽은 값이 폐기 전의 것일 수 있으므로 저장하지 않음
+            if generation == (self._epoch, self._generations.get(user_id, 0)):
+                self._entries[user_id] = (now, state)
+        return state
+
+    async def is_current(self, user_id: int, token_version: int) -> bool:
+        """토큰의 버전이 현재 버전과 같고 계정이 활성 상태인지 확인합니다."""
+        state = await self.lookup(user_id)
+        return state is not None and state[1] and state[0] == token_version
+
+    def invalidate(self, user_id: int) -> None:
+        """다음 확인 때 DB에서 다시 읽도록 사용자의 항목을 지웁니다. (진행 중인 조회의 결과도 저장되지 않음)"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+token_versions = TokenVersionRegistry(ttl=settings.TOKEN_VERSION_CACHE_TTL_SECONDS)
+
+
+def revoke_user_tokens(db: Session, user_id: int) -> None:
+    """
+    사용자의 토큰 버전을 올려 지금까지 발급된 토큰을 모두 무효화합니다.
+    세션에 남아 있는 다른 변경 사항(예: is_active = False)도 함께 commit 됩니다.
+    """
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    token_versions.invalidate(user_id)
@@ -0,0 +1,122 @@
+"""
+조회수 버퍼 - 조회할 때마다 UPDATE 하지 않고 메모리에 모아 두었다가 한 번에 반영합니다
+"""
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ..config import settings
+from ..database import engine
+from ..models.post import Post
+
+logger = logging.getLogger(__name__)
+
+posts_table = Post.__table__
+
+# executemany 로 여러 게시글의 조회수를 한 번에 증가시키는 UPDATE 문
+_flush_statement = (
+    update(posts_table)
+    .where(posts_table.c.id == bindparam("b_post_id"))
+    # updated_at 은 내용 수정 시각(ETag/Last-Modified)이므로 조회수 반영으로는 바꾸지 않음
+    .values(view_count=posts_table.c.view_count + bindparam("b_amount"), updated_at=posts_table.c.updated_at)
+)
+
+
+class ViewCounterBuffer:
+    """게시글별 조회수 증가분을 모아 두었다가 주기적으로 DB에 반영하는 버퍼"""
+
+    def __init__(self, flush_interval: float, flush_threshold: int):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._pending: Dict[int, int] = defaultdict(int)
+        self._total = 0
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def increment(self, post_id: int, amount: int = 1) -> None:
+        """조회수 증가분을 버퍼에 기록합니다. 임계치를 넘으면 바로 반영하도록 깨웁니다."""
+        with self._lock:
+            self._pending[post_id] += amount
+            self._total += amount
+            reached = self._total >= self.flush_threshold
+        if reached and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def pending(self, post_id: int) -> int:
+        """아직 DB에 반영되지 않은 조회수 증가분"""
+        with self._lock:
+            return self._pending.get(post_id, 0)
+
+    def record_view(self, post: Post) -> None:
+        """
+        게시글 조회를 기록하고, 화면에 보여줄 조회수에 아직 반영되지 않은 증가분을 더합니다.
+        세션에는 변경 사항으로 잡히지 않으므로 이후 commit 해도 UPDATE 가 나가지 않습니다.
+        """
+        self.increment(post.id)
+        set_committed_value(post, "view_count", (post.view_count or 0) + self.pending(post.id))
+
+    def flush(self) -> int:
+        """쌓인 조회수를 하나의 트랜잭션에서 반영합니다. 반영한 게시글 수를 반환합니다."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+            self._total = 0
+        if not pending:
+            return 0
+
+        rows = [{"b_post_id": post_id, "b_amount": amount} for post_id, amount in pending.items()]
+        try:
+            with engine.begin() as conn:
+                conn.execute(_flush_statement, rows)
+        except Exception:
+            # 실패하면 다음 주기에 다시 시도하도록 되돌려 놓음
+            with self._lock:
+                for post_id, amount in pending.items():
+                    self._pending[post_id] += amount
+                    self._total += amount
+            raise
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                logger.exception("조회수 반영에 실패했습니다")
+
+    def start(self) -> None:
+        """백그라운드 반영 작업을 시작합니다. (앱 시작 시 호출)"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """백그라운드 작업을 멈추고 남은 조회수를 모두 반영합니다. (앱 종료 시 호출)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._loop = None
+        await asyncio.to_thread(self.flush)
+
+
+view_counter = ViewCounterBuffer(
+    flush_interval=settings.VIEW_COUNT_FLUSH_INTERVAL_SECONDS,
+    flush_threshold=settings.VIEW_COUNT_FLUSH_THRESHOLD,
+)
@@ -0,0 +1,203 @@
+"""
+쓰기 전용 작업자 - 게시글/댓글/좋아요 쓰기를 모아서 한 번에 commit 합니다 (group commit)
+
+SQLite 는 데이터베이스 전체에 쓰기 잠금이 하나뿐이고, commit 할 때마다 fsync 를 합니다.
+WRITE_QUEUE_ENABLED=True 이면 전용 스레드 하나가 쓰기 커넥션을 맡아 대기열의 쓰기 작업을
+차례로 실행하고, 모인 작업들을 한 번의 commit 으로 저장합니다. 묶음 전체가 트랜잭션 하나이고
+각 작업은 그 안의 SAVEPOINT 에서 실행되므로, 한 작업이 실패해도 같은 묶음의 다른 작업에는 영향이 없습니다.
+
+쓰기 작업은 세션을 받는 동기 함수이고, 직접 commit 하지 않습니다. run_write 로 실행하면
+작업자가 꺼져 있을 때는 기존처럼 요청 세션에서 실행한 뒤 바로 commit 합니다.
+commit 이후에 해야 하는 일(캐시 갱신 등)은 on_commit 으로 등록합니다.
+commit 후 작업은 결과를 돌려준 뒤에 실행되고, 실패해도 로그만 남기고 쓰기 결과에는 영향을 주지 않습니다.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import DbSession, engine, run_db
+from ..sqlite_profile import begin_immediate
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+_AFTER_COMMIT = "after_commit"
+_STOP = object()
+
+
+def on_commit(db: Session, callback: Callable[[], None]) -> None:
+    """현재 쓰기 작업이 commit 된 뒤에 실행할 함수를 등록합니다."""
+    db.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+def _run_after_commit(callbacks: List[Callable[[], None]]) -> None:
+    # 하나가 실패해도 나머지는 실행 (이미 commit 되었으므로 예외를 호출한 쪽으로 올리지 않음)
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception:
+            logger.exception("commit 후 작업이 실패했습니다: %r", callback)
+
+
+class GroupCommitWriter:
+    """쓰기 커넥션 하나를 가진 전용 스레드. 대기열의 작업을 묶어서 commit 합니다."""
+
+    def __init__(self, max_batch: int, max_delay: float):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.groups = 0
+        self.operations = 0
+        self.largest_group = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """대기 중인 작업을 모두 처리한 뒤 스레드를 종료합니다."""
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        await asyncio.get_running_loop().run_in_executor(None, self._thread.join)
+        self._thread = None
+
+    async def submit(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """쓰기 작업을 대기열에 넣고, 그 작업이 들어간 묶음이 commit 되면 결과를 반환합니다."""
+        future: Future = Future()
+        self._queue.put((fn, args, kwargs, future))
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "queued": self._queue.qsize(),
+                "groups": self.groups,
+                "operations": self.operations,
+                "largest_group": self.largest_group,
+            }
+
+    def _collect(self, first) -> List[Any]:
+        """첫 작업과 함께 max_delay 안에 들어온 작업을 max_batch 개까지 모읍니다."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+            if item is _STOP:
+                break
+        return batch
+
+    def _run(self) -> None:
+        # 작업자가 살아 있는 동안 쓰기 커넥션 하나를 계속 사용
+        with engine.connect() as connection:
+            if connection.dialect.name == "sqlite":
+                # SAVEPOINT 보다 먼저 트랜잭션을 열어야 묶음 전체가 commit 한 번(fsync 한 번)이 됨
+                event.listen(connection, "begin", begin_immediate)
+            stopping = False
+            while not stopping:
+                batch = self._collect(self._queue.get())
+                if batch[-1] is _STOP:
+                    batch.pop()
+                    stopping = True
+                if batch:
+                    self._commit_group(connection, batch)
+
+    def _commit_group(self, connection, batch: List[Any]) -> None:
+        # 기다리던 요청이 취소된 작업은 건너뜀 (실행 중으로 표시한 뒤에는 취소되지 않음)
+        batch = [item for item in batch if item[-1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        done = []
+        with Session(bind=connection, autoflush=False) as db:
+            try:
+                # 묶음의 트랜잭션 시작 (쓰기 잠금을 얻지 못하면 묶음 전체가 실패)
+                db.connection()
+            except Exception as exc:
+                db.rollback()
+                for *_, future in batch:
+                    future.set_exception(exc)
+                return
+
+            for fn, args, kwargs, future in batch:
+                callbacks = len(db.info.get(_AFTER_COMMIT, []))
+                try:
+                    with db.begin_nested():
+                        result = fn(db, *args, **kwargs)
+                        db.flush()
+                except Exception as exc:
+                    # 이 작업의 변경과 commit 후 작업만 취소
+                    del db.info.get(_AFTER_COMMIT, [])[callbacks:]
+                    future.set_exception(exc)
+                    continue
+                done.append((future, result))
+
+            try:
+                db.commit()
+            except Exception as exc:
+                db.rollback()
+                db.info.pop(_AFTER_COMMIT, None)
+                for future, _ in done:
+                    future.set_exception(exc)
+                return
+            callbacks = db.info.pop(_AFTER_COMMIT, [])
+
+        with self._lock:
+            self.groups += 1
+            self.operations += len(batch)
+            self.largest_group = max(self.largest_group, len(batch))
+        # 결과를 먼저 돌려준 뒤 commit 후 작업 실행
+        for future, result in done:
+            future.set_result(result)
+        _run_after_commit(callbacks)
+
+
+db_writer = GroupCommitWriter(
+    max_batch=settings.WRITE_QUEUE_MAX_BATCH,
+    max_delay=settings.WRITE_QUEUE_MAX_DELAY_MS / 1000,
+)
+
+
+async def run_write(db: DbSession, fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    쓰기 작업 fn 을 실행하고 commit 합니다.
+    작업자가 켜져 있으면 대기열에 넣어 다른 쓰기와 함께 commit 하고,
+    아니면 요청 세션에서 run_db 로 실행한 뒤 바로 commit 합니다.
+    """
+    if settings.WRITE_QUEUE_ENABLED and db_writer.running:
+        return await db_writer.submit(fn, *args, **kwargs)
+
+    def write(session: Session) -> T:
+        try:
+            result = fn(session, *args, **kwargs)
+            session.commit()
+        except Exception:
+            session.rollback()
+            session.info.pop(_AFTER_COMMIT, None)
+            raise
+        _run_after_commit(session.info.pop(_AFTER_COMMIT, []))
+        return result
+
+    return await run_db(db, write)
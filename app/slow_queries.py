@@ -0,0 +1,218 @@
+"""
+느린 쿼리 기록
+SLOW_QUERY_THRESHOLD_MS 보다 오래 걸린 쿼리 중 SLOW_QUERY_SAMPLE_RATE 비율만 골라
+SQL, 파라미터, 요청한 라우트, EXPLAIN QUERY PLAN 결과를 NDJSON 파일(한 줄에 JSON 하나)로 남깁니다.
+users 테이블이나 비밀번호/이메일/토큰 컬럼이 들어간 문장은 파라미터를 남기지 않습니다.
+파일은 SLOW_QUERY_LOG_MAX_BYTES 마다 회전하고 SLOW_QUERY_LOG_BACKUPS 개까지 보관합니다.
+
+같은 모양의 쿼리(숫자/문자열 값만 다른 쿼리)는 정규화한 문장으로 묶어 메모리에 집계하고,
+관리자 API(/api/admin/slow-queries)에서 가장 문제가 되는 쿼리를 확인합니다.
+집계는 프로세스(워커)마다 따로 합니다. 전체 기록은 NDJSON 파일을 확인합니다.
+"""
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+from .query_stats import current_query_stats
+
+logger = logging.getLogger(__name__)
+
+# EXPLAIN QUERY PLAN 을 붙일 수 있는 문장
+_EXPLAINABLE_RE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+# 정규화: 문자열/숫자 값 -> ?, IN (?, ?, ...) -> IN (...), 공백 정리
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+# 파라미터에 계정 정보(비밀번호 해시, 이메일, 토큰)가 들어 있을 수 있는 문장
+_SENSITIVE_RE = re.compile(r"\busers\b|password|email|token", re.IGNORECASE)
+REDACTED = "<redacted>"
+
+
+def normalize_statement(statement: str) -> str:
+    """값만 다른 쿼리가 같은 문장이 되도록 정규화합니다."""
+    normalized = _STRING_RE.sub("?", statement)
+    normalized = _NUMBER_RE.sub("?", normalized)
+    normalized = _IN_LIST_RE.sub("IN (...)", normalized)
+    return _WHITESPACE_RE.sub(" ", normalized).strip()
+
+
+def _loggable_parameters(statement: str, parameters, executemany: bool) -> Any:
+    """기록할 파라미터 (계정 정보가 들어 있을 수 있는 문장이면 값을 가림)"""
+    if executemany:
+        return f"<executemany {len(parameters)}>"
+    if parameters and _SENSITIVE_RE.search(statement):
+        return REDACTED
+    return _jsonable(parameters)
+
+
+def _jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, bytes):
+        return f"<{len(value)} bytes>"
+    text = str(value)
+    # 게시글 본문 같은 긴 값은 앞부분만
+    return text if len(text) <= 200 else text[:200] + "…"
+
+
+class SlowQueryStats:
+    """정규화한 문장별 느린 쿼리 집계 (횟수, 시간 합계/최대, 마지막 예시)"""
+
+    def __init__(self, max_statements: int = 500):
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, record: Dict[str, Any]) -> None:
+        key = record["normalized"]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_statements:
+                    # 가장 덜 중요한(시간 합계가 가장 작은) 문장을 버림
+                    del self._entries[min(self._entries, key=lambda k: self._entries[k]["total_ms"])]
+                entry = self._entries[key] = {
+                    "statement": key, "count": 0, "total_ms": 0.0, "max_ms": 0.0, "routes": {},
+                }
+            entry["count"] += 1
+            entry["total_ms"] += record["duration_ms"]
+            entry["max_ms"] = max(entry["max_ms"], record["duration_ms"])
+            if record["route"]:
+                entry["routes"][record["route"]] = entry["routes"].get(record["route"], 0) + 1
+            entry["last_seen"] = record["time"]
+            entry["example"] = {
+                "sql": record["sql"],
+                "parameters": record["parameters"],
+                "plan": record["plan"],
+            }
+
+    def top(self, limit: int = 20, sort: str = "total_ms") -> List[Dict[str, Any]]:
+        """sort(total_ms, count, max_ms, avg_ms) 가 큰 순서로 limit 개"""
+        with self._lock:
+            summaries = [
+                {
+                    **entry,
+                    "total_ms": round(entry["total_ms"], 3),
+                    "max_ms": round(entry["max_ms"], 3),
+                    "avg_ms": round(entry["total_ms"] / entry["count"], 3),
+                    "routes": dict(entry["routes"]),
+                }
+                for entry in self._entries.values()
+            ]
+        summaries.sort(key=lambda summary: summary[sort], reverse=True)
+        return summaries[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_stats = SlowQueryStats()
+
+_file_logger: Optional[logging.Logger] = None
+_file_logger_lock = threading.Lock()
+
+
+def _slow_query_file_logger() -> logging.Logger:
+    """NDJSON 파일에 한 줄씩 쓰는 로거 (처음 쓸 때 파일을 엶)"""
+    global _file_logger
+    with _file_logger_lock:
+        if _file_logger is None:
+            directory = os.path.dirname(settings.SLOW_QUERY_LOG_PATH)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(
+                settings.SLOW_QUERY_LOG_PATH,
+                maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+                backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+                encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            file_logger = logging.getLogger(f"{__name__}.file")
+            file_logger.setLevel(logging.INFO)
+            file_logger.addHandler(handler)
+            # 일반 로그에 쿼리 기록이 섞이지 않도록
+            file_logger.propagate = False
+            _file_logger = file_logger
+        return _file_logger
+
+
+def _explain(conn, statement: str, parameters) -> Optional[List[str]]:
+    """같은 커넥션에서 EXPLAIN QUERY PLAN 을 실행해 계획의 각 줄을 반환합니다."""
+    if conn.dialect.name != "sqlite" or not _EXPLAINABLE_RE.match(statement):
+        return None
+    try:
+        # 이벤트가 다시 불리지 않도록 SQLAlchemy 를 거치지 않고 DBAPI 커서를 직접 씀
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters or ())
+            return [row[-1] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    except Exception as exc:  # 계획을 못 얻어도 요청에는 영향을 주지 않음
+        return [f"EXPLAIN 실패: {exc}"]
+
+
+def _current_route() -> Optional[str]:
+    stats = current_query_stats()
+    scope = stats.scope if stats is not None else None
+    if scope is None:
+        return None
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._slow_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_slow_query_start", None)
+    if start is None:
+        return
+    duration_ms = (time.perf_counter() - start) * 1000
+    if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+    if settings.SLOW_QUERY_SAMPLE_RATE < 1.0 and random.random() >= settings.SLOW_QUERY_SAMPLE_RATE:
+        return
+
+    record = {
+        "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "duration_ms": round(duration_ms, 3),
+        "route": _current_route(),
+        "normalized": normalize_statement(statement),
+        "sql": statement,
+        "parameters": _loggable_parameters(statement, parameters, executemany),
+        "plan": None if executemany else _explain(conn, statement, parameters),
+    }
+    slow_query_stats.record(record)
+    try:
+        _slow_query_file_logger().info(json.dumps(record, ensure_ascii=False))
+    except OSError:
+        logger.exception("느린 쿼리 기록 파일에 쓰지 못했습니다")
+
+
+def install_slow_query_log(engine: Engine) -> None:
+    """엔진에 느린 쿼리 기록 이벤트를 등록합니다. (SLOW_QUERY_LOG_ENABLED 일 때만)"""
+    if not settings.SLOW_QUERY_LOG_ENABLED:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
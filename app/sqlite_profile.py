@@ -0,0 +1,132 @@
+"""
+SQLite 성능 설정과 커넥션 풀 통계
+
+- 새 커넥션마다 PRAGMA(WAL, synchronous, cache_size, mmap_size, temp_store, busy_timeout)를 적용합니다.
+- 커넥션 풀에서 커넥션을 꺼낼 때 기다린 시간을 기록해서 풀 크기를 조정할 수 있게 합니다.
+- 쓰기 작업자의 커넥션은 begin_immediate 로 트랜잭션을 직접 시작합니다.
+"""
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .config import settings
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """connect 이벤트 핸들러: 설정의 SQLite 성능 프로필을 커넥션에 적용합니다."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA cache_size = {int(settings.SQLITE_CACHE_SIZE)}")
+        cursor.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA temp_store = {settings.SQLITE_TEMP_STORE}")
+        cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    finally:
+        cursor.close()
+
+
+def begin_immediate(connection) -> None:
+    """
+    begin 이벤트 핸들러: 트랜잭션을 시작할 때 BEGIN IMMEDIATE 를 직접 보냅니다.
+    pysqlite 는 INSERT/UPDATE 직전에만 BEGIN 을 보내므로, 첫 문장이 SAVEPOINT 이면
+    트랜잭션 없이 시작해서 RELEASE 할 때마다 따로 commit 됩니다.
+    IMMEDIATE 는 쓰기 잠금을 처음부터 잡아서 busy_timeout 안에서 기다리게 합니다.
+    """
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+class PoolStats:
+    """커넥션 풀 사용 통계 (꺼낸 횟수, 대기 시간, 타임아웃)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.waits = 0  # 바로 받지 못하고 기다린 횟수
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.timeouts = 0
+
+    def record_checkout(self, elapsed: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            # 1ms 이상 걸렸으면 다른 요청이 커넥션을 반납하기를 기다린 것으로 봄
+            if elapsed >= 0.001:
+                self.waits += 1
+            self.wait_seconds_total += elapsed
+            self.wait_seconds_max = max(self.wait_seconds_max, elapsed)
+
+    def snapshot(self, engine: Engine) -> Dict[str, Any]:
+        pool = engine.pool
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "timeouts": self.timeouts,
+            }
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+            })
+        return data
+
+
+pool_stats = PoolStats()
+
+
+class _TimedCheckoutMixin:
+    """풀에서 커넥션을 꺼내는 데 걸린 시간을 pool_stats 에 기록"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            pool_stats.record_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_stats.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """create_engine / create_async_engine 에 넘길 풀 설정"""
+    if ":memory:" in url or url.rstrip("/").endswith("sqlite:"):
+        # 메모리 DB 는 커넥션마다 다른 DB 이므로 기본 풀(SingletonThreadPool/StaticPool)을 그대로 사용
+        return {}
+    return {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": False,
+    }
+
+
+def install_sqlite_profile(engine: Engine) -> None:
+    """SQLite 엔진이면 connect 이벤트에 성능 프로필을 등록합니다."""
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", apply_sqlite_pragmas)
@@ -0,0 +1,149 @@
+"""
+정적 파일 설정
+build_static.py 가 만든 파일(내용 해시가 붙은 이름 + 미리 압축한 .gz/.br)을 서빙합니다.
+
+- 템플릿에서는 static_url('style.css') 로 manifest 에 적힌 해시 URL 을 얻음
+  (빌드하지 않았으면 /static/style.css 원본 경로)
+- 해시가 붙은 파일은 내용이 바뀌면 URL 도 바뀌므로 1년 동안 immutable 로 캐시
+- Accept-Encoding 에 맞춰 미리 압축해 둔 br / gzip 파일을 그대로 보냄 (요청마다 압축하지 않음)
+"""
+import json
+import mimetypes
+import os
+import stat
+import threading
+from typing import Dict, Optional
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from .config import settings
+
+STATIC_DIR = "app/static"
+# 빌드 결과가 들어가는 하위 디렉터리 (STATIC_DIR 기준)
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# (Content-Encoding, 파일 확장자) - 먼저 나온 것을 우선
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+CACHE_CONTROL_IMMUTABLE = "public, max-age={max_age}, immutable"
+# 해시가 없는 원본 파일은 매번 재검증
+CACHE_CONTROL_REVALIDATE = "public, no-cache"
+
+
+class AssetManifest:
+    """원본 경로 -> 해시가 붙은 경로 (manifest.json). DEBUG 면 파일이 바뀔 때마다 다시 읽음"""
+
+    def __init__(self, path: str, reload: bool = False):
+        self.path = path
+        self.reload = reload
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, str]] = None
+        self._mtime: Optional[float] = None
+
+    def _load(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            self._entries, self._mtime = {}, None
+            return
+        if self._entries is not None and mtime == self._mtime:
+            return
+        with open(self.path, encoding="utf-8") as f:
+            self._entries = json.load(f)
+        self._mtime = mtime
+
+    def entries(self) -> Dict[str, str]:
+        with self._lock:
+            if self._entries is None or self.reload:
+                self._load()
+            return self._entries
+
+    def resolve(self, path: str) -> Optional[str]:
+        return self.entries().get(path.lstrip("/"))
+
+
+manifest = AssetManifest(os.path.join(STATIC_DIR, DIST_DIR, MANIFEST_NAME), reload=settings.DEBUG)
+
+
+def static_url(path: str) -> str:
+    """템플릿용: 정적 파일의 URL (빌드된 파일이 있으면 해시가 붙은 URL)"""
+    hashed = manifest.resolve(path)
+    if hashed is not None:
+        return f"/static/{DIST_DIR}/{hashed}"
+    return f"/static/{path.lstrip('/')}"
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+    """Accept-Encoding 헤더에서 받을 수 있는 인코딩 (q=0 은 제외)"""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name)
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """미리 압축한 파일과 immutable 캐시 헤더를 지원하는 StaticFiles"""
+
+    def __init__(self, *args, max_age: int = 31536000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_age = max_age
+
+    def is_immutable(self, path: str) -> bool:
+        return path.replace(os.sep, "/").startswith(f"{DIST_DIR}/")
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = None
+        if scope["method"] in ("GET", "HEAD"):
+            response = await self._precompressed_response(path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+            if response.status_code in (200, 304) and self._has_variants(path):
+                # 같은 URL 이 인코딩에 따라 다른 내용이 되므로 프록시 캐시가 구분하도록
+                response.headers["Vary"] = "Accept-Encoding"
+
+        if response.status_code in (200, 206, 304):
+            response.headers["Cache-Control"] = (
+                CACHE_CONTROL_IMMUTABLE.format(max_age=self.max_age)
+                if self.is_immutable(path) else CACHE_CONTROL_REVALIDATE
+            )
+        return response
+
+    def _has_variants(self, path: str) -> bool:
+        return any(os.path.isfile(os.path.join(self.directory, path + suffix)) for _, suffix in ENCODINGS)
+
+    async def _precompressed_response(self, path: str, scope: Scope) -> Optional[Response]:
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+                continue
+            media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            response = FileResponse(
+                full_path,
+                stat_result=stat_result,
+                media_type=media_type,
+                headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+            )
+            if self.is_not_modified(response.headers, request_headers):
+                return NotModifiedResponse(response.headers)
+            return response
+        return None
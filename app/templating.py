@@ -0,0 +1,188 @@
+"""
+템플릿 설정
+모든 라우터가 함께 쓰는 Jinja2 환경입니다.
+
+- 컴파일된 템플릿을 파일(bytecode cache)에 저장해 워커마다 다시 컴파일하지 않음
+- 앱 시작 시 모든 템플릿을 미리 읽어 두어 배포 직후 첫 요청도 느리지 않음
+- DEBUG 가 아니면 템플릿 파일 변경 확인(auto_reload)을 하지 않음
+- 템플릿별 컴파일/렌더링 시간을 기록
+- 큰 페이지는 렌더링하면서 조금씩 보내는 스트리밍 응답(stream_template)을 지원
+"""
+import os
+import stat
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+from .config import settings
+from .profiler import trace_current_thread
+from .query_stats import template_rendering
+from .static_assets import static_url
+
+TEMPLATE_DIR = "app/templates"
+
+
+class TemplateStats:
+    """템플릿별 컴파일(로드) 횟수/시간과 렌더링 횟수/시간"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _entry(self, name: str) -> Dict[str, float]:
+        entry = self._stats.get(name)
+        if entry is None:
+            entry = self._stats[name] = {
+                "compiles": 0, "compile_seconds": 0.0,
+                "renders": 0, "render_seconds_total": 0.0, "render_seconds_max": 0.0,
+            }
+        return entry
+
+    def record_compile(self, name: str, elapsed: float) -> None:
+        with self._lock:
+            entry = self._entry(name)
+            entry["compiles"] += 1
+            entry["compile_seconds"] += elapsed
+
+    def record_render(self, name: str, elapsed: float) -> None:
+        with self._lock:
+            entry = self._entry(name)
+            entry["renders"] += 1
+            entry["render_seconds_total"] += elapsed
+            entry["render_seconds_max"] = max(entry["render_seconds_max"], elapsed)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {key: round(value, 6) if isinstance(value, float) else value for key, value in entry.items()}
+                for name, entry in sorted(self._stats.items())
+            }
+
+
+template_stats = TemplateStats()
+
+
+class TimedTemplate(Template):
+    """렌더링 시간을 기록하는 템플릿 (상속한 레이아웃의 렌더링 시간은 자식 템플릿에 포함)"""
+
+    def render(self, *args, **kwargs) -> str:
+        start = time.perf_counter()
+        try:
+            with template_rendering():
+                return super().render(*args, **kwargs)
+        finally:
+            template_stats.record_render(self.name, time.perf_counter() - start)
+
+    def generate(self, *args, **kwargs) -> Iterator[str]:
+        # 스트리밍 중 클라이언트를 기다리는 시간은 빼고, 실제로 렌더링한 시간만 더함
+        pieces = super().generate(*args, **kwargs)
+        elapsed = 0.0
+        try:
+            while True:
+                # 스트리밍 중에는 조각마다 스레드 풀에서 실행되므로 그 스레드도 추적
+                trace_current_thread()
+                start = time.perf_counter()
+                try:
+                    with template_rendering():
+                        piece = next(pieces)
+                except StopIteration:
+                    elapsed += time.perf_counter() - start
+                    return
+                elapsed += time.perf_counter() - start
+                yield piece
+        finally:
+            template_stats.record_render(self.name, elapsed)
+
+
+class TimedFileSystemLoader(FileSystemLoader):
+    """템플릿을 읽고 컴파일하는(또는 bytecode cache 에서 불러오는) 시간을 기록하는 로더"""
+
+    def load(self, environment, name, globals=None):
+        start = time.perf_counter()
+        template = super().load(environment, name, globals)
+        template_stats.record_compile(name, time.perf_counter() - start)
+        return template
+
+
+class TimedEnvironment(Environment):
+    template_class = TimedTemplate
+
+
+def _bytecode_cache() -> FileSystemBytecodeCache:
+    """
+    컴파일된 템플릿 캐시. 캐시 파일은 읽을 때 코드 객체로 복원되므로 다른 사용자가 쓸 수 있는 디렉터리는 쓰지 않습니다.
+    디렉터리를 설정하지 않으면 Jinja2 기본값(사용자별 0700 임시 디렉터리, 소유자 확인)을 씁니다.
+    """
+    directory = settings.TEMPLATE_BYTECODE_CACHE_DIR
+    if not directory:
+        return FileSystemBytecodeCache()
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.stat(directory)
+    if info.st_uid != os.getuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise RuntimeError(
+            f"TEMPLATE_BYTECODE_CACHE_DIR({directory}) 는 현재 사용자 소유이고 "
+            "그룹/다른 사용자가 쓸 수 없는 디렉터리여야 합니다"
+        )
+    return FileSystemBytecodeCache(directory)
+
+
+environment = TimedEnvironment(
+    loader=TimedFileSystemLoader(TEMPLATE_DIR),
+    autoescape=True,
+    auto_reload=settings.DEBUG,
+    bytecode_cache=_bytecode_cache(),
+    # 템플릿 수보다 넉넉하게 (기본 400 이면 충분하지만 명시)
+    cache_size=400,
+)
+
+# 템플릿에서 {{ static_url('style.css') }} 로 해시가 붙은 정적 파일 URL 사용
+environment.globals["static_url"] = static_url
+
+# 라우터에서 사용하는 공용 템플릿 객체
+templates = Jinja2Templates(env=environment)
+
+
+def precompile_templates() -> int:
+    """모든 템플릿을 미리 읽어 메모리 캐시에 올립니다. (앱 시작 시 호출) 읽은 템플릿 수를 반환합니다."""
+    names = environment.list_templates(extensions=["html"])
+    for name in names:
+        environment.get_template(name)
+    return len(names)
+
+
+def _chunked(pieces: Iterator[str], chunk_size: int) -> Iterator[bytes]:
+    """템플릿이 만든 작은 조각들을 chunk_size 정도로 모아 보냅니다."""
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def stream_template(
+    request: Request,
+    name: str,
+    context: Dict[str, Any],
+    chunk_size: Optional[int] = None,
+) -> StreamingResponse:
+    """
+    템플릿을 렌더링하면서 바로바로 보내는 응답을 만듭니다.
+    페이지 윗부분(헤더, 본문)은 댓글을 렌더링하기 전에 먼저 전송되고,
+    전체 HTML 을 메모리에 한 번에 만들지 않습니다.
+    DB 조회는 응답을 만들기 전에 끝내야 합니다. (렌더링 중에는 요청 세션이 이미 닫혀 있을 수 있음)
+    """
+    template = environment.get_template(name)
+    pieces = template.generate({"request": request, **context})
+    return StreamingResponse(
+        _chunked(pieces, chunk_size or settings.TEMPLATE_STREAM_CHUNK_SIZE),
+        media_type="text/html; charset=utf-8",
+    )
@@ -0,0 +1,201 @@
+# audit_queries.py
+"""
+쿼리 실행 계획 점검
+
+임시 데이터베이스에 샘플 데이터를 넣고 모든 라우트를 한 번씩 호출하면서
+실행된 SQL 을 모두 모은 뒤, 각 SQL 의 EXPLAIN QUERY PLAN 을 확인합니다.
+인덱스 없이 테이블 전체를 읽는 쿼리(SCAN <테이블>)가 있으면 실패(종료 코드 1)합니다.
+
+사용법: python audit_queries.py [-v]
+"""
+import os
+import re
+import sys
+import tempfile
+
+# 앱을 임포트하기 전에 임시 데이터베이스를 쓰도록 설정
+_db_dir = tempfile.mkdtemp(prefix="audit-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'audit.db')}"
+os.environ["DATABASE_ASYNC"] = "false"
+os.environ["WRITE_QUEUE_ENABLED"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ.setdefault("SECRET_KEY", "audit-only-secret")
+
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import engine, Base, SessionLocal
+# 아래 임포트는 SQLAlchemy가 모델을 인식하게 하기 위해 필요합니다.
+from app.models import user, post, comment, like
+from app.models.comment import Comment
+from app.models.like import CommentLike, PostLike
+from app.models.post import Post
+from app.models.user import User
+from app.main import app
+from app.services.auth import AuthService
+from app.services.search import create_search_index, rebuild_search_index
+
+CATEGORIES = ["자유게시판", "질문게시판", "정보공유", "후기/리뷰", "공지사항"]
+
+# EXPLAIN 대상이 아닌 문장
+_SKIP = re.compile(r"^\s*(PRAGMA|SAVEPOINT|RELEASE|ROLLBACK|BEGIN|COMMIT|CREATE|DROP|ALTER)\b", re.I)
+# 값만 넣는 INSERT 는 계획이 의미 없음
+_INSERT_VALUES = re.compile(r"^\s*INSERT\b(?!.*\bSELECT\b)", re.I | re.S)
+# 실행 계획의 전체 테이블 스캔 (인덱스를 쓰는 스캔은 "USING ... INDEX" 가 붙음)
+_FULL_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+def seed(users: int = 50, posts: int = 600, comments_per_post: int = 4):
+    """라우트가 실제와 비슷한 계획을 세우도록 샘플 데이터를 넣습니다."""
+    db = SessionLocal()
+    try:
+        hashed = AuthService.get_password_hash("password1")
+        db.add_all([
+            User(username=f"user{i}", email=f"user{i}@example.com", hashed_password=hashed,
+                 nickname=f"사용자{i}", is_admin=(i == 0))
+            for i in range(users)
+        ])
+        db.flush()
+
+        now = datetime.utcnow()
+        db.add_all([
+            Post(title=f"게시글 {i} 안녕하세요", content=f"샘플 본문 {i} 검색용 문장입니다",
+                 category=CATEGORIES[i % len(CATEGORIES)], author_id=i % users + 1,
+                 is_pinned=(i % 100 == 0), created_at=now - timedelta(minutes=i))
+            for i in range(posts)
+        ])
+        db.flush()
+
+        for post_id in range(1, posts + 1):
+            top = Comment(content="댓글", author_id=post_id % users + 1, post_id=post_id)
+            db.add(top)
+            db.flush()
+            db.add_all([
+                Comment(content="대댓글", author_id=(post_id + n) % users + 1,
+                        post_id=post_id, parent_id=top.id, is_deleted=(n == 0))
+                for n in range(comments_per_post - 1)
+            ])
+        db.add_all([PostLike(user_id=u + 1, post_id=p + 1) for u in range(users) for p in range(0, posts, 7)])
+        db.add_all([CommentLike(user_id=u + 1, comment_id=c + 1) for u in range(users) for c in range(0, posts, 11)])
+        db.commit()
+        rebuild_search_index(db)
+    finally:
+        db.close()
+
+
+def exercise_routes(client: TestClient):
+    """모든 라우트를 한 번씩 호출합니다."""
+    admin = SessionLocal().get(User, 1)
+    member = SessionLocal().get(User, 2)
+    admin_headers = {"Authorization": f"Bearer {AuthService.create_user_token(admin)}"}
+    headers = {"Authorization": f"Bearer {AuthService.create_user_token(member)}"}
+
+    # 페이지
+    for url in ["/", "/posts", "/posts?category=정보공유", "/posts?search=안녕", "/posts/new",
+                "/posts/3", "/login", "/register"]:
+        client.get(url, headers=headers)
+    client.get("/")
+    client.get("/posts")
+
+    # 게시글 API (커서 양방향, 검색, 카테고리)
+    page = client.get("/api/posts/?limit=10", headers=headers).json()
+    page = client.get(f"/api/posts/?limit=10&cursor={page['next_cursor']}").json()
+    client.get(f"/api/posts/?limit=10&cursor={page['prev_cursor']}")
+    client.get("/api/posts/?limit=10&category=질문게시판")
+    client.get("/api/posts/?skip=40&limit=10")
+    page = client.get("/api/posts/?search=안녕&limit=10", headers=headers).json()
+    client.get(f"/api/posts/?search=안녕&limit=10&cursor={page['next_cursor']}")
+    client.get("/api/posts/categories/list")
+    client.get("/api/posts/5", headers=headers)
+    client.post("/api/posts/", data={"title": "새 글", "content": "본문", "category": "자유게시판"},
+                headers=headers, follow_redirects=False)
+    client.put("/api/posts/2", json={"title": "수정한 제목"}, headers=headers)
+    client.post("/api/posts/2/like", headers=headers)
+    client.delete("/api/posts/2/like", headers=headers)
+    client.delete("/api/posts/2", headers=headers)
+
+    # 댓글 API (페이지, 답글 페이지)
+    thread = client.get("/api/posts/5/comments/?limit=1&replies=1").json()
+    top = thread["comments"][0]
+    client.get(f"/api/posts/5/comments/?cursor={top['replies_cursor']}")
+    client.get(f"/api/posts/5/comments/{top['id']}/replies?cursor={top['replies_cursor']}&limit=1")
+    created = client.post("/api/posts/5/comments/", json={"content": "새 댓글"}, headers=headers).json()
+    client.post("/api/posts/5/comments/", json={"content": "답글", "parent_id": created["id"]}, headers=headers)
+    client.put(f"/api/posts/5/comments/{created['id']}", json={"content": "수정"}, headers=headers)
+    client.post(f"/api/posts/5/comments/{created['id']}/like", headers=headers)
+    client.delete(f"/api/posts/5/comments/{created['id']}/like", headers=headers)
+    client.delete(f"/api/posts/5/comments/{created['id']}", headers=headers)
+
+    # 사용자/인증 API
+    client.post("/api/auth/register", data={"username": "newbie", "email": "newbie@example.com",
+                                            "password": "password1"}, follow_redirects=False)
+    client.post("/api/auth/login", data={"username": "user3", "password": "password1"},
+                follow_redirects=False)
+    client.get("/api/auth/me", headers=headers)
+    client.get("/api/users/?limit=20", headers=admin_headers)
+    client.get("/api/users/3")
+    client.put("/api/users/me", json={"nickname": "새 닉네임"}, headers=headers)
+    client.post("/api/users/4/deactivate", headers=admin_headers)
+    client.delete("/api/users/me", headers=headers)
+    client.get("/logout", headers=headers, follow_redirects=False)
+
+
+def full_scans(statement: str, parameters, conn):
+    """문장의 실행 계획에서 전체 테이블 스캔 줄을 찾습니다."""
+    tables = set(Base.metadata.tables)
+    plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    details = [row[-1] for row in plan]
+    scans = [d for d in details if (m := _FULL_SCAN.match(d)) and m.group(1) in tables]
+    # LIMIT 만 있고 조건이 없는 목록(관리자 사용자 목록 등)은 읽는 행 수가 정해져 있으므로 허용
+    if scans and " WHERE " not in statement.upper() and " LIMIT " in statement.upper():
+        scans = []
+    return scans, details
+
+
+def audit(verbose: bool = False) -> int:
+    print("샘플 데이터베이스를 만듭니다...")
+    Base.metadata.create_all(bind=engine)
+    create_search_index(engine)
+    seed()
+
+    statements = {}
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if _SKIP.match(statement) or _INSERT_VALUES.match(statement):
+            return
+        if executemany:
+            parameters = parameters[0] if parameters else ()
+        statements.setdefault(statement, parameters)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with TestClient(app) as client:
+            exercise_routes(client)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    print(f"라우트에서 실행된 SQL {len(statements)}개의 실행 계획을 확인합니다...")
+    failures = 0
+    with engine.connect() as conn:
+        for statement, parameters in statements.items():
+            scans, details = full_scans(statement, parameters, conn)
+            if scans or verbose:
+                print("-" * 60)
+                print(" ".join(statement.split()))
+                for detail in details:
+                    print(f"    {detail}")
+            if scans:
+                failures += 1
+                print(f"  !! 전체 테이블 스캔: {', '.join(scans)}")
+
+    if failures:
+        print(f"전체 테이블 스캔을 하는 쿼리가 {failures}개 있습니다.")
+        return 1
+    print("모든 쿼리가 인덱스를 사용합니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(audit(verbose="-v" in sys.argv[1:]))
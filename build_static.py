@@ -0,0 +1,105 @@
+# build_static.py
+"""
+정적 파일 빌드: app/static 의 파일을 내용 해시가 붙은 이름으로 app/static/dist 에 복사하고,
+압축하면 작아지는 파일은 .gz (brotli 모듈이 있으면 .br 도) 를 옆에 만들어 둡니다.
+원본 이름 -> 해시 이름은 dist/manifest.json 에 기록하고, 템플릿의 static_url() 이 이것을 읽습니다.
+
+    python build_static.py          # 빌드 (이전 빌드 파일은 남겨 둠 - 배포 중인 페이지가 참조할 수 있음)
+    python build_static.py --clean  # dist 를 비우고 새로 빌드
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+from app.static_assets import DIST_DIR, MANIFEST_NAME, STATIC_DIR
+
+try:
+    import brotli  # 선택 사항 (pip install brotli)
+except ImportError:
+    brotli = None
+
+# 압축할 파일 종류 (이미지/폰트처럼 이미 압축된 형식은 제외)
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".mjs", ".json", ".svg", ".txt", ".html", ".xml", ".map"}
+# 이보다 작은 파일은 압축해도 이득이 거의 없음
+MIN_COMPRESS_SIZE = 256
+HASH_LENGTH = 12
+
+
+def hashed_name(relative_path: str, data: bytes) -> str:
+    """style.css -> style.<해시>.css"""
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    stem, ext = os.path.splitext(relative_path)
+    return f"{stem}.{digest}{ext}"
+
+
+def source_files(static_dir: str):
+    """빌드할 원본 파일의 상대 경로 (dist 와 압축 파일은 제외)"""
+    for root, dirs, files in os.walk(static_dir):
+        if os.path.abspath(root) == os.path.abspath(static_dir):
+            dirs[:] = [d for d in dirs if d != DIST_DIR]
+        for name in sorted(files):
+            if name.startswith(".") or name.endswith((".gz", ".br")):
+                continue
+            yield os.path.relpath(os.path.join(root, name), static_dir).replace(os.sep, "/")
+
+
+def write_file(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def compress_variants(path: str, data: bytes) -> list:
+    """압축 파일을 만들고, 만든 인코딩 이름 목록을 반환합니다. (원본보다 작을 때만)"""
+    if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTENSIONS or len(data) < MIN_COMPRESS_SIZE:
+        return []
+    made = []
+    # mtime=0: 내용이 같으면 빌드할 때마다 같은 .gz 가 나오도록
+    gzipped = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gzipped) < len(data):
+        write_file(path + ".gz", gzipped)
+        made.append("gzip")
+    if brotli is not None:
+        compressed = brotli.compress(data, quality=11)
+        if len(compressed) < len(data):
+            write_file(path + ".br", compressed)
+            made.append("br")
+    return made
+
+
+def build_static(static_dir: str = STATIC_DIR, clean: bool = False) -> dict:
+    """정적 파일을 빌드하고 manifest(원본 경로 -> 해시 경로)를 반환합니다."""
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    if clean and os.path.isdir(dist_dir):
+        shutil.rmtree(dist_dir)
+
+    manifest = {}
+    for relative_path in source_files(static_dir):
+        with open(os.path.join(static_dir, relative_path), "rb") as f:
+            data = f.read()
+        target = hashed_name(relative_path, data)
+        target_path = os.path.join(dist_dir, target)
+        write_file(target_path, data)
+        encodings = compress_variants(target_path, data)
+        manifest[relative_path] = target
+        print(f"  {relative_path} -> {DIST_DIR}/{target} {'(' + ', '.join(encodings) + ')' if encodings else ''}")
+
+    # 파일을 모두 쓴 뒤에 manifest 를 한 번에 바꿔서, 읽는 쪽이 없는 파일을 가리키지 않도록
+    manifest_path = os.path.join(dist_dir, MANIFEST_NAME)
+    os.makedirs(dist_dir, exist_ok=True)
+    temp_path = manifest_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(temp_path, manifest_path)
+    return manifest
+
+
+if __name__ == "__main__":
+    print("정적 파일을 빌드합니다...")
+    if brotli is None:
+        print("brotli 모듈이 없어 .br 파일은 만들지 않습니다. (pip install brotli)")
+    built = build_static(clean="--clean" in sys.argv[1:])
+    print(f"정적 파일 {len(built)}개를 빌드했습니다.")
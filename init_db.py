@@ -1,7 +1,9 @@
 # init_db.py
-from app.database import engine, Base
+from app.database import engine, Base, SessionLocal, add_column_if_missing, create_missing_indexes
 # 아래 임포트는 SQLAlchemy가 모델을 인식하게 하기 위해 필요합니다.
-from app.models import user, post, comment 
+from app.models import user, post, comment, like 
+from app.services.post_list import backfill_excerpts, ensure_excerpt_column
+from app.services.search import create_search_index, rebuild_search_index
 
 def init_db():
     """데이터베이스 테이블 생성"""
@@ -9,6 +11,26 @@ def init_db():
     # 모든 테이블을 삭제하고 다시 생성 (개발용)
     # Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # 이전 버전으로 만든 데이터베이스에 새 컬럼 추가
+    add_column_if_missing("posts", "comment_count", "INTEGER NOT NULL DEFAULT 0")
+    add_column_if_missing("users", "token_version", "INTEGER NOT NULL DEFAULT 0")
+    add_column_if_missing("posts", "comments_version", "INTEGER NOT NULL DEFAULT 0")
+    add_column_if_missing("posts", "comments_updated_at", "DATETIME")
+    ensure_excerpt_column()
+    with SessionLocal() as db:
+        filled = backfill_excerpts(db)
+    if filled:
+        print(f"게시글 {filled}개의 미리 보기(excerpt)를 채웠습니다.")
+    # 이전 버전으로 만든 데이터베이스에 새 인덱스 추가
+    for index_name in create_missing_indexes():
+        print(f"인덱스 {index_name} 를 만들었습니다.")
+    if create_search_index(engine):
+        print("게시글 검색 색인(posts_fts)을 만들었습니다.")
+    else:
+        # 색인 토큰을 만드는 방식이 바뀌었을 수 있으므로 기존 색인은 다시 만듦
+        with SessionLocal() as db:
+            indexed = rebuild_search_index(db)
+        print(f"게시글 {indexed}개의 검색 색인을 다시 만들었습니다.")
     print("테이블 생성이 완료되었습니다.")
 
 if __name__ == "__main__":
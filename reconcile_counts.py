@@ -0,0 +1,21 @@
+# reconcile_counts.py
+from app.database import SessionLocal
+# 아래 임포트는 SQLAlchemy가 모델을 인식하게 하기 위해 필요합니다.
+from app.models import user, post, comment, like
+from app.services.counters import ensure_comment_count_column, reconcile_comment_counts
+
+def reconcile_counts():
+    """게시글 댓글 수(comment_count) 재계산"""
+    if ensure_comment_count_column():
+        print("posts.comment_count 컬럼을 추가했습니다.")
+
+    print("게시글 댓글 수를 다시 계산합니다...")
+    db = SessionLocal()
+    try:
+        fixed = reconcile_comment_counts(db)
+    finally:
+        db.close()
+    print(f"댓글 수가 어긋난 게시글 {fixed}개를 수정했습니다.")
+
+if __name__ == "__main__":
+    reconcile_counts()
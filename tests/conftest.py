@@ -0,0 +1,115 @@
+"""
+테스트 공통 설정
+앱을 가져오기 전에 환경 변수로 임시 데이터베이스를 지정하고, 테스트마다 테이블을 새로 만듭니다.
+"""
+import os
+import sys
+import tempfile
+
+_TMP_DIR = tempfile.mkdtemp(prefix="community-tests-")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP_DIR}/test.db"
+os.environ["SLOW_QUERY_LOG_PATH"] = os.path.join(_TMP_DIR, "slow_queries.ndjson")
+# 테스트에서는 해싱 비용을 최소로
+os.environ["BCRYPT_ROUNDS"] = "4"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import app.models  # noqa: F401  (모델을 Base.metadata 에 등록)
+from app.database import Base, SessionLocal, engine
+from app.main import app as asgi_app
+from app.models.post import Post
+from app.models.user import User
+from app.services.likes import like_cache
+from app.services.page_cache import page_cache
+from app.services.search import FTS_TABLE, create_search_index
+from app.services.token_versions import token_versions
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """테스트마다 빈 데이터베이스와 빈 캐시에서 시작"""
+    Base.metadata.drop_all(bind=engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    Base.metadata.create_all(bind=engine)
+    create_search_index(engine)
+    like_cache.clear()
+    page_cache.clear()
+    token_versions.clear()
+    yield engine
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    with TestClient(asgi_app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def login(client):
+    """회원가입 후 Bearer 인증 헤더를 반환하는 함수"""
+    def register(username: str, password: str = "secret123") -> dict:
+        response = client.post(
+            "/api/auth/register",
+            data={"username": username, "email": f"{username}@example.com", "password": password},
+            follow_redirects=False,
+        )
+        assert response.status_code == 303, response.text
+        token = response.cookies.get("access_token")
+        client.cookies.clear()
+        return {"Authorization": f"Bearer {token}"}
+    return register
+
+
+@pytest.fixture
+def make_user(db):
+    def create(username: str, **fields) -> User:
+        user = User(username=username, email=f"{username}@example.com", hashed_password="x",
+                    nickname=username, **fields)
+        db.add(user)
+        db.commit()
+        return user
+    return create
+
+
+@pytest.fixture
+def make_post(db):
+    def create(author: User, title: str = "제목", content: str = "내용", **fields) -> Post:
+        post = Post(title=title, content=content, author_id=author.id, **fields)
+        db.add(post)
+        db.commit()
+        return post
+    return create
+
+
+@pytest.fixture
+def sql_trace():
+    """풀에서 꺼낸 커넥션이 SQLite 에 실제로 보낸 문장 (pysqlite 가 보내는 BEGIN/COMMIT 포함)"""
+    statements = []
+
+    def trace(dbapi_connection, connection_record, connection_proxy):
+        dbapi_connection.set_trace_callback(statements.append)
+
+    event.listen(engine, "checkout", trace)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "checkout", trace)
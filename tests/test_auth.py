@@ -0,0 +1,104 @@
+"""토큰 폐기(토큰 버전)와 사용자 확인 테스트"""
+import asyncio
+
+import pytest
+
+from app.models.user import User
+from app.services import token_versions as token_versions_module
+from app.services.auth import AuthService
+from app.services.token_versions import token_versions
+
+
+def bearer_token(headers: dict) -> str:
+    return headers["Authorization"].removeprefix("Bearer ")
+
+
+def is_authenticated(client, headers: dict) -> bool:
+    # 로그인이 필요한 페이지 (토큰이 폐기되었으면 401)
+    response = client.get("/posts/new", headers=headers)
+    assert response.status_code in (200, 401)
+    return response.status_code == 200
+
+
+def test_logout_revokes_issued_tokens(client, login):
+    headers = login("alice")
+    assert is_authenticated(client, headers)
+
+    client.cookies.set("access_token", bearer_token(headers))
+    response = client.get("/logout", follow_redirects=False)
+    assert response.status_code == 303
+    client.cookies.clear()
+
+    assert not is_authenticated(client, headers)
+
+
+def test_delete_me_revokes_issued_tokens(client, login):
+    headers = login("alice")
+    assert client.delete("/api/users/me", headers=headers).status_code == 200
+    assert not is_authenticated(client, headers)
+
+
+def test_admin_deactivation_revokes_issued_tokens(client, login, db):
+    user_headers = login("alice")
+    login("admin")
+    admin = db.query(User).filter(User.username == "admin").one()
+    admin.is_admin = True
+    db.commit()
+    admin_headers = {"Authorization": "Bearer " + AuthService.create_user_token(admin)}
+    alice = db.query(User).filter(User.username == "alice").one()
+
+    assert client.post(f"/api/users/{alice.id}/deactivate", headers=admin_headers).status_code == 200
+    assert not is_authenticated(client, user_headers)
+
+
+def test_version_is_cached_and_loaded_off_the_event_loop(client, login, monkeypatch):
+    headers = login("alice")
+    token_versions.clear()
+    loads = []
+    original = token_versions_module._load_with_session
+
+    def spy(db, user_id):
+        try:
+            asyncio.get_running_loop()
+            loads.append("event loop")
+        except RuntimeError:
+            loads.append("worker thread")
+        return original(db, user_id)
+
+    monkeypatch.setattr(token_versions_module, "_load_with_session", spy)
+
+    assert is_authenticated(client, headers)
+    assert is_authenticated(client, headers)
+    # 첫 요청(캐시 없음)만 DB 를 읽고, 그것도 스레드 풀에서 실행
+    assert loads == ["worker thread"]
+    found, state = token_versions.cached(AuthService.decode_token(bearer_token(headers))["uid"])
+    assert found and state == (0, True)
+
+
+@pytest.mark.anyio
+async def test_lookup_outside_a_request(make_user):
+    user = make_user("alice")
+    assert await token_versions.is_current(user.id, 0)
+    assert not await token_versions.is_current(user.id, 1)
+    assert await token_versions.lookup(user.id + 100) is None
+
+
+@pytest.mark.anyio
+async def test_lookup_racing_a_revocation_is_not_cached(make_user, monkeypatch):
+    user = make_user("alice")
+    token_versions.clear()
+
+    def stale_load(user_id):
+        # 사용자 행을 읽은 뒤, 결과를 저장하기 전에 폐기(commit + invalidate)가 끝난 경우
+        state = original(user_id)
+        token_versions.invalidate(user_id)
+        return state
+
+    original = token_versions_module._load_detached
+    monkeypatch.setattr(token_versions_module, "_load_detached", stale_load)
+    assert await token_versions.lookup(user.id) == (0, True)
+    assert token_versions.cached(user.id) == (False, None)
+
+    monkeypatch.setattr(token_versions_module, "_load_detached", original)
+    await token_versions.lookup(user.id)
+    assert token_versions.cached(user.id) == (True, (0, True))
@@ -0,0 +1,144 @@
+"""댓글 API 의 조건부 요청(ETag/304) 테스트"""
+import pytest
+
+
+@pytest.fixture
+def thread(client, login, make_user, make_post):
+    headers = login("alice")
+    post = make_post(make_user("author"))
+    response = client.post(f"/api/posts/{post.id}/comments/", json={"content": "첫 댓글"}, headers=headers)
+    assert response.status_code == 201
+    return post.id, response.json()["id"], headers
+
+
+def comments_etag(client, post_id: int) -> str:
+    response = client.get(f"/api/posts/{post_id}/comments/")
+    assert response.status_code == 200
+    return response.headers["etag"]
+
+
+def test_unchanged_thread_returns_304_without_aggregating(client, thread, sql_trace):
+    post_id, _, _ = thread
+    etag = comments_etag(client, post_id)
+    sql_trace.clear()
+
+    response = client.get(f"/api/posts/{post_id}/comments/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    queries = [sql for sql in sql_trace if sql.lstrip().upper().startswith("SELECT")]
+    assert len(queries) == 1
+    assert "FROM posts" in queries[0] and "comments" not in queries[0].split("FROM", 1)[1]
+
+
+@pytest.mark.parametrize("change", ["create", "edit", "delete", "like", "unlike", "nickname"])
+def test_thread_etag_changes_on_every_visible_change(client, thread, change):
+    post_id, comment_id, headers = thread
+    url = f"/api/posts/{post_id}/comments/"
+    if change == "unlike":
+        client.post(f"{url}{comment_id}/like", headers=headers)
+    before = comments_etag(client, post_id)
+
+    if change == "create":
+        response = client.post(url, json={"content": "답글", "parent_id": comment_id}, headers=headers)
+    elif change == "edit":
+        response = client.put(f"{url}{comment_id}", json={"content": "고친 댓글"}, headers=headers)
+    elif change == "delete":
+        response = client.delete(f"{url}{comment_id}", headers=headers)
+    elif change == "like":
+        response = client.post(f"{url}{comment_id}/like", headers=headers)
+    elif change == "unlike":
+        response = client.delete(f"{url}{comment_id}/like", headers=headers)
+    else:
+        response = client.put("/api/users/me", json={"nickname": "앨리스"}, headers=headers)
+    assert response.status_code in (200, 201)
+
+    assert comments_etag(client, post_id) != before
+    stale = client.get(url, headers={"If-None-Match": before})
+    assert stale.status_code == 200
+
+
+def test_repeated_like_keeps_thread_etag(client, thread):
+    post_id, comment_id, headers = thread
+    client.post(f"/api/posts/{post_id}/comments/{comment_id}/like", headers=headers)
+    before = comments_etag(client, post_id)
+
+    client.post(f"/api/posts/{post_id}/comments/{comment_id}/like", headers=headers)
+
+    assert comments_etag(client, post_id) == before
+
+
+def test_comments_of_missing_post_return_404(client):
+    assert client.get("/api/posts/999/comments/").status_code == 404
+
+
+@pytest.fixture
+def deep_thread(db, make_user, make_post):
+    """최상위 댓글 2개. 첫 댓글 아래로 5단계 답글 사슬, 그리고 첫 댓글에 직접 달린 답글 4개"""
+    from datetime import datetime, timedelta
+
+    from app.models.comment import Comment
+
+    author = make_user("writer")
+    post = make_post(author)
+    clock = iter(datetime(2024, 1, 1) + timedelta(minutes=minute) for minute in range(100))
+
+    def add(parent=None):
+        comment = Comment(content="댓글", author_id=author.id, post_id=post.id,
+                          parent_id=parent.id if parent else None, created_at=next(clock))
+        db.add(comment)
+        db.commit()
+        return comment
+
+    first = add()
+    chain = [first]
+    for _ in range(5):
+        chain.append(add(chain[-1]))
+    siblings = [add(first) for _ in range(4)]
+    second = add()
+    return post.id, chain, siblings, second
+
+
+def walk(nodes, depth=0):
+    for node in nodes:
+        yield node, depth
+        yield from walk(node["replies"], depth + 1)
+
+
+def test_page_assembles_reply_trees_down_to_max_depth(client, deep_thread, sql_trace):
+    post_id, chain, siblings, second = deep_thread
+    sql_trace.clear()
+    page = client.get(f"/api/posts/{post_id}/comments/", params={"replies": 2, "max_depth": 3}).json()
+
+    # 게시글 확인, 최상위 페이지, 답글 트리, 답글 수 - 스레드 크기와 상관없는 쿼리 수
+    assert len([sql for sql in sql_trace if sql.lstrip().upper().startswith(("SELECT", "WITH"))]) == 4
+    top = page["comments"]
+    assert [node["id"] for node in top] == [chain[0].id, second.id]
+    assert all(node["depth"] == depth for node, depth in walk(top))
+    assert max(depth for _, depth in walk(top)) == 3
+
+    first = top[0]
+    assert first["reply_count"] == 5
+    assert [reply["id"] for reply in first["replies"]] == [chain[1].id, siblings[0].id]
+    assert first["replies_cursor"] is not None
+    # 최대 깊이에서 잘린 댓글은 답글 없이 답글 수만
+    cut = first["replies"][0]["replies"][0]["replies"][0]
+    assert cut["id"] == chain[3].id and cut["replies"] == [] and cut["reply_count"] == 1
+
+
+def test_reply_page_continues_with_absolute_depth(client, deep_thread):
+    post_id, chain, siblings, _ = deep_thread
+    page = client.get(
+        f"/api/posts/{post_id}/comments/{chain[2].id}/replies", params={"replies": 1, "max_depth": 1}
+    ).json()
+
+    [reply] = page["comments"]
+    assert (reply["id"], reply["depth"]) == (chain[3].id, 3)
+    assert [(node["id"], node["depth"]) for node in reply["replies"]] == [(chain[4].id, 4)]
+    assert reply["replies"][0]["replies"] == [] and reply["replies"][0]["reply_count"] == 1
+
+
+def test_max_depth_is_part_of_the_etag(client, deep_thread):
+    post_id = deep_thread[0]
+    etag = client.get(f"/api/posts/{post_id}/comments/").headers["etag"]
+    response = client.get(f"/api/posts/{post_id}/comments/", params={"max_depth": 1}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
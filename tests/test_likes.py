@@ -0,0 +1,89 @@
+"""좋아요 기록/카운터 테스트"""
+import threading
+
+from app.database import SessionLocal
+from app.models.like import PostLike
+from app.models.post import Post
+from app.services.likes import set_like
+
+
+def like_state(db, post_id: int):
+    db.expire_all()
+    rows = db.query(PostLike).filter(PostLike.post_id == post_id).count()
+    return rows, db.get(Post, post_id).like_count
+
+
+def test_like_and_unlike_are_idempotent(client, login, db, make_user, make_post):
+    headers = login("alice")
+    post = make_post(make_user("author"))
+
+    for _ in range(3):
+        response = client.post(f"/api/posts/{post.id}/like", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["like_count"] == 1
+    assert like_state(db, post.id) == (1, 1)
+
+    for _ in range(3):
+        response = client.delete(f"/api/posts/{post.id}/like", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["like_count"] == 0
+    assert like_state(db, post.id) == (0, 0)
+
+
+def test_like_missing_post_returns_404(client, login):
+    assert client.post("/api/posts/999/like", headers=login("alice")).status_code == 404
+
+
+def test_ledger_and_counter_roll_back_together(db, make_user, make_post):
+    user = make_user("alice")
+    post = make_post(user)
+
+    # 좋아요 뒤에 실패해서 rollback 되면 기록도 카운터도 남지 않아야 함
+    changed, like_count = set_like(db, "post", user.id, post.id, liked=True)
+    assert (changed, like_count) == (True, 1)
+    db.rollback()
+    assert like_state(db, post.id) == (0, 0)
+
+    # 다시 시도하면 "이미 좋아요" 가 아니라 정상적으로 반영됨
+    changed, like_count = set_like(db, "post", user.id, post.id, liked=True)
+    db.commit()
+    assert (changed, like_count) == (True, 1)
+    assert like_state(db, post.id) == (1, 1)
+
+
+def test_concurrent_likes_keep_counter_consistent(db, make_user, make_post):
+    users = [make_user(f"user{i}") for i in range(8)]
+    post = make_post(users[0])
+    user_ids = [user.id for user in users]
+    errors = []
+    start = threading.Barrier(len(user_ids) * 2)
+
+    def press(user_id: int, liked: bool) -> None:
+        start.wait()
+        # 같은 사용자가 두 번씩 동시에 누름
+        for _ in range(3):
+            session = SessionLocal()
+            try:
+                set_like(session, "post", user_id, post.id, liked=liked)
+                session.commit()
+            except Exception as exc:  # pragma: no cover - 실패하면 아래에서 보고
+                errors.append(exc)
+            finally:
+                session.close()
+
+    threads = [threading.Thread(target=press, args=(user_id, True)) for user_id in user_ids * 2]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert like_state(db, post.id) == (8, 8)
+
+    start = threading.Barrier(4 * 2)
+    threads = [threading.Thread(target=press, args=(user_id, False)) for user_id in user_ids[:4] * 2]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert like_state(db, post.id) == (4, 4)
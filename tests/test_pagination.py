@@ -0,0 +1,89 @@
+"""게시글 목록 커서 페이지네이션 테스트"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.search import rebuild_search_index
+
+BASE_TIME = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def posts(db, make_user, make_post):
+    """목록 순서(공지 먼저, 최신순, id 역순)대로 정렬한 게시글 id"""
+    author = make_user("author")
+    created = []
+    for minutes in (0, 1, 1, 2, 3, 3, 3, 4, 5, 6):
+        created.append(make_post(author, title="페이지 글", created_at=BASE_TIME + timedelta(minutes=minutes)))
+    created.append(make_post(author, title="공지 글", is_pinned=True, created_at=BASE_TIME))
+    created.append(make_post(author, title="비공개 글", is_published=False))
+    ordered = sorted(
+        (post for post in created if post.is_published),
+        key=lambda post: (post.is_pinned, post.created_at, post.id), reverse=True,
+    )
+    return [post.id for post in ordered]
+
+
+def get_page(client, **params) -> dict:
+    response = client.get("/api/posts/", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def ids(page: dict) -> list:
+    return [post["id"] for post in page["posts"]]
+
+
+def test_next_cursors_walk_every_post_once(client, posts):
+    page = get_page(client, limit=3)
+    assert page["prev_cursor"] is None
+    seen = ids(page)
+    while page["next_cursor"]:
+        page = get_page(client, limit=3, cursor=page["next_cursor"])
+        assert page["prev_cursor"] is not None
+        seen += ids(page)
+    assert seen == posts
+
+
+def test_prev_cursor_returns_to_the_same_pages(client, posts):
+    pages = [get_page(client, limit=4)]
+    while pages[-1]["next_cursor"]:
+        pages.append(get_page(client, limit=4, cursor=pages[-1]["next_cursor"]))
+    assert len(pages) == 3
+
+    page = pages[-1]
+    for expected in reversed(pages[:-1]):
+        page = get_page(client, limit=4, cursor=page["prev_cursor"])
+        assert ids(page) == ids(expected)
+        assert page["next_cursor"] is not None
+    assert page["prev_cursor"] is None
+
+
+def test_cursor_is_stable_when_new_posts_arrive(client, posts, make_user, make_post):
+    first = get_page(client, limit=3)
+    make_post(make_user("latecomer"), title="새 글")
+    second = get_page(client, limit=3, cursor=first["next_cursor"])
+    assert ids(second) == posts[3:6]
+
+
+def test_skip_is_still_supported(client, posts):
+    page = get_page(client, limit=3, skip=3)
+    assert ids(page) == posts[3:6]
+    assert page["prev_cursor"] is not None
+    assert ids(get_page(client, limit=3, cursor=page["next_cursor"])) == posts[6:9]
+
+
+def test_search_cursors_round_trip(client, posts, db):
+    rebuild_search_index(db)
+    first = get_page(client, limit=4, search="페이지")
+    second = get_page(client, limit=4, search="페이지", cursor=first["next_cursor"])
+    third = get_page(client, limit=4, search="페이지", cursor=second["next_cursor"])
+    found = ids(first) + ids(second) + ids(third)
+    assert sorted(found) == sorted(post_id for post_id in posts if post_id != posts[0])
+    assert third["next_cursor"] is None
+    assert ids(get_page(client, limit=4, search="페이지", cursor=third["prev_cursor"])) == ids(second)
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "W10", "WyJ4IiwxXQ"])
+def test_invalid_cursor_is_rejected(client, cursor):
+    assert client.get("/api/posts/", params={"cursor": cursor}).status_code == 400
@@ -0,0 +1,65 @@
+"""bcrypt 작업 풀 테스트"""
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.password_hasher import PasswordHasher
+
+pytestmark = pytest.mark.anyio
+
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("조건이 만족되지 않았습니다")
+
+
+async def test_cancelled_request_still_counts_until_the_job_finishes():
+    hasher = PasswordHasher(workers=1, max_queue=0, retry_after=1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_job():
+        started.set()
+        release.wait(5)
+
+    task = asyncio.ensure_future(hasher._submit(slow_job))
+    await wait_for(started.is_set)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # 스레드는 아직 해싱 중이므로 대기열 한도에 그대로 포함
+    assert hasher.in_flight == 1
+    with pytest.raises(HTTPException) as rejected:
+        await hasher._submit(lambda: None)
+    assert rejected.value.status_code == 503
+
+    release.set()
+    await wait_for(lambda: hasher.in_flight == 0)
+    await hasher.shutdown()
+
+
+async def test_shutdown_drains_without_blocking_the_event_loop():
+    hasher = PasswordHasher(workers=1, max_queue=4, retry_after=1)
+    release = threading.Event()
+    job = asyncio.ensure_future(hasher._submit(lambda: release.wait(5) and "hashed"))
+    await asyncio.sleep(0)
+
+    shutdown = asyncio.ensure_future(hasher.shutdown())
+    ticks = 0
+    while not shutdown.done() and ticks < 5:
+        await asyncio.sleep(0.01)
+        ticks += 1
+    # 남은 작업이 끝나기를 기다리는 동안에도 이벤트 루프는 다른 일을 함
+    assert ticks == 5 and not shutdown.done()
+
+    release.set()
+    await shutdown
+    assert await job == "hashed"
+    # 종료 후에는 새 스레드 풀로 계속 사용 가능
+    assert await hasher._submit(lambda: "again") == "again"
+    await hasher.shutdown()
@@ -0,0 +1,58 @@
+"""게시글 검색 토큰/색인 테스트"""
+import pytest
+
+from app.services.search import build_match_query, highlight_snippet, ngram_tokens, rebuild_search_index
+
+
+def test_hangul_bigrams_cross_single_spaces():
+    assert ngram_tokens("한국어 본문") == ["한국", "국어", "어본", "본문"]
+    assert ngram_tokens("한국어 본문") == ngram_tokens("한국어본문")
+
+
+def test_other_words_are_kept_whole_and_break_hangul_runs():
+    assert ngram_tokens("FastAPI 입문  강좌, 2판") == ["fastapi", "입문", "강좌", "2", "판"]
+
+
+def test_query_uses_the_same_tokens():
+    assert build_match_query("국어본") == '"국어" "어본"'
+    assert build_match_query("한국어 본문") == '"한국" "국어" "어본" "본문"'
+    assert build_match_query("국 api") == '"국"* "api"*'
+    assert build_match_query("!!") is None
+
+
+@pytest.fixture
+def search(client, db, make_user, make_post):
+    author = make_user("author")
+    posts = {
+        "spaced": make_post(author, title="소개", content="한국어 본문 예제"),
+        "joined": make_post(author, title="소개", content="한국어본문 예제"),
+        "apart": make_post(author, title="소개", content="한국어 문서의 본문"),
+        "other": make_post(author, title="FastAPI 입문", content="파이썬 웹"),
+    }
+    rebuild_search_index(db)
+    names = {post.id: name for name, post in posts.items()}
+
+    def run(term: str) -> set:
+        response = client.get("/api/posts/", params={"search": term})
+        assert response.status_code == 200
+        return {names[post["id"]] for post in response.json()["posts"]}
+    return run
+
+
+def test_search_across_word_boundary(search):
+    assert search("국어본") == {"spaced", "joined"}
+
+
+def test_search_ignores_spacing_differences(search):
+    assert search("한국어 본문") == {"spaced", "joined"}
+    assert search("한국어본문") == {"spaced", "joined"}
+
+
+def test_search_words_and_prefixes(search):
+    assert search("본문") == {"spaced", "joined", "apart"}
+    assert search("fast") == {"other"}
+    assert search("없는말") == set()
+
+
+def test_snippet_marks_match_across_space():
+    assert highlight_snippet("이것은 한국어 본문입니다", "국어본") == "이것은 한<mark>국어 본</mark>문입니다"
@@ -0,0 +1,40 @@
+"""느린 쿼리 기록 테스트"""
+import json
+
+import pytest
+
+from app.config import settings
+from app.models.user import User
+from app.slow_queries import REDACTED, slow_query_stats
+
+
+@pytest.fixture
+def slow_log(monkeypatch):
+    """모든 쿼리를 느린 쿼리로 기록하고, 이 테스트에서 쓴 기록을 반환하는 함수"""
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    monkeypatch.setattr(settings, "SLOW_QUERY_SAMPLE_RATE", 1.0)
+    slow_query_stats.clear()
+    with open(settings.SLOW_QUERY_LOG_PATH, "a", encoding="utf-8") as log:
+        offset = log.tell()
+
+    def records() -> list:
+        with open(settings.SLOW_QUERY_LOG_PATH, encoding="utf-8") as log:
+            log.seek(offset)
+            return [json.loads(line) for line in log]
+    yield records
+    slow_query_stats.clear()
+
+
+def test_account_parameters_are_not_logged(client, login, db, make_user, make_post, slow_log):
+    headers = login("alice", password="hunter22")
+    make_post(make_user("author"), title="공개 제목")
+    client.get("/api/posts/", params={"search": "공개"})
+    hashed = db.query(User.hashed_password).filter(User.username == "alice").scalar()
+
+    records = slow_log()
+    logged = json.dumps(records, ensure_ascii=False) + json.dumps(slow_query_stats.top(500), ensure_ascii=False)
+    for secret in ("alice@example.com", hashed, headers["Authorization"].split()[1]):
+        assert secret not in logged
+    assert any(r["parameters"] == REDACTED and "INSERT INTO users" in r["sql"] for r in records)
+    # 계정 정보와 상관없는 문장의 파라미터는 그대로 남김
+    assert any("공개 제목" in json.dumps(r["parameters"], ensure_ascii=False) for r in records)
@@ -0,0 +1,41 @@
+"""템플릿 bytecode cache 디렉터리 테스트"""
+import os
+
+import pytest
+
+from app.config import settings
+from app.templating import _bytecode_cache
+
+
+def test_default_cache_is_a_private_per_user_directory(monkeypatch):
+    monkeypatch.setattr(settings, "TEMPLATE_BYTECODE_CACHE_DIR", None)
+    info = os.stat(_bytecode_cache().directory)
+    assert info.st_uid == os.getuid()
+    assert info.st_mode & 0o077 == 0
+
+
+def test_configured_private_directory_is_used(monkeypatch, tmp_path):
+    directory = tmp_path / "jinja"
+    monkeypatch.setattr(settings, "TEMPLATE_BYTECODE_CACHE_DIR", str(directory))
+    assert _bytecode_cache().directory == str(directory)
+    assert os.stat(directory).st_mode & 0o077 == 0
+
+
+@pytest.mark.parametrize("mode", [0o777, 0o770, 0o702])
+def test_writable_by_others_is_rejected(monkeypatch, tmp_path, mode):
+    directory = tmp_path / "jinja"
+    directory.mkdir()
+    directory.chmod(mode)
+    monkeypatch.setattr(settings, "TEMPLATE_BYTECODE_CACHE_DIR", str(directory))
+    with pytest.raises(RuntimeError):
+        _bytecode_cache()
+
+
+@pytest.mark.skipif(os.getuid() != 0, reason="다른 사용자 소유로 바꾸려면 root 권한이 필요")
+def test_directory_owned_by_another_user_is_rejected(monkeypatch, tmp_path):
+    directory = tmp_path / "jinja"
+    directory.mkdir(mode=0o700)
+    os.chown(directory, 65534, -1)
+    monkeypatch.setattr(settings, "TEMPLATE_BYTECODE_CACHE_DIR", str(directory))
+    with pytest.raises(RuntimeError):
+        _bytecode_cache()
@@ -0,0 +1,127 @@
+"""쓰기 작업자(group commit) 테스트"""
+import asyncio
+
+import pytest
+
+from app.models.user import User
+from app.services.writer import GroupCommitWriter, on_commit, run_write
+
+pytestmark = pytest.mark.anyio
+
+
+def add_user(db, username: str) -> str:
+    db.add(User(username=username, email=f"{username}@example.com", hashed_password="x", nickname=username))
+    db.flush()
+    return username
+
+
+def fail(db, username: str) -> None:
+    add_user(db, username)
+    raise ValueError("작업 실패")
+
+
+async def run_batch(writer: GroupCommitWriter, operations):
+    """작업자를 시작하기 전에 대기열에 모두 넣어서 한 묶음으로 처리되게 함"""
+    tasks = [asyncio.ensure_future(writer.submit(fn, *args)) for fn, *args in operations]
+    await asyncio.sleep(0)
+    writer.start()
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await writer.stop()
+
+
+def add_user_then(db, username: str, callbacks) -> str:
+    for callback in callbacks:
+        on_commit(db, callback)
+    return add_user(db, username)
+
+
+def broken_callback():
+    raise RuntimeError("캐시 갱신 실패")
+
+
+def commits(statements):
+    return [statement for statement in statements if statement.strip().upper() == "COMMIT"]
+
+
+async def test_batch_is_committed_once(sql_trace, db):
+    writer = GroupCommitWriter(max_batch=8, max_delay=0.05)
+    results = await run_batch(writer, [(add_user, f"user{i}") for i in range(4)])
+
+    assert results == ["user0", "user1", "user2", "user3"]
+    assert writer.stats()["groups"] == 1
+    assert writer.stats()["largest_group"] == 4
+    # 묶음 전체가 트랜잭션 하나: SAVEPOINT 보다 BEGIN 이 먼저이고 COMMIT 은 한 번
+    assert sql_trace[0] == "BEGIN IMMEDIATE"
+    assert len(commits(sql_trace)) == 1
+    assert db.query(User).count() == 4
+
+
+async def test_failed_operation_rolls_back_only_its_savepoint(sql_trace, db):
+    writer = GroupCommitWriter(max_batch=8, max_delay=0.05)
+    results = await run_batch(writer, [(add_user, "first"), (fail, "broken"), (add_user, "last")])
+
+    assert results[0] == "first" and results[2] == "last"
+    assert isinstance(results[1], ValueError)
+    assert len(commits(sql_trace)) == 1
+    assert sum(statement.startswith("ROLLBACK TO SAVEPOINT") for statement in sql_trace) == 1
+    assert {name for (name,) in db.query(User.username)} == {"first", "last"}
+
+
+async def test_batches_are_split_by_max_batch(sql_trace, db):
+    writer = GroupCommitWriter(max_batch=2, max_delay=0.05)
+    await run_batch(writer, [(add_user, f"user{i}") for i in range(5)])
+
+    assert writer.stats()["groups"] == 3
+    assert len(commits(sql_trace)) == 3
+    assert db.query(User).count() == 5
+
+
+async def test_failing_after_commit_callback_does_not_hang_the_batch(db, caplog):
+    writer = GroupCommitWriter(max_batch=8, max_delay=0.05)
+    called = []
+    results = await run_batch(writer, [
+        (add_user_then, "first", [broken_callback, lambda: called.append("first")]),
+        (add_user_then, "second", [lambda: called.append("second")]),
+    ])
+
+    assert results == ["first", "second"]
+    assert called == ["first", "second"]
+    assert "commit 후 작업이 실패했습니다" in caplog.text
+    assert db.query(User).count() == 2
+
+
+async def test_writer_keeps_running_after_a_failing_callback(db):
+    writer = GroupCommitWriter(max_batch=1, max_delay=0)
+    writer.start()
+    try:
+        assert await writer.submit(add_user_then, "first", [broken_callback]) == "first"
+        assert writer.running
+        assert await writer.submit(add_user, "second") == "second"
+    finally:
+        await writer.stop()
+
+
+async def test_cancelled_operation_is_skipped(db):
+    writer = GroupCommitWriter(max_batch=8, max_delay=0.05)
+    cancelled = asyncio.ensure_future(writer.submit(add_user, "cancelled"))
+    kept = asyncio.ensure_future(writer.submit(add_user, "kept"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    writer.start()
+    try:
+        assert await kept == "kept"
+    finally:
+        await writer.stop()
+    assert {name for (name,) in db.query(User.username)} == {"kept"}
+
+
+async def test_inline_write_returns_despite_a_failing_callback(db, caplog):
+    called = []
+    result = await run_write(db, add_user_then, "inline", [broken_callback, lambda: called.append(True)])
+
+    assert result == "inline"
+    assert called == [True]
+    assert "commit 후 작업이 실패했습니다" in caplog.text